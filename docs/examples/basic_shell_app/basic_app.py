@@ -5,7 +5,9 @@ from textual.containers import Grid, Container
 from textual.widgets import Header, Footer
 
 from textual_shell.app import BaseShellApp
-from textual_shell.commands import Bash, Clear, Help, Jobs, Python, Set
+from textual_shell.commands import (
+    At, Bash, Cache, Clear, Every, Help, Jobs, Map, Python, Set
+)
 from textual_shell.widgets import (
     Shell,
     CommandList,
@@ -33,8 +35,8 @@ class BasicShell(BaseShellApp):
     CONFIG_PATH = os.path.join(os.getcwd(), '.config.yaml')
     
     cmd_list = [
-        Bash(), Clear(), Help(), Set(CONFIG_PATH), 
-        Jobs(), Python(), Timer(), Sleep()
+        At(), Bash(), Cache(), Clear(), Every(), Help(), Set(CONFIG_PATH), 
+        Jobs(), Map(), Python(), Timer(), Sleep()
     ]
     
     command_names = [cmd.name for cmd in cmd_list]
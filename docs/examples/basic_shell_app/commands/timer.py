@@ -1,5 +1,4 @@
 from time import monotonic
-import asyncio
 
 from textual.app import ComposeResult
 from textual.containers import HorizontalGroup, VerticalScroll
@@ -8,6 +7,7 @@ from textual.screen import Screen
 from textual.widgets import Button, Digits, Footer, Header
 
 from textual_shell.command import Command, CommandNode
+from textual_shell.scheduler import Priority
 from textual_shell.job import Job
 
 class TimeDisplay(Digits):
@@ -137,11 +137,11 @@ class TimerScreen(Screen):
     """
     def __init__(
         self,
-        task: asyncio.Task,
+        job: Job,
         *args, **kwargs
     ) -> None:
         super().__init__(*args, **kwargs)
-        self.timer_task = task
+        self.job = job
     
     def compose(self) -> ComposeResult:
         """Called to add widgets to the app."""
@@ -175,7 +175,7 @@ class TimerScreen(Screen):
     def action_kill_timer(self) -> None:
         """An action to kill the timer and
         return to the shell app."""
-        self.timer_task.cancel()
+        self.job.kill()
         self.app.pop_screen()
         
 
@@ -184,19 +184,24 @@ class TimerApp(Job):
     
     async def execute(self):
         self.running()
-        self.screen = TimerScreen(self.task)
+        self.screen = TimerScreen(self)
         self.shell.app.install_screen(self.screen, name=self.id)
         self.shell.app.push_screen(self.screen)
         
-        await self.wait_for_cancel()
+        try:
+            await self.wait_for_cancel()
         
-        self.shell.app.uninstall_screen(self.screen)
+        finally:
+            self.shell.app.uninstall_screen(self.screen)
+            
         self.completed()
 
 
 class Timer(Command):
     """A command to create a timer."""
     
+    PRIORITY = Priority.INTERACTIVE
+    
     DEFINITION = {
         'timer': CommandNode(
             name='timer',
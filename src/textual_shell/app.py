@@ -1,3 +1,5 @@
+import asyncio
+
 from textual import log
 from textual.app import App
 from textual.css.query import NoMatches
@@ -6,6 +8,8 @@ from textual.widgets import (
     RichLog
 )
 
+from .cache import CacheStore
+from .checkpoint import CheckpointStore
 from .command import Command
 from .commands import (
     Attach,
@@ -14,7 +18,15 @@ from .commands import (
     Kill,
     SetJob
 )
+from .history import JobHistory
 from .job import Job
+from .process_job import discard_process_pool
+from .registry import JobRegistry
+from .scheduler import JobScheduler
+from .thread_job import shutdown_thread_pool
+from .timer_wheel import TimerWheel
+from .tracing import Tracer
+from .usage import usage_supported
 from .widgets import (
     BaseShell,
     ConsoleLog,
@@ -24,17 +36,138 @@ from .widgets import (
 
 
 class BaseShellApp(App):
-    """Base app for the shell. Needed to catch messages sent by commands."""
+    """
+    Base app for the shell. Needed to catch messages sent by commands.
+    It also owns the registry that every job is tracked in, the 
+    scheduler that starts them, the timer wheel that drives 
+    schedules, the history of finished jobs, the result caches of 
+    the commands, the checkpoints of long running jobs and the 
+    tracer that records their lifecycle.
+    """
         
     DEFAULT_CSS = """
             Screen {
                 layers: shell popup;
             }
         """
+    
+    MAX_CONCURRENT_JOBS: int | None = None
+    """Global cap on running jobs. None uses the scheduler's default."""
+    
+    MAX_CPU_BOUND_JOBS: int | None = None
+    """Cap on running CPU bound jobs. None uses the usable CPU count."""
+    
+    JOB_TIMEOUT: float | None = None
+    """Default seconds a job may run for. None for no limit."""
+    
+    JOB_HISTORY_SIZE: int = 1000
+    """The number of finished jobs to remember for `jobs history`. 0 disables it."""
+    
+    SHUTDOWN_GRACE: float = 2.0
+    """Seconds jobs are given to clean up when the app exits."""
+    
+    USAGE_INTERVAL: float = 2.0
+    """Seconds between samples of the CPU and memory used by job processes."""
+    
+    TRACE_SPANS: int = 10000
+    """The number of lifecycle spans to keep for `jobs trace`. 0 disables tracing."""
+    
+    CACHE_PATH: str | None = None
+    """File the result caches of commands that persist are saved to. 
+    None keeps every cache in memory."""
+    
+    CHECKPOINT_PATH: str | None = None
+    """Directory the checkpoints of jobs are saved in, so they can be
+    resumed in a later session. None keeps them in memory."""
+    
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.tracer = Tracer(self.TRACE_SPANS)
+        self.job_registry = JobRegistry()
+        self.timer_wheel = TimerWheel()
+        self.job_history = JobHistory(self.JOB_HISTORY_SIZE)
+        self.result_cache = CacheStore(self.CACHE_PATH)
+        self.checkpoints = CheckpointStore(self.CHECKPOINT_PATH)
+        self.job_registry.reserve(self.checkpoints.ids())
+        self.job_scheduler = JobScheduler(
+            max_concurrent=self.MAX_CONCURRENT_JOBS,
+            max_cpu_bound=self.MAX_CPU_BOUND_JOBS,
+            default_timeout=self.JOB_TIMEOUT,
+            cache=self.result_cache
+        )
         
-    def _get_job_manager(self) -> JobManager:
+    def on_mount(self) -> None:
+        """Start sampling the resources used by job processes."""
+        if usage_supported():
+            self.set_interval(self.USAGE_INTERVAL, self.sample_job_usage)
+            
+    def sample_job_usage(self) -> None:
+        """Sample every job that owns child processes 
+        and show the figures in the Job Manager."""
+        job_manager = self._get_job_manager()
+        for job in self.job_registry.jobs():
+            if job.processes and job.sample_usage() and job_manager:
+                job_manager.update_job_usage(job)
+    
+    async def shutdown_jobs(self) -> None:
+        """
+        Stop every job when the app exits. All jobs are killed at once
+        and given SHUTDOWN_GRACE seconds to clean up. The child 
+        processes of the jobs are then killed and reaped in parallel,
+        jobs that are still running are cancelled and the worker
+        pools are shut down, so exit takes a bounded amount of time.
+        Persisted result caches are saved and pending checkpoints
+        written last. Only the first call does anything.
+        """
+        if self.job_scheduler.closed:
+            return
+        
+        self.job_scheduler.close()
+        jobs = self.job_registry.jobs()
+        for job in jobs:
+            job.kill()
+        
+        tasks = [job.task for job in jobs if job.task is not None]
+        pending = set()
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=self.SHUTDOWN_GRACE)
+        
+        await asyncio.gather(
+            *(job.reap_processes() for job in jobs if job.processes),
+            return_exceptions=True
+        )
+        for task in pending:
+            task.cancel()
+        
+        if pending:
+            await asyncio.wait(pending, timeout=self.SHUTDOWN_GRACE)
+            
+        self.timer_wheel.stop()
+        discard_process_pool()
+        shutdown_thread_pool()
+        try:
+            self.result_cache.save()
+            
+        except Exception as e:
+            log(f'Could not save the cache: {e!r}')
+            
+        self.checkpoints.flush()
+    
+    async def action_quit(self) -> None:
+        """Stop the jobs while the screens are still up, 
+        so their last logs and statuses are shown, then exit."""
+        await self.shutdown_jobs()
+        self.exit()
+        
+    async def on_unmount(self) -> None:
+        """Stop the jobs that are left when the app exits 
+        without going through quit."""
+        await self.shutdown_jobs()
+        
+    def _get_job_manager(self) -> JobManager | None:
         """Search through all of the screens to find
-        the one with the Job Manager widget."""
+        the one with the Job Manager widget. None once 
+        the screens have been torn down."""
         for screen in self.app.screen_stack:
             try: 
                 return screen.query_one(JobManager)
@@ -149,39 +282,58 @@ class BaseShellApp(App):
             pass
     
     def on_job_start(self, event: Job.Start) -> None:
-        """Add new jobs."""
+        """Add new jobs. Jobs started by another job are 
+        summarized in their parent's row instead."""
         event.stop()
-        job_manager = self._get_job_manager()
-        job_manager.add_job(event.job)
+        if event.job.parent is not None:
+            return
         
-        shell = self._get_shell()
-        jobs = shell.get_cmd_obj('jobs')
-        jobs.add_job_id(event.job.id)
+        if job_manager := self._get_job_manager():
+            job_manager.add_job(event.job)
+
+    def on_job_start_batch(self, event: Job.StartBatch) -> None:
+        """Add the jobs submitted together in one update."""
+        event.stop()
+        if job_manager := self._get_job_manager():
+            job_manager.add_jobs([job for job in event.jobs if job.parent is None])
 
     def on_job_finish(self, event: Job.Finish) -> None:
         """Clean up finished jobs."""
         event.stop()
-        job_manager = self._get_job_manager()
-        job_manager.remove_job(event.job_id)
-        
-        shell = self._get_shell()
-        jobs = shell.get_cmd_obj('jobs')
-        jobs.remove_job_id(event.job_id)
+        if job_manager := self._get_job_manager():
+            job_manager.remove_job(event.job_id)
         
     def on_job_status_change(self, event: Job.StatusChange) -> None:
         """Update the status of a job."""
         event.stop()
-        job_manager = self._get_job_manager()
-        job_manager.update_job_status(event.job_id, event.status)
+        if job_manager := self._get_job_manager():
+            job_manager.update_job_status(event.job_id, event.status)
+
+    def on_job_progress(self, event: Job.Progress) -> None:
+        """Update the progress of a job."""
+        event.stop()
+        if job_manager := self._get_job_manager():
+            job_manager.update_job_progress(event)
+
+    def on_job_retry(self, event: Job.Retry) -> None:
+        """Show the attempt of a job that is retried."""
+        event.stop()
+        if job_manager := self._get_job_manager():
+            job_manager.update_job_attempts(event)
 
     def on_attach_to_job(self, event: Attach.To_Job) -> None:
         """Attach to the jobs screen."""
         event.stop()
-        job_manager = self._get_job_manager()
-        job_manager.switch_job_screen(event.job_id)
+        if job_manager := self._get_job_manager():
+            job_manager.switch_job_screen(event.job_id)
 
     def on_kill_selected(self, event: Kill.Selected) -> None:
-        """Kill the job."""
+        """Kill the selected jobs."""
         event.stop()
-        job_manager =self._get_job_manager()
-        job_manager.kill_job(event.job_id)
+        if job_manager := self._get_job_manager():
+            job_manager.kill_jobs(event.job_ids)
+            
+        else:
+            for job_id in event.job_ids:
+                if job := self.job_registry.get(job_id):
+                    job.kill()
@@ -0,0 +1,277 @@
+import os
+import pickle
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Annotated, Any, NamedTuple
+
+from textual import log
+
+from .utils import write_atomic
+
+if TYPE_CHECKING:
+    from .command import Command
+
+
+MISS = object()
+"""Returned by ResultCache.get when there is no fresh entry."""
+
+
+class CachePolicy:
+    """
+    Declaration of how the results of a command are cached.
+
+    Args:
+        ttl (float | None): Seconds a result stays fresh, None to keep it
+            until it is evicted.
+        max_entries (int): The most results kept, the least recently used
+            is evicted first.
+        persist (bool): Save the results to the app's CACHE_PATH between
+            sessions.
+    """
+
+    __slots__ = ('ttl', 'max_entries', 'persist')
+
+    def __init__(
+        self,
+        ttl: Annotated[float | None, 'Seconds a result stays fresh.']=None,
+        max_entries: Annotated[int, 'The most results kept.']=128,
+        persist: Annotated[bool, 'Save the results between sessions.']=False
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.persist = persist
+
+    def __repr__(self) -> str:
+        return (
+            f'CachePolicy(ttl={self.ttl}, max_entries={self.max_entries}, '
+            f'persist={self.persist})'
+        )
+
+
+class CacheStats(NamedTuple):
+    """Counters of a ResultCache."""
+    entries: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+
+class ResultCache:
+    """
+    Bounded LRU cache of results with a time to live. Entries are
+    stamped with the wall clock so they stay valid across sessions.
+    Expired entries are dropped when they are looked up.
+
+    Args:
+        policy (CachePolicy): The ttl and size of the cache.
+    """
+
+    def __init__(
+        self,
+        policy: Annotated[CachePolicy, 'The ttl and size of the cache.']
+    ) -> None:
+        self.policy = policy
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        key: Annotated[tuple, 'The normalized arguments.']
+    ) -> tuple[Any, float] | object:
+        """
+        Look up a fresh result and mark it as recently used.
+
+        Args:
+            key (tuple): The normalized arguments.
+
+        Returns:
+            entry (tuple[Any, float] | MISS): The result and its age in
+                seconds, or MISS.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISS
+
+        stored_at, result = entry
+        age = time.time() - stored_at
+        if self.policy.ttl is not None and age > self.policy.ttl:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return MISS
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result, age
+
+    def put(
+        self,
+        key: Annotated[tuple, 'The normalized arguments.'],
+        result: Annotated[Any, 'The result to cache.'],
+        stored_at: Annotated[float, 'Wall clock time of the result.']=None
+    ) -> None:
+        """
+        Store a result, evicting the least recently used once full.
+
+        Args:
+            key (tuple): The normalized arguments.
+            result (Any): The result to cache.
+            stored_at (float): Wall clock time the result was produced, now by default.
+        """
+        self._entries[key] = (time.time() if stored_at is None else stored_at, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.policy.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry, the counters are kept."""
+        self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """
+        Get the counters of the cache.
+
+        Returns:
+            stats (CacheStats): The entries, hits, misses, evictions and expirations.
+        """
+        return CacheStats(
+            len(self._entries),
+            self.hits,
+            self.misses,
+            self.evictions,
+            self.expirations
+        )
+
+    def entries(self) -> list[tuple[tuple, float, Any]]:
+        """
+        Get the entries from the least to the most recently used.
+
+        Returns:
+            entries (list[tuple[tuple, float, Any]]): The keys, times and results.
+        """
+        return [(key, stored_at, result) for key, (stored_at, result) in self._entries.items()]
+
+
+class CacheStore:
+    """
+    The result caches of every command, created when a command with
+    a CACHE policy first runs. The caches of commands that persist
+    are pickled to a file when the app exits and loaded back lazily
+    in the next session.
+
+    Args:
+        path (str | None): The file persisted caches are saved to.
+    """
+
+    def __init__(
+        self,
+        path: Annotated[str | None, 'The file persisted caches are saved to.']=None
+    ) -> None:
+        self.path = path
+        self._caches: dict[str, ResultCache] = {}
+        self._saved: dict[str, list] = None
+
+    def _load(self) -> dict[str, list]:
+        """Read the persisted entries, once, ignoring a missing or bad file."""
+        if self._saved is None:
+            self._saved = {}
+            if self.path is not None and os.path.exists(self.path):
+                try:
+                    with open(self.path, 'rb') as cache_file:
+                        self._saved = pickle.load(cache_file)
+
+                except Exception as e:
+                    log(f'Could not load the cache: {e!r}')
+
+        return self._saved
+
+    def get_cache(
+        self,
+        command: Annotated['Command', 'The command.']
+    ) -> ResultCache | None:
+        """
+        Get the cache of a command, creating it on first use.
+
+        Args:
+            command (Command): The command.
+
+        Returns:
+            cache (ResultCache | None): The cache or None if the command
+                does not cache its results.
+        """
+        policy = getattr(command, 'CACHE', None)
+        if policy is None:
+            return None
+
+        if command.name in self._caches:
+            return self._caches[command.name]
+
+        cache = ResultCache(policy)
+        if policy.persist:
+            for key, stored_at, result in self._load().get(command.name, []):
+                cache.put(key, result, stored_at)
+
+        self._caches[command.name] = cache
+        return cache
+
+    def caches(self) -> dict[str, ResultCache]:
+        """
+        Get the caches created so far.
+
+        Returns:
+            caches (dict[str, ResultCache]): The caches by command name.
+        """
+        return dict(self._caches)
+
+    def clear(
+        self,
+        cmd: Annotated[str | None, 'The name of a command.']=None
+    ) -> None:
+        """
+        Drop cached results, persisted ones included.
+
+        Args:
+            cmd (str | None): Only clear this command's cache.
+        """
+        saved = self._load()
+        for name, cache in self._caches.items():
+            if cmd is None or name == cmd:
+                cache.clear()
+
+        if cmd is None:
+            saved.clear()
+
+        else:
+            saved.pop(cmd, None)
+
+    def save(self) -> None:
+        """
+        Write the caches of the commands that persist to the file.
+        Caches not used this session are kept as they were.
+
+        Raises:
+            OSError: If the file can not be written.
+            pickle.PicklingError: If a result can not be pickled.
+        """
+        if self.path is None:
+            return
+
+        saved = dict(self._load())
+        for name, cache in self._caches.items():
+            if cache.policy.persist:
+                saved[name] = cache.entries()
+
+        if saved:
+            write_atomic(self.path, pickle.dumps(saved))
+
+        elif os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,187 @@
+import re
+from typing import Annotated, Callable
+
+from .job import Job
+
+
+class InvalidChain(Exception):
+    """Custom Exception for command lines whose chain can not be parsed."""
+    pass
+
+
+AND = '&&'
+"""Run the next command if the previous one completed."""
+
+THEN = ';'
+"""Run the next command once the previous one finished."""
+
+BACKGROUND = '&'
+"""Run the previous command in the background and continue straight away."""
+
+WAIT = 'wait'
+"""Keyword that waits for every command sent to the background so far."""
+
+_SEPARATOR_PATTERN = re.compile(r'\s*(&&|;|&)\s*')
+
+
+def split_chain(
+    cmdline: Annotated[str, 'The command line entered.']
+) -> list[tuple[str, str | None]]:
+    """
+    Split a command line on the chaining operators &&, ; and &.
+
+    Args:
+        cmdline (str): The command line entered.
+
+    Returns:
+        segments (list[tuple[str, str | None]]): Each segment with the
+            operator that comes before it, None for the first one.
+
+    Raises:
+        InvalidChain: If an operator is missing a command on either side.
+    """
+    parts = _SEPARATOR_PATTERN.split(cmdline.strip(' '))
+    segments = [(parts[0], None)]
+    for index in range(1, len(parts), 2):
+        segments.append((parts[index + 1], parts[index]))
+
+    if segments[-1][0] == '' and segments[-1][1] in (THEN, BACKGROUND):
+        segments.pop()
+
+    for position, (segment, operator) in enumerate(segments):
+        if segment == '':
+            if position == 0:
+                operator = segments[1][1] if len(segments) > 1 else None
+
+            raise InvalidChain(f'{operator or "Operator"} needs a command on both sides.')
+
+    return segments
+
+
+class ChainNode:
+    """
+    One step of a chain: the jobs of a single command or pipeline.
+    A step without jobs is a wait barrier.
+
+    Args:
+        jobs (list[Job]): The jobs started together for the step.
+    """
+
+    def __init__(
+        self,
+        jobs: Annotated[list[Job], 'The jobs started together for the step.']
+    ) -> None:
+        self.jobs = jobs
+        self.dependents: list[tuple['ChainNode', bool]] = []
+        self.waiting = 0
+        self.blocked = False
+        self.remaining = len(jobs)
+
+    @property
+    def succeeded(self) -> bool:
+        """True if the step completed, like a shell the last
+        stage of a pipeline decides."""
+        return not self.jobs or self.jobs[-1].status == Job.Status.COMPLETED
+
+
+class JobChain:
+    """
+    Dependency graph built from a command line such as
+    `a && b ; c & d & wait`. As in a POSIX shell && binds tighter
+    than ; and &, so `a && b & c` runs c alongside a. Steps with no
+    unfinished prerequisite are started straight away. Whenever a job finishes its dependents
+    are released from its done callback, so the next step starts the
+    instant it is allowed to. A step whose && prerequisite did not
+    complete is skipped, along with anything chained after it by &&.
+
+    Args:
+        start (Callable[[list[Job]], None]): Starts the jobs of a step.
+    """
+
+    def __init__(
+        self,
+        start: Annotated[Callable[[list[Job]], None], 'Starts the jobs of a step.']
+    ) -> None:
+        self.start = start
+        self.nodes: list[ChainNode] = []
+        self._last: ChainNode = None
+        self._barrier: ChainNode = None
+        self._background: list[ChainNode] = []
+
+    def _depend(
+        self,
+        node: ChainNode,
+        prerequisite: ChainNode,
+        require_success: bool
+    ) -> None:
+        """Make node wait for prerequisite."""
+        prerequisite.dependents.append((node, require_success))
+        node.waiting += 1
+
+    def add(
+        self,
+        jobs: Annotated[list[Job], 'The jobs of the step.'],
+        operator: Annotated[str, 'The operator before the step.']=None
+    ) -> None:
+        """
+        Add a step to the end of the chain.
+
+        Args:
+            jobs (list[Job]): The jobs of the step, empty for a wait barrier.
+            operator (str): The operator before the step, None for the first.
+        """
+        node = ChainNode(jobs)
+        if operator == AND:
+            self._depend(node, self._last, True)
+
+        else:
+            if operator == THEN:
+                self._barrier = self._last
+
+            elif operator == BACKGROUND:
+                self._background.append(self._last)
+
+            if self._barrier is not None:
+                self._depend(node, self._barrier, False)
+
+        if not jobs:
+            for prerequisite in self._background:
+                self._depend(node, prerequisite, False)
+
+            self._background.clear()
+
+        self.nodes.append(node)
+        self._last = node
+
+    def run(self) -> None:
+        """Start every step that has no prerequisite."""
+        roots = [node for node in self.nodes if node.waiting == 0]
+        for node in roots:
+            self._start(node)
+
+    def _start(self, node: ChainNode) -> None:
+        """Start the jobs of a step, or resolve it if it has none or is skipped."""
+        if node.blocked or not node.jobs:
+            self._resolve(node, not node.blocked)
+            return
+
+        for job in node.jobs:
+            job.add_done_callback(lambda job, node=node: self._job_done(node))
+
+        self.start(node.jobs)
+
+    def _job_done(self, node: ChainNode) -> None:
+        """Resolve the step once all of its jobs have finished."""
+        node.remaining -= 1
+        if node.remaining == 0:
+            self._resolve(node, node.succeeded)
+
+    def _resolve(self, node: ChainNode, succeeded: bool) -> None:
+        """Release the dependents of a finished or skipped step."""
+        for dependent, require_success in node.dependents:
+            if require_success and not succeeded:
+                dependent.blocked = True
+
+            dependent.waiting -= 1
+            if dependent.waiting == 0:
+                self._start(dependent)
@@ -0,0 +1,273 @@
+import os
+import pickle
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Annotated, Any, NamedTuple
+
+from textual import log
+
+from .limits import ProcessLimits
+from .utils import write_atomic
+
+if TYPE_CHECKING:
+    from .job import Job
+    from .retry import RetryPolicy
+
+
+VALID_ID = re.compile(r'[\w-]+')
+"""Job ids that can be used as a file name, no dots or separators."""
+
+
+class Checkpoint(NamedTuple):
+    """The last saved state of a job and what is needed to recreate it."""
+    job_id: str
+    cmd: str
+    args: tuple[str]
+    tags: frozenset[str]
+    timeout: float | None
+    limits: ProcessLimits | None
+    retry: 'RetryPolicy | None'
+    state: Any
+    saved_at: float
+
+
+class CheckpointStore:
+    """
+    The checkpoints of the jobs, one per job id. With a directory,
+    every checkpoint is pickled to its own file, which is replaced
+    atomically on each save, so a checkpoint survives the app exiting
+    or crashing and a half written one is never read back. Without
+    a directory the checkpoints only last for the session.
+
+    Checkpoints are meant for small state such as an offset or the
+    last processed key. They are pickled on the caller's thread and
+    written by a background thread, so saving never waits on the 
+    disk. Only the newest pending checkpoint of a job is written, 
+    and one that is still pending is what load returns.
+
+    Args:
+        directory (str | None): The directory the checkpoints are saved in.
+    """
+
+    SUFFIX = '.ckpt'
+    """The extension of checkpoint files."""
+
+    def __init__(
+        self,
+        directory: Annotated[str | None, 'The directory the checkpoints are saved in.']=None
+    ) -> None:
+        self.directory = directory
+        self._checkpoints: dict[str, Checkpoint] = {}
+        self._pending: dict[str, bytes | None] = {}
+        self._pending_lock = threading.Lock()
+        self._writing = False
+        self._writer: ThreadPoolExecutor = None
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, job_id: str) -> str:
+        """Get the file of a job's checkpoint. Ids that are not a
+        plain name, such as ../x, raise a ValueError."""
+        if not VALID_ID.fullmatch(job_id):
+            raise ValueError(f'Invalid job id: {job_id!r}')
+
+        return os.path.join(self.directory, f'{job_id}{self.SUFFIX}')
+
+    def _write_later(self, path: str, data: bytes | None) -> None:
+        """Queue a pickled checkpoint, or None to delete the file, 
+        for the writer thread. It replaces what is still pending 
+        for the file and goes to the back of the queue."""
+        with self._pending_lock:
+            self._pending.pop(path, None)
+            self._pending[path] = data
+            if self._writing:
+                return
+
+            self._writing = True
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix='checkpoint'
+                )
+
+        self._writer.submit(self._write_pending)
+
+    def _write_pending(self) -> None:
+        """Write the pending checkpoints until there are none left.
+        A checkpoint stays pending until it is on disk, so load and
+        ids never miss one that is being written."""
+        while True:
+            with self._pending_lock:
+                if not self._pending:
+                    self._writing = False
+                    return
+
+                path, data = next(iter(self._pending.items()))
+
+            try:
+                if data is None:
+                    os.remove(path)
+
+                else:
+                    write_atomic(path, data)
+
+            except FileNotFoundError:
+                pass
+
+            except OSError as e:
+                log(f'Could not save the checkpoint {path}: {e!r}')
+
+            with self._pending_lock:
+                if self._pending.get(path, data) is data:
+                    self._pending.pop(path, None)
+
+    def flush(self) -> None:
+        """Wait until the pending checkpoints have been written."""
+        if self._writer is not None:
+            self._writer.submit(lambda: None).result()
+
+    def ids(self) -> list[str]:
+        """
+        Get the ids of the jobs that have a checkpoint,
+        those saved in earlier sessions included.
+
+        Returns:
+            job_ids (list[str]): The job ids.
+        """
+        if self.directory is None:
+            return list(self._checkpoints)
+
+        with self._pending_lock:
+            pending = list(self._pending.items())
+
+        job_ids = {
+            name.removesuffix(self.SUFFIX) for name in os.listdir(self.directory)
+            if name.endswith(self.SUFFIX)
+        }
+
+        for path, data in pending:
+            job_id = os.path.basename(path).removesuffix(self.SUFFIX)
+            if data is None:
+                job_ids.discard(job_id)
+
+            else:
+                job_ids.add(job_id)
+
+        return sorted(job_id for job_id in job_ids if VALID_ID.fullmatch(job_id))
+
+    def save(
+        self,
+        job: Annotated['Job', 'The job the state belongs to.'],
+        state: Annotated[Any, 'The state to save.']
+    ) -> None:
+        """
+        Save the state of a job, replacing its previous checkpoint.
+        The file is written in the background, a failed write is
+        logged.
+
+        Args:
+            job (Job): The job the state belongs to.
+            state (Any): The state to save, it must be picklable.
+
+        Raises:
+            pickle.PicklingError: If the state can not be pickled.
+        """
+        checkpoint = Checkpoint(
+            job.id,
+            job.cmd,
+            job.args,
+            frozenset(job.tags),
+            job.timeout,
+            job.limits,
+            job.retry,
+            state,
+            time.time()
+        )
+        if self.directory is None:
+            self._checkpoints[job.id] = checkpoint
+
+        else:
+            self._write_later(self._path(job.id), pickle.dumps(checkpoint))
+
+    def load(
+        self,
+        job_id: Annotated[str, 'The id of the job.']
+    ) -> Checkpoint | None:
+        """
+        Get the last checkpoint of a job.
+
+        Args:
+            job_id (str): The id of the job.
+
+        Returns:
+            checkpoint (Checkpoint | None): The checkpoint or None if
+                there is none, it can not be read or the id is invalid.
+        """
+        if self.directory is None:
+            return self._checkpoints.get(job_id)
+
+        if not VALID_ID.fullmatch(job_id):
+            return None
+
+        path = self._path(job_id)
+        with self._pending_lock:
+            if path in self._pending:
+                data = self._pending[path]
+                return pickle.loads(data) if data is not None else None
+
+        try:
+            with open(path, 'rb') as checkpoint_file:
+                return pickle.load(checkpoint_file)
+
+        except FileNotFoundError:
+            return None
+
+        except Exception as e:
+            log(f'Could not load the checkpoint of {job_id}: {e!r}')
+            return None
+
+    def move(
+        self,
+        job_id: Annotated[str, 'The id of the job that saved the checkpoint.'],
+        new_id: Annotated[str, 'The id of the job that takes it over.']
+    ) -> None:
+        """
+        Hand a checkpoint over to the job that resumes from it.
+        The checkpoint is stored under the new id, as if that
+        job had saved it, so it can be resumed again later.
+
+        Args:
+            job_id (str): The id of the job that saved the checkpoint.
+            new_id (str): The id of the job that takes it over.
+        """
+        if self.directory is None:
+            if (checkpoint := self._checkpoints.pop(job_id, None)) is not None:
+                self._checkpoints[new_id] = checkpoint._replace(job_id=new_id)
+
+            return
+
+        checkpoint = self.load(job_id)
+        if checkpoint is not None:
+            self._write_later(
+                self._path(new_id),
+                pickle.dumps(checkpoint._replace(job_id=new_id))
+            )
+            self.remove(job_id)
+
+    def remove(
+        self,
+        job_id: Annotated[str, 'The id of the job.']
+    ) -> None:
+        """
+        Drop the checkpoint of a job, if it has one.
+
+        Args:
+            job_id (str): The id of the job.
+        """
+        if self.directory is None:
+            self._checkpoints.pop(job_id, None)
+
+        elif VALID_ID.fullmatch(job_id):
+            self._write_later(self._path(job_id), None)
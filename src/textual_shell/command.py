@@ -12,7 +12,12 @@ from rich.rule import Rule
 
 from textual.message import Message
 
+from .cache import CachePolicy
 from .job import Job
+from .limits import ProcessLimits
+from .rate_limit import RateLimit
+from .retry import RetryPolicy
+from .scheduler import Priority
 
 
 class CommandNode:
@@ -102,6 +107,37 @@ class CommandNode:
 class Command(ABC):
     """Base class for the Commands for the shell widget."""
     
+    PRIORITY: Priority = Priority.NORMAL
+    """The priority class the command's jobs are scheduled with."""
+    
+    MAX_CONCURRENT: int | None = None
+    """Cap on how many of the command's jobs can run at once."""
+    
+    TIMEOUT: float | None = None
+    """Seconds the command's jobs may run before they are killed."""
+    
+    LIMITS: ProcessLimits | None = None
+    """Niceness, CPU affinity and resource limits for the child processes 
+    the command's jobs spawn."""
+    
+    RETRY: RetryPolicy | None = None
+    """When and how often the command's failed jobs are run again."""
+    
+    SINGLE_FLIGHT: bool = False
+    """Whether a job with the same arguments as a live job of the
+    command joins it instead of running again. Only for idempotent 
+    commands."""
+    
+    CACHE: CachePolicy | None = None
+    """How the results of the command's jobs are cached. A job with 
+    the same arguments as a fresh result completes from the cache.
+    Only the job.result of a completed job is cached, jobs that 
+    leave it as None are never cached."""
+    
+    RATE_LIMIT: RateLimit | None = None
+    """How fast the command's jobs may be started. Interactive
+    commands bypass the queue and are not limited."""
+    
     class Log(Message):
         """
         Default Logging event for commands.
@@ -225,6 +261,26 @@ class Command(ABC):
         panel_text = self.get_help_render(root_node)
         return Panel(panel_text, title='[cyan1]Help')
          
+    def nested_index(
+        self,
+        args: Annotated[list[str], 'The arguments of the command line.']
+    ) -> int | None:
+        """
+        Find where the command line of a nested command starts, for 
+        commands that run another command such as every and map. 
+        The options every command accepts, such as --timeout, are 
+        only taken from the arguments before it, the rest belong 
+        to the nested command.
+        
+        Args:
+            args (list[str]): The arguments of the command line.
+            
+        Returns:
+            index (int | None): The index of the nested command's name
+                or None if the command does not run another.
+        """
+        return None
+         
     @abstractmethod
     def create_job(self, *args) -> Job:
         """
@@ -235,3 +291,22 @@ class Command(ABC):
             job (Job): The created job ready for execution.
         """
         pass
+    
+    async def acreate_job(self, *args) -> Job:
+        """
+        Create a job to execute the command, awaiting whatever must be 
+        looked up first, such as resolving a host. Commands that override 
+        it have their jobs created in a worker while a spinner is shown 
+        next to the prompt, so the input is never blocked, and ctrl+c 
+        cancels the creation. create_job is still used by map and by 
+        schedules, and is the fast path for every other command.
+        
+        Returns:
+            job (Job): The created job ready for execution.
+        """
+        return self.create_job(*args)
+    
+    @property
+    def creates_async(self) -> bool:
+        """Whether the command overrides acreate_job."""
+        return type(self).acreate_job is not Command.acreate_job
@@ -1,24 +1,42 @@
 from .bash import Bash, BashShell, RunBashShell
+from .cache import Cache, CacheReport, ClearCache
 from .clear import Clear, Console, History 
 from .help import Help, HelpScreen, HelpJob
-from .jobs import Jobs, Attach, Kill 
+from .jobs import Jobs, Attach, HistoryReport, Kill, Pause, Renice, Restore, SelectJobs, TraceExport, Wait
+from .map import Map, MapJob
 from .python import Python
+from .schedule import At, Every, ScheduleJob
 from .set import Set, SetJob
 
 
 __all__ = [
+    'At',
     'Attach',
     'Bash',
     'BashShell',
+    'Cache',
+    'CacheReport',
     'Clear',
+    'ClearCache',
     'Console',
+    'Every',
     'Help',
     'HelpScreen',
     'HelpJob',
     'History',
+    'HistoryReport',
     'Jobs',
     'Kill',
+    'Map',
+    'MapJob',
+    'Pause',
+    'Renice',
+    'Restore',
     'RunBashShell',
+    'ScheduleJob',
+    'SelectJobs',
     'Set',
-    'SetJob'
+    'SetJob',
+    'TraceExport',
+    'Wait'
 ]
\ No newline at end of file
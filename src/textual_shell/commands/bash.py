@@ -1,5 +1,8 @@
 import asyncio
+import logging
 import os
+import signal
+from subprocess import SubprocessError
 from typing import Annotated
 
 from textual import log
@@ -12,6 +15,7 @@ from textual.widgets import RichLog
 
 
 from ..command import Command, CommandNode
+from ..scheduler import Priority
 from ..job import Job
 from ..widgets import ShellArea
 
@@ -178,7 +182,7 @@ class BashShell(Screen):
     Screen to render the Bash shell
     
     Args:
-        task (asycnio.Task): The asyncio task of the job the shell is running in.
+        job (Job): The job the shell is running in.
     """
     INCOMPATIBLE_COMMANDS: tuple[str] = (
         'more',
@@ -217,11 +221,13 @@ class BashShell(Screen):
     
     def __init__(
         self,
-        task: Annotated[asyncio.Task, 'The asyncio task of the job the shell is running in.'],
+        job: Annotated[Job, 'The job the shell is running in.'],
         *args, **kwargs
     ) -> None:
         super().__init__(*args, **kwargs)
-        self.shell_task = task
+        self.job = job
+        self.BASH_SHELL = None
+        self.tasks = []
         self.run_worker(self.setup())
         
     def compose(self) -> ComposeResult:
@@ -249,21 +255,34 @@ class BashShell(Screen):
     def action_kill_shell(self) -> None:
         """Kill the bash shell job and 
         return to the main screen"""
-        for task in self.tasks:
-            task.cancel()
-        
-        self.shell_task.cancel()
+        self.job.kill()
         self.app.pop_screen()
         
     async def setup(self):
         """Spawn the child process to run the bash shell.
-        Also create the tasks for reading stdout and stderr."""
-        self.BASH_SHELL = await asyncio.create_subprocess_exec(
-            'bash',
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
+        Also create the tasks for reading stdout and stderr.
+        If the process can not be started, for example because
+        its limits can not be applied, only the job fails."""
+        try:
+            self.BASH_SHELL = await asyncio.create_subprocess_exec(
+                'bash',
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True,
+                preexec_fn=self.job.preexec_fn
+            )
+            
+        except (SubprocessError, OSError) as e:
+            self.job.send_log(f'{self.job.id} - Could not start bash: {e}', logging.ERROR)
+            self.job.error(repr(e))
+            if self.app.screen is self:
+                self.app.pop_screen()
+                
+            self.job.kill()
+            return
+            
+        self.job.add_process(self.BASH_SHELL)
         stdout_task = asyncio.create_task(
             self.read_stdout(),
             name='stdout_task'
@@ -276,6 +295,17 @@ class BashShell(Screen):
         
         self.tasks = [stdout_task, stderr_task]
         
+    async def teardown(self) -> None:
+        """Stop the reader tasks, take a last usage sample
+        then kill the process group and reap the bash process."""
+        for task in self.tasks:
+            task.cancel()
+            
+        self.job.sample_usage()
+        if self.BASH_SHELL is not None and self.BASH_SHELL.returncode is None:
+            self.job.send_signal(signal.SIGKILL)
+            await self.BASH_SHELL.wait()
+        
     def handle_cd(self, cmd: str) -> None:
         """
         update the current directory for the prompt.
@@ -346,6 +376,7 @@ class BashShell(Screen):
         
         elif text == 'exit':
             self.action_kill_shell()
+            return
         
         elif text.count(' && ') > 0:
             cmds = text.split(' && ')
@@ -434,22 +465,29 @@ class RunBashShell(Job):
     
     async def execute(self):
         """Create and install the screen for the bash shell.
-        Wait for the user to kill the shell."""
+        Wait for the user to kill the shell then tear it down."""
         self.running()
         
-        self.screen = BashShell(self.task)
+        self.screen = BashShell(self)
         self.shell.app.install_screen(self.screen, name=self.id)
         self.shell.app.push_screen(self.screen)
         
-        await self.wait_for_cancel()
+        try:
+            await self.wait_for_cancel()
         
-        self.shell.app.uninstall_screen(self.screen)
-        self.completed()
+        finally:
+            await self.screen.teardown()
+            self.shell.app.uninstall_screen(self.screen)
+            
+        if self.status == self.Status.RUNNING:
+            self.completed()
 
 
 class Bash(Command):
     """Command for executing a bash shell."""
     
+    PRIORITY = Priority.INTERACTIVE
+    
     DEFINITION = {
         'bash': CommandNode(
             name='bash',
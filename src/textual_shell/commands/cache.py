@@ -0,0 +1,124 @@
+import logging
+from typing import Annotated
+
+from ..command import Command, CommandNode
+from ..scheduler import Priority
+from ..job import Job
+
+
+class ClearCache(Job):
+    """
+    Job to drop cached results.
+
+    Args:
+        selected_cmd (str | None): Only clear the cache of this command.
+    """
+
+    def __init__(
+        self,
+        selected_cmd: Annotated[str | None, 'Only clear the cache of this command.'],
+        *args, **kwargs
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.selected_cmd = selected_cmd
+
+    async def execute(self):
+        """Clear the caches, persisted results included."""
+        self.running()
+        self.shell.app.result_cache.clear(self.selected_cmd)
+        self.send_log(
+            f'Cleared the cache of {self.selected_cmd or "every command"}.',
+            logging.INFO
+        )
+        self.completed()
+
+
+class CacheReport(Job):
+    """Job to report the size and hit rate of every cache."""
+
+    async def execute(self):
+        """Send a line per cache to the console log."""
+        self.running()
+        caches = self.shell.app.result_cache.caches()
+        if not caches:
+            self.send_log('No command has cached results yet.', logging.INFO)
+
+        for name, cache in caches.items():
+            stats = cache.stats()
+            lookups = stats.hits + stats.misses
+            hit_rate = f'{stats.hits / lookups:.0%}' if lookups else '-'
+            self.send_log(
+                f'{name} - {stats.entries}/{cache.policy.max_entries} entries'
+                f' hits {stats.hits} misses {stats.misses} ({hit_rate} hit rate)'
+                f' evicted {stats.evictions} expired {stats.expirations}',
+                logging.INFO
+            )
+
+        self.completed()
+
+
+class Cache(Command):
+    """
+    Command for managing the result caches of the commands.
+
+    Examples:
+        cache stats
+        cache clear [command]
+    """
+
+    PRIORITY = Priority.INTERACTIVE
+
+    DEFINITION = {
+        'cache': CommandNode(
+            name='cache',
+            description=(
+                'Manage the cached results of commands. '
+                'Only the jobs that set a result are cached.'
+            ),
+            children={
+                'clear': CommandNode(
+                    name='clear',
+                    description='Drop the cached results of a command or of every command.'
+                ),
+                'stats': CommandNode(
+                    name='stats',
+                    description='Show the entries, hits and misses of every cache.'
+                )
+            }
+        )
+    }
+
+    def get_suggestions(
+        self,
+        cmdline: Annotated[list[str], 'The current value of the command line.']
+    ) -> Annotated[list[str], 'A list of possible next values']:
+        """
+        Suggest the commands that cache after clear.
+
+        Args:
+            cmdline (list[str]): The current value of the command line.
+
+        Returns:
+            suggestions (List[str]): List of current node's neighbors names.
+        """
+        if len(cmdline) == 2 and cmdline[1] == 'clear':
+            return list(self.shell.app.result_cache.caches())
+
+        return super().get_suggestions(cmdline)
+
+    def create_job(self, *args) -> ClearCache | CacheReport:
+        """Create the job to clear or report the caches."""
+        if args == ('stats',):
+            return CacheReport(
+                shell=self.shell,
+                cmd=self.name
+            )
+
+        if len(args) in (1, 2) and args[0] == 'clear':
+            return ClearCache(
+                selected_cmd=args[1] if len(args) == 2 else None,
+                shell=self.shell,
+                cmd=self.name
+            )
+
+        self.send_log('Usage: cache clear [command] | cache stats', logging.ERROR)
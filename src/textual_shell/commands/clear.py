@@ -4,6 +4,7 @@ from typing import Annotated
 from textual.message import Message
 
 from ..command import Command, CommandNode
+from ..scheduler import Priority
 from ..job import Job
 
 
@@ -43,6 +44,8 @@ class Clear(Command):
     console log.
     """
     
+    PRIORITY = Priority.INTERACTIVE
+    
     DEFINITION = {
         'clear': CommandNode(
             name='clear',
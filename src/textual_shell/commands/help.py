@@ -6,6 +6,7 @@ from textual.screen import ModalScreen
 from textual.widgets import RichLog
 
 from ..command import Command, CommandNode
+from ..scheduler import Priority
 from ..job import Job
 
 
@@ -84,6 +85,8 @@ class Help(Command):
     Examples:
         help <command>
     """
+    PRIORITY = Priority.INTERACTIVE
+    
     DEFINITION = {
         'help': CommandNode(
             name='help',
@@ -1,71 +1,431 @@
+import asyncio
 import logging
+import time
 from typing import Annotated
 
 from textual.message import Message
 
+from ..checkpoint import Checkpoint
 from ..command import Command, CommandNode
+from ..scheduler import Priority
 from ..job import Job
+from ..utils import format_bytes, pop_option
 
 
-class Attach(Job):
-    """Job to attach to the screen of the selected job."""
+class SelectJobs(Job):
+    """
+    Base class for the jobs that act on other jobs. The jobs are
+    selected by id or glob pattern of ids, tag and status, through
+    the registry's indexes, when the job runs.
+    
+    Args:
+        selected_job (str | None): A job id or a glob pattern such as bash_*.
+        tag (str | None): A tag the selected jobs must have.
+        status (Job.Status | None): The status the selected jobs must have.
+    """
+    
+    def __init__(
+        self,
+        selected_job: Annotated[str | None, 'A job id or a glob pattern of ids.'],
+        tag: Annotated[str | None, 'A tag the selected jobs must have.']=None,
+        status: Annotated[Job.Status | None, 'The status of the selected jobs.']=None,
+        *args, **kwargs
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.selected_job = selected_job
+        self.tag = tag
+        self.selected_status = status
+        
+    def excludes(
+        self,
+        job: Annotated[Job, 'A job that matches the selection.']
+    ) -> bool:
+        """
+        Check if a matching job is left out of the selection.
+        
+        Args:
+            job (Job): A job that matches the selection.
+            
+        Returns:
+            excluded (bool): True for this job itself.
+        """
+        return job is self
+        
+    def selected(self) -> list[Job]:
+        """
+        Resolve the selection, the jobs that excludes rules out 
+        are never part of it. A selection that matches nothing 
+        is logged.
+        
+        Returns:
+            jobs (list[Job]): The selected jobs in the order they were created.
+        """
+        jobs = [
+            job for job in self.registry.select(
+                self.selected_job,
+                self.tag,
+                self.selected_status
+            )
+            if not self.excludes(job)
+        ]
+        if not jobs:
+            self.send_log(f'No jobs match: {self.describe()}', logging.WARNING)
+            
+        return jobs
+    
+    def describe(self) -> str:
+        """Describe the selection for the logs."""
+        parts = []
+        if self.selected_job is not None:
+            parts.append(self.selected_job)
+            
+        if self.tag is not None:
+            parts.append(f'--tag {self.tag}')
+            
+        if self.selected_status is not None:
+            parts.append(f'--status {self.selected_status.name}')
+            
+        return ' '.join(parts)
+
+
+class Attach(SelectJobs):
+    """Job to attach to the screen of the first selected job that has one."""
     
     class To_Job(Message):
         """Message to attach to the job."""
         def __init__(self, job_id):
             super().__init__()
             self.job_id = job_id
+        
+    async def execute(self):
+        """Send request to attach to the selected job."""
+        self.running()
+        jobs = self.selected()
+        if jobs:
+            job = next((job for job in jobs if job.screen), jobs[0])
+            self.shell.post_message(
+                self.To_Job(
+                    job.id
+                )
+            )
+            
+        self.completed()
+        
+        
+class Kill(SelectJobs):
+    """Job to kill the selected jobs."""
+    
+    class Selected(Message):
+        """Message to kill the selected jobs at once."""
+        def __init__(self, job_ids: list[str]):
+            super().__init__()
+            self.job_ids = job_ids
+        
+    async def execute(self):
+        """Send the request to kill the selected jobs."""
+        self.running()
+        if jobs := self.selected():
+            self.shell.post_message(
+                self.Selected(
+                    [job.id for job in jobs]
+                )
+            )
+            
+        self.completed()
+
+
+class Pause(SelectJobs):
+    """
+    Job to pause or resume the selected jobs.
+    
+    Args:
+        resume (bool): Resume the jobs instead of pausing them.
+    """
     
     def __init__(
         self,
-        selected_job: Annotated[str, 'The id of the selected job.'],
+        *args,
+        resume: Annotated[bool, 'Resume the jobs instead of pausing them.']=False,
+        **kwargs
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.resume_selected = resume
+        
+    async def execute(self):
+        """Pause or resume the selected jobs."""
+        self.running()
+        action = 'resume' if self.resume_selected else 'pause'
+        for job in self.selected():
+            changed = job.resume() if self.resume_selected else job.pause()
+            if not changed:
+                self.send_log(
+                    f'Can not {action} {job.id} while it is {job.status.name}.',
+                    logging.WARNING
+                )
+            
+        self.completed()
+
+
+class Restore(Job):
+    """
+    Job to recreate a job that was killed, or lost when the app 
+    exited, from its command and its last checkpoint.
+    
+    Args:
+        selected_job (str): The id of the job to resume.
+        checkpoint (Checkpoint): The last checkpoint of the job.
+    """
+    
+    def __init__(
+        self,
+        selected_job: Annotated[str, 'The id of the job to resume.'],
+        checkpoint: Annotated[Checkpoint, 'The last checkpoint of the job.'],
         *args, **kwargs
     ) -> None:
         super().__init__(*args, **kwargs)
         self.selected_job = selected_job
+        self.checkpoint = checkpoint
         
     async def execute(self):
-        """Send request to attach to the selected job."""
+        """Create the job with the command's arguments and options,
+        hand the checkpoint over to it and schedule it."""
         self.running()
-        self.shell.post_message(
-            self.To_Job(
-                self.selected_job
+        checkpoint = self.checkpoint
+        cmd = self.shell.get_cmd_obj(checkpoint.cmd)
+        job = cmd.create_job(*checkpoint.args) if cmd is not None else None
+        if job is None:
+            self.send_log(
+                f'Could not recreate {self.selected_job} with: '
+                f'{" ".join((checkpoint.cmd, *checkpoint.args))}',
+                logging.ERROR
             )
+            self.error()
+            return
+        
+        job.args = checkpoint.args
+        job.tags.update(checkpoint.tags)
+        job.timeout = checkpoint.timeout
+        job.limits = checkpoint.limits
+        job.retry = checkpoint.retry
+        job.resumed_from = self.selected_job
+        job._checkpointed = True
+        self.shell.app.checkpoints.move(self.selected_job, job.id)
+        self.send_log(
+            f'Resuming {self.selected_job} as {job.id} from its checkpoint '
+            f'of {time.time() - checkpoint.saved_at:.0f}s ago.',
+            logging.INFO
         )
+        self.shell.start_job(job)
         self.completed()
+
+
+class Wait(SelectJobs):
+    """Job that finishes once all of the selected jobs have finished.
+    Other waits are never selected, so two waits on the running 
+    jobs can not wait on each other forever."""
+    
+    def excludes(self, job: Job) -> bool:
+        """Leave this job and every other Wait out of the selection."""
+        return isinstance(job, Wait)
         
-        
-class Kill(Job):
-    """Job to kill another job."""
+    async def execute(self):
+        """Wait for the selected jobs, counting them in the progress column."""
+        self.running()
+        jobs = self.selected()
+        remaining = len(jobs)
+        if remaining:
+            all_done = asyncio.Event()
+            
+            def on_done(job: Job) -> None:
+                nonlocal remaining
+                remaining -= 1
+                self.progress(len(jobs) - remaining, len(jobs))
+                if remaining == 0:
+                    all_done.set()
+            
+            for job in jobs:
+                job.add_done_callback(on_done)
+            
+            self.progress(0, len(jobs))
+            await all_done.wait()
+            
+        self.completed()
+
+
+class Renice(Job):
+    """
+    Job to change the niceness of another job's child processes.
     
-    class Selected(Message):
-        """Message to kill the selected job."""
-        def __init__(self, job_id):
-            super().__init__()
-            self.job_id = job_id
+    Args:
+        selected_job (str): The id of the selected job.
+        nice (int): The new niceness.
+    """
     
     def __init__(
         self,
         selected_job: Annotated[str, 'The id of the selected job.'],
+        nice: Annotated[int, 'The new niceness.'],
         *args, **kwargs
     ) -> None:
         super().__init__(*args, **kwargs)
         self.selected_job = selected_job
+        self.nice = nice
         
     async def execute(self):
-        """Send the request to kill the selected job."""
+        """Renice the processes of the selected job."""
         self.running()
-        self.shell.post_message(
-            self.Selected(
-                self.selected_job
+        job = self.registry.get(self.selected_job)
+        if job is None:
+            self.send_log(f'Job with ID: {self.selected_job} does not exist', logging.ERROR)
+            self.error()
+            return
+        
+        if not job.processes:
+            self.send_log(f'{job.id} has no child processes to renice.', logging.WARNING)
+            
+        try:
+            job.renice(self.nice)
+            
+        except PermissionError:
+            self.send_log(
+                f'Permission denied lowering the niceness of {job.id} to {self.nice}.',
+                logging.ERROR
             )
+            self.error()
+            return
+            
+        self.completed()
+
+
+class HistoryReport(Job):
+    """
+    Job to report on the history of finished jobs.
+    
+    Args:
+        status (Job.Status): Only report jobs that finished with this status.
+        selected_cmd (str): Only report jobs created by this command.
+        last (int): The number of jobs to list.
+    """
+    
+    def __init__(
+        self,
+        status: Annotated[Job.Status, 'Only report jobs with this status.'],
+        selected_cmd: Annotated[str, 'Only report jobs created by this command.'],
+        last: Annotated[int, 'The number of jobs to list.'],
+        *args, **kwargs
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.selected_status = status
+        self.selected_cmd = selected_cmd
+        self.last = last
+        
+    @staticmethod
+    def format_seconds(seconds: float | None) -> str:
+        """Format a number of seconds for the report."""
+        if seconds is None:
+            return '-'
+        
+        return f'{seconds:.2f}s'
+        
+    async def execute(self):
+        """Send the summary and the newest matching jobs to the console log."""
+        self.running()
+        history = self.shell.app.job_history
+        records = history.query(
+            status=self.selected_status,
+            cmd=self.selected_cmd
+        )
+        summary = history.summary(records)
+        
+        statuses = ', '.join(
+            f'{name} {count}' for name, count in summary['statuses'].items()
         )
+        report = f'{summary["count"]} of {history.total} finished jobs matched'
+        if statuses:
+            report += f' - {statuses}'
+            
+        if duration := summary.get('duration'):
+            report += (
+                f' - duration mean {self.format_seconds(duration["mean"])}'
+                f' p50 {self.format_seconds(duration["p50"])}'
+                f' p95 {self.format_seconds(duration["p95"])}'
+                f' max {self.format_seconds(duration["max"])}'
+            )
+            
+        if wait := summary.get('wait'):
+            report += (
+                f' - wait mean {self.format_seconds(wait["mean"])}'
+                f' max {self.format_seconds(wait["max"])}'
+            )
+            
+        self.send_log(report, logging.INFO)
+        
+        for record in records[-self.last:] if self.last > 0 else []:
+            line = (
+                f'{record.id} {record.status.name}'
+                f' ran {self.format_seconds(record.duration)}'
+                f' waited {self.format_seconds(record.wait)}'
+            )
+            if record.cpu is not None:
+                line += f' cpu {self.format_seconds(record.cpu)}'
+                
+            if record.rss is not None:
+                line += f' peak rss {format_bytes(record.rss)}'
+                
+            if record.error:
+                line += f' - {record.error}'
+                
+            self.send_log(line, logging.INFO)
+            
         self.completed()
+        
 
+class TraceExport(Job):
+    """
+    Job to export the recorded lifecycle spans as a Chrome trace.
+    
+    Args:
+        path (str): The path of the JSON file.
+    """
+    
+    DEFAULT_PATH = 'trace.json'
+    
+    def __init__(
+        self,
+        path: Annotated[str, 'The path of the JSON file.'],
+        *args, **kwargs
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.path = path
+        
+    async def execute(self):
+        """Convert the spans on the event loop and write the file in a thread."""
+        self.running()
+        tracer = self.shell.app.tracer
+        trace = tracer.chrome_trace()
+        try:
+            await asyncio.to_thread(tracer.write, trace, self.path)
+            
+        except OSError as e:
+            self.send_log(f'{self.id} - {e!r}', logging.ERROR)
+            self.error(repr(e))
+            return
+        
+        self.send_log(
+            f'Exported {len(tracer)} spans to {self.path}',
+            logging.INFO
+        )
+        self.completed()
+        
 
 class Jobs(Command):
     """Command for interacting with the jobs running in the shell."""
     
+    PRIORITY = Priority.INTERACTIVE
+    
+    SELECTING: tuple[str] = ('attach', 'kill', 'pause', 'resume', 'wait')
+    """The subcommands that take a selection of jobs."""
+    
     DEFINITION = {
         'jobs': CommandNode(
             name='jobs',
@@ -77,20 +437,55 @@ class Jobs(Command):
                 ),
                 'kill': CommandNode(
                     name='kill',
-                    description='Kill the job.'
+                    description=(
+                        'Kill the jobs. Select them by id, a pattern such as '
+                        "'bash_*', --tag <tag> and --status <STATUS>."
+                    )
+                ),
+                'wait': CommandNode(
+                    name='wait',
+                    description='Wait until the selected jobs have finished.'
+                ),
+                'pause': CommandNode(
+                    name='pause',
+                    description='Pause the jobs, their processes are stopped.'
+                ),
+                'resume': CommandNode(
+                    name='resume',
+                    description=(
+                        'Resume paused jobs, or recreate a finished job '
+                        'from its last checkpoint.'
+                    )
+                ),
+                'renice': CommandNode(
+                    name='renice',
+                    description='Set the niceness of the job\'s processes: renice <id> <n>.'
+                ),
+                'history': CommandNode(
+                    name='history',
+                    description=(
+                        'Summarize finished jobs. Filter with --status <STATUS>, '
+                        '--cmd <command> and list the newest with --last <n>.'
+                    )
+                ),
+                'trace': CommandNode(
+                    name='trace',
+                    description=(
+                        'Export the lifecycle spans of recent jobs as a Chrome '
+                        'trace JSON file, trace.json by default.'
+                    )
                 )
             }
         )
     }
     
-    JOBS = []
-        
     def get_suggestions(
         self,
         cmdline: Annotated[list[str], 'The current value of the command line.']
     ) -> Annotated[list[str], 'A list of possible next values']:
         """
         Get a list of suggestions for autocomplete via the current args neighbors.
+        The job ids are read from the app's job registry.
         
         Args:
             cmdline (list[str]): The current value of the  command line.
@@ -99,54 +494,197 @@ class Jobs(Command):
             suggestions (List[str]): List of current node's neighbors names.
         """
         if len(cmdline) == 2:
-            if cmdline[1] == 'kill' or cmdline[1] == 'attach':
-                return self.JOBS
+            if cmdline[1] == 'resume':
+                return list(dict.fromkeys(
+                    [*self.shell.app.job_registry, *self.shell.app.checkpoints.ids()]
+                ))
+            
+            if cmdline[1] in (*self.SELECTING, 'renice'):
+                return list(self.shell.app.job_registry)
+            
+            if cmdline[1] in ('history', 'trace'):
+                return []
         
-        else:
-            return super().get_suggestions(cmdline)
-
-    def add_job_id(self, job_id: str) -> None:
+        return super().get_suggestions(cmdline)
+        
+    def parse_status(
+        self,
+        value: Annotated[str, 'The name of a status.']
+    ) -> Job.Status | None:
         """
-        Add the job id to use for suggestions.
+        Parse the name of a status, in any case.
         
         Args:
-            job_id (str): Tht job to remove.
+            value (str): The name of a status.
+            
+        Returns:
+            status (Job.Status | None): The status or None if it is invalid.
         """
-        self.JOBS.append(job_id)
-    
-    def remove_job_id(self, job_id: str) -> None:
+        if value.upper() not in Job.Status.__members__:
+            self.send_log(f'Invalid status: {value}', logging.ERROR)
+            return None
+        
+        return Job.Status[value.upper()]
+        
+    def create_selection(
+        self,
+        subcommand: Annotated[str, 'The subcommand.'],
+        *args
+    ) -> SelectJobs | Restore | None:
         """
-        Remove the job id from the suggestions.
+        Parse the selection of jobs and create the job for the subcommand.
+        Resuming the id of a job that is no longer registered recreates
+        it from its checkpoint.
         
         Args:
-            job_id (str): Tht job to remove.
+            subcommand (str): One of the SELECTING subcommands.
+            args (tuple[str]): The id or pattern and the filters.
+            
+        Returns:
+            job (SelectJobs | Restore | None): The job or None if the selection is invalid.
         """
-        self.JOBS.remove(job_id)
+        args = list(args)
+        try:
+            tag = pop_option(args, '--tag')
+            status = pop_option(args, '--status')
+            
+        except ValueError as e:
+            self.send_log(f'Invalid option: {e}', logging.ERROR)
+            return
         
-    def create_job(self, *args) -> Attach | Kill:
-        """Create the job to manage other jobs."""
-        if len(args) != 2:
-            self.send_log('Invalid args', logging.ERROR)
+        if status is not None:
+            if (status := self.parse_status(status)) is None:
+                return
+            
+        if len(args) > 1 or (not args and tag is None and status is None):
+            self.send_log(
+                f'Usage: jobs {subcommand} [<id> | <pattern>] '
+                '[--tag <tag>] [--status <STATUS>]',
+                logging.ERROR
+            )
             return
         
-        if args[0] == 'attach':
-            return Attach(
-                selected_job=args[1],
+        if subcommand == 'resume' and len(args) == 1 and tag is None and status is None:
+            if job := self.create_restore(args[0].strip('\'"')):
+                return job
+            
+        job_type = {
+            'attach': Attach,
+            'kill': Kill,
+            'pause': Pause,
+            'resume': Pause,
+            'wait': Wait
+        }[subcommand]
+        kwargs = {'resume': True} if subcommand == 'resume' else {}
+        return job_type(
+            selected_job=args[0].strip('\'"') if args else None,
+            tag=tag,
+            status=status,
+            shell=self.shell,
+            cmd=self.name,
+            **kwargs
+        )
+        
+    def create_restore(
+        self,
+        job_id: Annotated[str, 'The id of a job.']
+    ) -> Restore | None:
+        """
+        Create the job that recreates a job from its checkpoint.
+        
+        Args:
+            job_id (str): The id of a job.
+            
+        Returns:
+            job (Restore | None): The job or None if the job is still 
+                registered or has no checkpoint.
+        """
+        if job_id in self.shell.app.job_registry:
+            return None
+        
+        checkpoint = self.shell.app.checkpoints.load(job_id)
+        if checkpoint is None:
+            return None
+        
+        return Restore(
+            selected_job=job_id,
+            checkpoint=checkpoint,
+            shell=self.shell,
+            cmd=self.name
+        )
+        
+    def create_history_report(self, *args) -> HistoryReport:
+        """
+        Parse the filters for the history report.
+        
+        Args:
+            args (tuple[str]): The options after jobs history.
+            
+        Returns:
+            job (HistoryReport): The job to send the report.
+        """
+        args = list(args)
+        try:
+            status = pop_option(args, '--status')
+            selected_cmd = pop_option(args, '--cmd')
+            last = int(pop_option(args, '--last') or 10)
+            
+        except ValueError as e:
+            self.send_log(f'Invalid option: {e}', logging.ERROR)
+            return
+        
+        if args:
+            self.send_log(f'Invalid args: {" ".join(args)}', logging.ERROR)
+            return
+            
+        if status is not None:
+            if (status := self.parse_status(status)) is None:
+                return
+        
+        return HistoryReport(
+            status=status,
+            selected_cmd=selected_cmd,
+            last=last,
+            shell=self.shell,
+            cmd=self.name
+        )
+        
+    def create_job(
+        self,
+        *args
+    ) -> SelectJobs | Restore | Renice | HistoryReport | TraceExport:
+        """Create the job to manage other jobs."""
+        if len(args) > 0 and args[0] == 'history':
+            return self.create_history_report(*args[1:])
+        
+        if len(args) in (1, 2) and args[0] == 'trace':
+            return TraceExport(
+                path=args[1] if len(args) == 2 else TraceExport.DEFAULT_PATH,
                 shell=self.shell,
                 cmd=self.name
             )
+        
+        if len(args) == 3 and args[0] == 'renice':
+            try:
+                nice = int(args[2])
+                
+            except ValueError:
+                self.send_log(f'Invalid niceness: {args[2]}', logging.ERROR)
+                return
             
-        elif args[0] == 'kill':
-            return Kill(
+            return Renice(
                 selected_job=args[1],
+                nice=nice,
                 shell=self.shell,
                 cmd=self.name
             )
         
-        else:
-            self.shell.notify(
-                message='Invalid subcommand.',
-                title='Command: jobs',
-                severity='error'
-            )
+        if len(args) > 0 and args[0] in self.SELECTING:
+            return self.create_selection(*args)
+        
+        self.shell.notify(
+            message='Invalid subcommand.',
+            title='Command: jobs',
+            severity='error'
+        )
     
\ No newline at end of file
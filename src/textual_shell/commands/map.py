@@ -0,0 +1,285 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Annotated, AsyncIterator
+
+from ..command import Command, CommandNode
+from ..job import Job
+from ..scheduler import Priority, usable_cpu_count
+from ..utils import pop_option
+
+
+PLACEHOLDER = '{}'
+"""Replaced by the input in the arguments of the mapped command."""
+
+INLINE = ':::'
+"""The inputs follow this marker on the command line."""
+
+FROM_FILE = '<'
+"""The inputs are the lines of the file after this marker."""
+
+
+class MapJob(Job):
+    """
+    Job that runs a command once for every input, at most
+    `concurrency` at a time. The child jobs are scheduled like
+    any other job but only the map job is shown in the Job Manager,
+    its progress column counts the children. Pausing it stops new
+    children from being started.
+
+    Args:
+        command (Command): The command to run for every input.
+        template (list[str]): The arguments, {} is replaced by the input.
+        inputs (list[str] | None): The inputs, None to read a file or stdin.
+        path (str | None): The file to read the inputs from.
+        concurrency (int): The number of children running at once.
+    """
+
+    def __init__(
+        self,
+        command: Annotated[Command, 'The command to run for every input.'],
+        template: Annotated[list[str], 'The arguments, {} is replaced by the input.'],
+        inputs: Annotated[list[str] | None, 'The inputs.'],
+        path: Annotated[str | None, 'The file to read the inputs from.'],
+        concurrency: Annotated[int, 'The number of children running at once.'],
+        *args, **kwargs
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.command = command
+        self.template = template
+        self.inputs = inputs
+        self.path = path
+        self.concurrency = concurrency
+        self.children: set[Job] = set()
+        self.counts: Counter = Counter()
+
+    def build_args(self, item: str) -> list[str]:
+        """
+        Put an input into the arguments of the command.
+
+        Args:
+            item (str): The input.
+
+        Returns:
+            args (list[str]): The placeholders replaced by the input or the
+                input appended if there is no placeholder.
+        """
+        if not any(PLACEHOLDER in arg for arg in self.template):
+            return [*self.template, item]
+
+        return [arg.replace(PLACEHOLDER, item) for arg in self.template]
+
+    async def read_inputs(self) -> AsyncIterator[str]:
+        """Yield the inputs from the command line, the file or the pipeline."""
+        if self.inputs is not None:
+            for item in self.inputs:
+                yield item
+
+        elif self.path is not None:
+            text = await asyncio.to_thread(Path(self.path).read_text)
+            for line in text.splitlines():
+                if line := line.strip():
+                    yield line
+
+        elif self.stdin is not None:
+            async for item in self.stdin:
+                yield str(item)
+
+    def create_child(self, item: str, finished: asyncio.Queue) -> Job | None:
+        """Create the job for an input, it is scheduled with the rest of its batch."""
+        args = self.build_args(item)
+        job = self.command.create_job(*args)
+        if job is None:
+            self.counts[Job.Status.ERROR.name] += 1
+            self.send_log(f'{self.id} - Failed to create a job for: {item}', logging.ERROR)
+            return None
+
+        job.parent = self
+        job.args = tuple(args)
+        job.add_done_callback(finished.put_nowait)
+        self.children.add(job)
+        return job
+
+    def report(self, total: int | None) -> None:
+        """Show the counts of the children in the progress column."""
+        done = sum(self.counts.values())
+        note = ' '.join(f'{name} {count}' for name, count in self.counts.items())
+        self.progress(done, total, f'{note} RUNNING {len(self.children)}'.strip())
+
+    async def execute(self):
+        """Run the children, keeping at most concurrency of them going.
+        Children are submitted in batches, except for inputs streamed 
+        from a pipeline, which start as soon as they arrive."""
+        self.running()
+        began = time.monotonic()
+        total = len(self.inputs) if self.inputs is not None else None
+        finished: asyncio.Queue[Job] = asyncio.Queue()
+        inputs = self.read_inputs()
+        streaming = self.inputs is None and self.path is None
+        exhausted = False
+
+        try:
+            while True:
+                batch = []
+                while not exhausted and len(self.children) < self.concurrency:
+                    await self.checkpoint()
+                    try:
+                        item = await inputs.__anext__()
+
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+
+                    if job := self.create_child(item, finished):
+                        batch.append(job)
+
+                    if streaming:
+                        self.shell.app.job_scheduler.submit_many(batch)
+                        batch = []
+
+                self.shell.app.job_scheduler.submit_many(batch)
+                self.report(total)
+                if not self.children:
+                    break
+
+                job = await finished.get()
+                self.children.discard(job)
+                self.counts[job.status.name] += 1
+
+        except BaseException:
+            for job in list(self.children):
+                job.kill()
+
+            raise
+
+        finally:
+            await inputs.aclose()
+
+        count = sum(self.counts.values())
+        statuses = ', '.join(f'{name} {n}' for name, n in self.counts.items())
+        summary = (
+            f'{self.id} - {count} {self.command.name} jobs in '
+            f'{time.monotonic() - began:.2f}s: {statuses or "no inputs"}'
+        )
+        failed = count - self.counts[Job.Status.COMPLETED.name]
+        if failed:
+            self.send_log(summary, logging.WARNING)
+            self.error(f'{failed} of {count} jobs did not complete.')
+
+        else:
+            self.send_log(summary, logging.INFO)
+            self.completed()
+
+
+class Map(Command):
+    """
+    Run a command once for every input, like xargs or GNU parallel.
+    {} in the arguments is replaced by the input, otherwise the input
+    is appended. Inputs come after :::, from the lines of a file
+    after < or from the previous job in a pipeline.
+
+    Examples:
+        map -j 16 sleep < items.txt
+        map -j 8 mycmd {} ::: a b c
+    """
+
+    PRIORITY = Priority.INTERACTIVE
+
+    DEFINITION = {
+        'map': CommandNode(
+            name='map',
+            description=(
+                'Run a command for every input. -j <n> caps how many run at once.'
+            )
+        )
+    }
+
+    def get_suggestions(
+        self,
+        cmdline: Annotated[list[str], 'The current value of the command line.']
+    ) -> Annotated[list[str], 'A list of possible next values']:
+        """
+        Suggest the shell's commands for the command to map.
+
+        Args:
+            cmdline (list[str]): The current value of the command line.
+
+        Returns:
+            suggestions (List[str]): The names of the commands.
+        """
+        args = [arg for arg in cmdline[1:-1] if arg != '-j' and not arg.isdigit()]
+        if args:
+            return []
+
+        return [name for name in self.shell.command_list if name != self.name]
+
+    def nested_index(
+        self,
+        args: Annotated[list[str], 'The arguments of the command line.']
+    ) -> int:
+        """
+        The mapped command line starts at the first argument that is
+        not an option of map, its options belong to the mapped command.
+
+        Args:
+            args (list[str]): The arguments of the command line.
+
+        Returns:
+            index (int): The index of the mapped command's name.
+        """
+        index = 0
+        while index < len(args) and args[index].startswith('-'):
+            index += 1 if '=' in args[index] else 2
+
+        return min(index, len(args))
+
+    def create_job(self, *args) -> MapJob:
+        """Parse the options and inputs and create the MapJob.
+        Only the options before the mapped command are map's."""
+        args = list(args)
+        index = self.nested_index(args)
+        options, args = args[:index], args[index:]
+        try:
+            concurrency = int(pop_option(options, '-j') or usable_cpu_count())
+
+        except ValueError as e:
+            self.send_log(f'Invalid option: {e}', logging.ERROR)
+            return
+
+        if options:
+            self.send_log(f'Invalid option: {" ".join(options)}', logging.ERROR)
+            return
+
+        inputs = path = None
+        if INLINE in args:
+            index = args.index(INLINE)
+            args, inputs = args[:index], args[index + 1:]
+
+        elif FROM_FILE in args:
+            index = args.index(FROM_FILE)
+            if index + 2 != len(args):
+                self.send_log(f'{FROM_FILE} needs exactly one file.', logging.ERROR)
+                return
+
+            args, path = args[:index], args[index + 1]
+
+        if not args or concurrency < 1:
+            self.send_log('Usage: map -j <n> <command> [args] ::: <inputs>', logging.ERROR)
+            return
+
+        command = self.shell.get_cmd_obj(args[0])
+        if command is None:
+            self.send_log(f'Command: {args[0]} does not exist!', logging.ERROR)
+            return
+
+        return MapJob(
+            command=command,
+            template=args[1:],
+            inputs=inputs,
+            path=path,
+            concurrency=concurrency,
+            shell=self.shell,
+            cmd=self.name
+        )
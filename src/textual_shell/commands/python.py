@@ -1,4 +1,7 @@
 import asyncio
+import logging
+import signal
+from subprocess import SubprocessError
 from typing import Annotated
 
 from textual.app import ComposeResult
@@ -7,6 +10,7 @@ from textual.screen import Screen
 from textual.widgets import RichLog
 
 from ..command import Command, CommandNode
+from ..scheduler import Priority
 from ..job import Job
 from ..widgets import ShellArea
 
@@ -66,7 +70,7 @@ class PythonInterpreter(Screen):
     Screen to render an interactive python interpreter.
 
     Args:
-        task (asyncio.Task): The asyncio task of the job.
+        job (Job): The job the interpreter is running in.
     """
 
     BINDINGS = [
@@ -96,12 +100,14 @@ class PythonInterpreter(Screen):
 
     def __init__(
         self,
-        task: Annotated[asyncio.Task, 'The asyncio task of the job the shell is running in.'],
+        job: Annotated[Job, 'The job the interpreter is running in.'],
         *args, **kwargs
     ) -> None:
         super().__init__(*args, **kwargs)
         self.prompt = '>>> '
-        self.interpreter_task = task
+        self.job = job
+        self.PYTHON_INTERPRETER = None
+        self.tasks = []
         self.run_worker(self.setup())
 
     def compose(self) -> ComposeResult:
@@ -120,23 +126,35 @@ class PythonInterpreter(Screen):
     def action_kill_interpreter(self) -> None:
         """Kill the interpreter and 
         return to the main screen"""
-        for task in self.tasks:
-            task.cancel()
-
-        self.PYTHON_INTERPRETER.kill()
-        self.interpreter_task.cancel()
+        self.job.kill()
         self.app.pop_screen()
 
     async def setup(self):
         """Spawn the child process to run the python interpreter.
-        Also create the tasks for reading stdout and stderr."""
-        self.PYTHON_INTERPRETER = await asyncio.create_subprocess_exec(
-            'python',
-            '-i',
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
+        Also create the tasks for reading stdout and stderr.
+        If the process can not be started, for example because
+        its limits can not be applied, only the job fails."""
+        try:
+            self.PYTHON_INTERPRETER = await asyncio.create_subprocess_exec(
+                'python',
+                '-i',
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True,
+                preexec_fn=self.job.preexec_fn
+            )
+            
+        except (SubprocessError, OSError) as e:
+            self.job.send_log(f'{self.job.id} - Could not start python: {e}', logging.ERROR)
+            self.job.error(repr(e))
+            if self.app.screen is self:
+                self.app.pop_screen()
+                
+            self.job.kill()
+            return
+            
+        self.job.add_process(self.PYTHON_INTERPRETER)
         stdout_task = asyncio.create_task(
             self.read_stdout(),
             name='stdout_task'
@@ -148,6 +166,20 @@ class PythonInterpreter(Screen):
         )
         
         self.tasks = [stdout_task, stderr_task]
+        
+    async def teardown(self) -> None:
+        """Stop the reader tasks, take a last usage sample
+        then kill the process group and reap the interpreter."""
+        for task in self.tasks:
+            task.cancel()
+            
+        self.job.sample_usage()
+        if (
+            self.PYTHON_INTERPRETER is not None 
+            and self.PYTHON_INTERPRETER.returncode is None
+        ):
+            self.job.send_signal(signal.SIGKILL)
+            await self.PYTHON_INTERPRETER.wait()
 
     async def on_shell_area_execute(
         self,
@@ -170,7 +202,8 @@ class PythonInterpreter(Screen):
             interpreter.history_list.appendleft(text)
         
         if text == 'exit()':
-            self.action_kill_shell()
+            self.action_kill_interpreter()
+            return
         
         self.PYTHON_INTERPRETER.stdin.write(text.encode() + b'\n')
         await self.PYTHON_INTERPRETER.stdin.drain()
@@ -217,18 +250,25 @@ class RunPythonInterpreter(Job):
         """Execute the interpreter."""
         self.running()
 
-        self.screen = PythonInterpreter(self.task)
+        self.screen = PythonInterpreter(self)
         self.shell.app.install_screen(self.screen, name=self.id)
         self.shell.app.push_screen(self.screen)
         
-        await self.wait_for_cancel()
+        try:
+            await self.wait_for_cancel()
         
-        self.shell.app.uninstall_screen(self.screen)
-        self.completed()
+        finally:
+            await self.screen.teardown()
+            self.shell.app.uninstall_screen(self.screen)
+            
+        if self.status == self.Status.RUNNING:
+            self.completed()
 
 
 class Python(Command):
     """Command for spawning an interactive python interpreter."""
+    PRIORITY = Priority.INTERACTIVE
+    
     DEFINITION = {
         'python': CommandNode(
             name='python',
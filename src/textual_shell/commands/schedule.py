@@ -0,0 +1,324 @@
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Annotated
+
+from ..command import Command, CommandNode
+from ..job import Job
+from ..scheduler import Priority
+from ..timer_wheel import Timer
+from ..utils import InvalidDuration, parse_duration
+
+
+class ScheduleJob(Job):
+    """
+    Job that keeps a schedule alive. Every time it is due a new job is
+    created from the command line, unless the previous run is still
+    going, in which case the run is skipped. A one-shot run that is
+    due while the schedule is paused waits until it is resumed. The
+    timers live on the app's timer wheel, the schedule itself only
+    waits to be killed. Its row in the Job Manager shows the runs and
+    the next due time.
+
+    Args:
+        cmdline (str): The command line to run.
+        interval (float | None): Seconds between runs for a recurring schedule.
+        delay (float): Seconds until the first run.
+    """
+
+    def __init__(
+        self,
+        cmdline: Annotated[str, 'The command line to run.'],
+        interval: Annotated[float | None, 'Seconds between runs.'],
+        delay: Annotated[float, 'Seconds until the first run.'],
+        *args, **kwargs
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.cmdline = cmdline
+        self.interval = interval
+        self.delay = delay
+        self.runs = 0
+        self.skipped = 0
+        self.timer: Timer = None
+        self.current: list[Job] = []
+        self._next_run: float = None
+        self._postponed = False
+
+    def arm(self) -> None:
+        """Put the next run on the timer wheel and show when it is due."""
+        delay = max(0.0, self._next_run - time.monotonic())
+        self.timer = self.shell.app.timer_wheel.schedule(delay, self.fire)
+        due = time.strftime('%H:%M:%S', time.localtime(time.time() + delay))
+        note = f'runs - next {due}'
+        if self.skipped:
+            note += f' - skipped {self.skipped}'
+
+        self.progress(self.runs, None, note)
+
+    def fire(self) -> None:
+        """Start a run unless the schedule is paused or
+        the previous run is still going. A one-shot run is 
+        postponed until the schedule is resumed instead."""
+        if self.status == self.Status.PAUSED and self.interval is None:
+            self._postponed = True
+            self.send_log(f'{self.id} - Postponed until resumed.', logging.INFO)
+            self.progress(self.runs, None, 'runs - due when resumed')
+            return
+        
+        if self.status == self.Status.PAUSED:
+            self.skipped += 1
+            
+        elif any(job.id in self.registry for job in self.current):
+            self.skipped += 1
+            self.send_log(
+                f'{self.id} - Skipped, the previous run is still going.',
+                logging.WARNING
+            )
+
+        else:
+            try:
+                if jobs := self.shell.build_stage(self.cmdline):
+                    self.current = jobs
+                    self.runs += 1
+                    self.shell.start_stage(jobs)
+
+            except Exception as e:
+                self.send_log(f'{self.id} - {self.cmdline}: {e!r}', logging.ERROR)
+
+        if self.interval is None:
+            self.kill()
+            return
+
+        now = time.monotonic()
+        self._next_run += self.interval
+        if self._next_run <= now:
+            missed = int((now - self._next_run) // self.interval) + 1
+            self._next_run += missed * self.interval
+
+        self.arm()
+
+    def resume(self) -> bool:
+        """
+        Resume the schedule, starting a postponed run.
+        
+        Returns:
+            resumed (bool): False if the schedule was not paused.
+        """
+        if not super().resume():
+            return False
+        
+        if self._postponed and not self.kill_requested:
+            self._postponed = False
+            self.fire()
+        
+        return True
+
+    async def execute(self):
+        """Arm the first run then wait until the schedule is killed."""
+        self.running()
+        self._next_run = time.monotonic() + self.delay
+        self.arm()
+        try:
+            await self.wait_for_cancel()
+
+        finally:
+            self.timer.cancel()
+
+        self.completed()
+
+
+class Every(Command):
+    """
+    Run a command repeatedly. The first run is one interval from now.
+    A run is skipped if the previous one is still going.
+    Kill the schedule's job to stop it.
+
+    Examples:
+        every 30s <command> [args]
+        every 1h30m <command> [args]
+    """
+
+    PRIORITY = Priority.INTERACTIVE
+
+    DEFINITION = {
+        'every': CommandNode(
+            name='every',
+            description='Run a command every <interval>, such as 30s or 5m.'
+        )
+    }
+
+    def get_suggestions(
+        self,
+        cmdline: Annotated[list[str], 'The current value of the command line.']
+    ) -> Annotated[list[str], 'A list of possible next values']:
+        """
+        Suggest the shell's commands after the interval.
+
+        Args:
+            cmdline (list[str]): The current value of the command line.
+
+        Returns:
+            suggestions (List[str]): The names of the commands.
+        """
+        if len(cmdline) == 3:
+            return list(self.shell.command_list)
+
+        return []
+
+    def nested_index(
+        self,
+        args: Annotated[list[str], 'The arguments of the command line.']
+    ) -> int:
+        """
+        The command line to schedule starts after the interval, its
+        options belong to the scheduled command.
+
+        Args:
+            args (list[str]): The arguments of the command line.
+
+        Returns:
+            index (int): The index of the scheduled command's name.
+        """
+        return 1
+
+    def create_job(self, *args) -> ScheduleJob:
+        """Create the ScheduleJob for the interval and command line."""
+        if len(args) < 2:
+            self.send_log('Usage: every <interval> <command> [args]', logging.ERROR)
+            return
+
+        try:
+            interval = parse_duration(args[0])
+
+        except InvalidDuration as e:
+            self.send_log(str(e), logging.ERROR)
+            return
+
+        if interval <= 0:
+            self.send_log('The interval must be positive.', logging.ERROR)
+            return
+
+        if self.shell.get_cmd_obj(args[1]) is None:
+            self.send_log(f'Command: {args[1]} does not exist!', logging.ERROR)
+            return
+
+        return ScheduleJob(
+            cmdline=' '.join(args[1:]),
+            interval=interval,
+            delay=interval,
+            shell=self.shell,
+            cmd=self.name
+        )
+
+
+class At(Command):
+    """
+    Run a command once at the next occurrence of a time of day.
+    Kill the schedule's job to cancel it.
+
+    Examples:
+        at 14:00 <command> [args]
+        at 09:30:15 <command> [args]
+    """
+
+    PRIORITY = Priority.INTERACTIVE
+
+    DEFINITION = {
+        'at': CommandNode(
+            name='at',
+            description='Run a command at <HH:MM> or <HH:MM:SS>.'
+        )
+    }
+
+    @staticmethod
+    def seconds_until(
+        time_of_day: Annotated[str, 'The time as HH:MM or HH:MM:SS.']
+    ) -> float:
+        """
+        Get the seconds until the next occurrence of a time of day.
+
+        Args:
+            time_of_day (str): The time as HH:MM or HH:MM:SS.
+
+        Returns:
+            seconds (float): The seconds until then, tomorrow if it has passed.
+
+        Raises:
+            ValueError: If the time can not be parsed.
+        """
+        for time_format in ('%H:%M', '%H:%M:%S'):
+            try:
+                parsed = datetime.strptime(time_of_day, time_format).time()
+                break
+
+            except ValueError:
+                continue
+
+        else:
+            raise ValueError(f'Invalid time: {time_of_day}')
+
+        now = datetime.now()
+        due = datetime.combine(now.date(), parsed)
+        if due <= now:
+            due += timedelta(days=1)
+
+        return (due - now).total_seconds()
+
+    def get_suggestions(
+        self,
+        cmdline: Annotated[list[str], 'The current value of the command line.']
+    ) -> Annotated[list[str], 'A list of possible next values']:
+        """
+        Suggest the shell's commands after the time.
+
+        Args:
+            cmdline (list[str]): The current value of the command line.
+
+        Returns:
+            suggestions (List[str]): The names of the commands.
+        """
+        if len(cmdline) == 3:
+            return list(self.shell.command_list)
+
+        return []
+
+    def nested_index(
+        self,
+        args: Annotated[list[str], 'The arguments of the command line.']
+    ) -> int:
+        """
+        The command line to schedule starts after the time, its
+        options belong to the scheduled command.
+
+        Args:
+            args (list[str]): The arguments of the command line.
+
+        Returns:
+            index (int): The index of the scheduled command's name.
+        """
+        return 1
+
+    def create_job(self, *args) -> ScheduleJob:
+        """Create the ScheduleJob for the time and command line."""
+        if len(args) < 2:
+            self.send_log('Usage: at <HH:MM> <command> [args]', logging.ERROR)
+            return
+
+        try:
+            delay = self.seconds_until(args[0])
+
+        except ValueError as e:
+            self.send_log(str(e), logging.ERROR)
+            return
+
+        if self.shell.get_cmd_obj(args[1]) is None:
+            self.send_log(f'Command: {args[1]} does not exist!', logging.ERROR)
+            return
+
+        return ScheduleJob(
+            cmdline=' '.join(args[1:]),
+            interval=None,
+            delay=delay,
+            shell=self.shell,
+            cmd=self.name
+        )
@@ -6,6 +6,7 @@ from textual.message import Message
 from .. import configure
 from ..job import Job
 from ..command import Command, CommandNode
+from ..scheduler import Priority
 
 
 class SetJob(Job):
@@ -122,6 +123,8 @@ class Set(Command):
         set <section> <setting> <value> # sets the variable in the section to the value.
     """
     
+    PRIORITY = Priority.INTERACTIVE
+    
     DEFINITION = {
         'set': CommandNode(
             name='set',
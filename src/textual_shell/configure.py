@@ -3,6 +3,8 @@ from typing import Annotated
 
 import yaml
 
+from .utils import write_atomic
+
 
 class MissingSection(Exception):
     """Custom Exception for when a section is not found."""
@@ -14,6 +16,20 @@ class MissingSetting(Exception):
     pass
 
 
+def write_config(
+    path: Annotated[str, 'The path to the config file.'],
+    config: Annotated[dict, 'The config to save.']
+) -> None:
+    """
+    Save the config atomically, so exiting mid write 
+    can not leave a truncated file behind.
+    
+    Args:
+        path (str): The path to the config file.
+        config (dict): The config to save.
+    """
+    write_atomic(path, yaml.dump(config).encode())
+
 def create_config(
     path: Annotated[str, 'The path to create the config file.'],
     config: Annotated[dict[str, str], 'Settings']={}
@@ -25,8 +41,7 @@ def create_config(
         path (str): The path to create the config file.
     """
     if not os.path.exists(path):
-        with open(path, 'w') as config_file:
-            yaml.dump(config, config_file)
+        write_config(path, config)
 
 def get_config(
     path: Annotated[str, 'The path to the config file.']
@@ -190,8 +205,7 @@ def add_section(
     if section_name not in config:
         config.update(section)
     
-    with open(path, 'w') as config_file:
-        yaml.dump(config, config_file)
+    write_config(path, config)
 
 def update_setting(
     section: Annotated[str, 'The section of the config.'],
@@ -214,5 +228,4 @@ def update_setting(
         
     config[section][setting]['value'] = value
     
-    with open(path, 'w') as config_file:
-        yaml.dump(config, config_file)
+    write_config(path, config)
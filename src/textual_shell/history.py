@@ -0,0 +1,182 @@
+from array import array
+from statistics import fmean, median
+from typing import Annotated, Iterator, NamedTuple
+
+from .job import Job
+
+
+class HistoryRecord(NamedTuple):
+    """A finished job as stored in the JobHistory."""
+    id: str
+    cmd: str
+    status: Job.Status
+    queued: float
+    started: float | None
+    ended: float
+    error: str | None
+    cpu: float | None
+    rss: int | None
+
+    @property
+    def duration(self) -> float | None:
+        """Seconds the job ran for or None if it never started."""
+        if self.started is None:
+            return None
+
+        return self.ended - self.started
+
+    @property
+    def wait(self) -> float:
+        """Seconds the job waited for a slot."""
+        return (self.started or self.ended) - self.queued
+
+
+class JobHistory:
+    """
+    Fixed size ring buffer of finished jobs. Timestamps and statuses
+    are kept in typed arrays so memory stays the same no matter how
+    many jobs have run. The oldest record is overwritten once full.
+    A capacity of 0 keeps no records, only the total is counted.
+
+    Args:
+        capacity (int): The number of jobs to remember. 0 disables the history.
+    """
+
+    ERROR_LENGTH = 120
+    """Error summaries are truncated to this many characters."""
+
+    def __init__(
+        self,
+        capacity: Annotated[int, 'The number of jobs to remember.']=1000
+    ) -> None:
+        self.capacity = max(capacity, 0)
+        self._ids: list[str] = [None] * self.capacity
+        self._cmds: list[str] = [None] * self.capacity
+        self._errors: list[str] = [None] * self.capacity
+        self._status = array('b', [0]) * self.capacity
+        self._queued = array('d', [0.0]) * self.capacity
+        self._started = array('d', [0.0]) * self.capacity
+        self._ended = array('d', [0.0]) * self.capacity
+        self._cpu = array('d', [-1.0]) * self.capacity
+        self._rss = array('q', [-1]) * self.capacity
+        self._total = 0
+
+    @property
+    def total(self) -> int:
+        """The number of jobs recorded since the app started."""
+        return self._total
+
+    def record(
+        self,
+        job: Annotated[Job, 'The finished job.']
+    ) -> None:
+        """
+        Add a finished job, overwriting the oldest record once full.
+
+        Args:
+            job (Job): The finished job.
+        """
+        if self.capacity == 0:
+            self._total += 1
+            return
+
+        index = self._total % self.capacity
+        self._ids[index] = job.id
+        self._cmds[index] = job.cmd
+        self._status[index] = job.status.value
+        self._queued[index] = job.queued_at or job.ended_at
+        self._started[index] = job.started_at or 0.0
+        self._ended[index] = job.ended_at
+        error = job.error_summary
+        self._errors[index] = error[:self.ERROR_LENGTH] if error else None
+        self._cpu[index] = -1.0 if job.cpu_time is None else job.cpu_time
+        self._rss[index] = -1 if job.peak_rss is None else job.peak_rss
+        self._total += 1
+
+    def _get(self, index: int) -> HistoryRecord:
+        """Build the record stored at the index."""
+        return HistoryRecord(
+            id=self._ids[index],
+            cmd=self._cmds[index],
+            status=Job.Status(self._status[index]),
+            queued=self._queued[index],
+            started=self._started[index] or None,
+            ended=self._ended[index],
+            error=self._errors[index],
+            cpu=None if self._cpu[index] < 0 else self._cpu[index],
+            rss=None if self._rss[index] < 0 else self._rss[index]
+        )
+
+    def __len__(self) -> int:
+        return min(self._total, self.capacity)
+
+    def __iter__(self) -> Iterator[HistoryRecord]:
+        """Iterate from the oldest record to the newest."""
+        start = self._total - len(self)
+        for position in range(start, self._total):
+            yield self._get(position % self.capacity)
+
+    def query(
+        self,
+        status: Annotated[Job.Status, 'Only records with this status.']=None,
+        cmd: Annotated[str, 'Only records created by this command.']=None,
+        last: Annotated[int, 'Only the newest n matching records.']=None
+    ) -> list[HistoryRecord]:
+        """
+        Get the records matching the filters, oldest first.
+
+        Args:
+            status (Job.Status): Only records with this status.
+            cmd (str): Only records created by this command.
+            last (int): Only the newest n matching records.
+
+        Returns:
+            records (list[HistoryRecord]): The matching records.
+        """
+        records = [
+            record for record in self
+            if (status is None or record.status == status)
+            and (cmd is None or record.cmd == cmd)
+        ]
+        if last is not None:
+            records = records[-last:] if last > 0 else []
+
+        return records
+
+    @staticmethod
+    def summary(
+        records: Annotated[list[HistoryRecord], 'The records to summarize.']
+    ) -> dict:
+        """
+        Compute summary statistics for records.
+
+        Args:
+            records (list[HistoryRecord]): The records to summarize.
+
+        Returns:
+            summary (dict): The count, the count per status and the mean,
+                median, 95th percentile and max durations and waits in seconds.
+        """
+        statuses = {}
+        for record in records:
+            statuses[record.status.name] = statuses.get(record.status.name, 0) + 1
+
+        durations = sorted(
+            record.duration for record in records
+            if record.duration is not None
+        )
+        waits = [record.wait for record in records]
+        summary = {'count': len(records), 'statuses': statuses}
+
+        if durations:
+            summary['duration'] = {
+                'mean': fmean(durations),
+                'p50': median(durations),
+                'p95': durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+                'max': durations[-1]
+            }
+
+        if waits:
+            summary['wait'] = {'mean': fmean(waits), 'max': max(waits)}
+
+        return summary
@@ -1,23 +1,52 @@
 import asyncio
-import random
-import string
+import logging
+import os
+import signal
+import time
+import warnings
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated, Any, Callable
 
 from textual.message import Message
 from textual.screen import Screen
 
+from .limits import ProcessLimits
+from .stream import JobStream, StreamClosed
+from .tracing import Span, Tracer
+from .usage import Usage, sample_tree
+
+if TYPE_CHECKING:
+    from .retry import RetryPolicy
+    from .timer_wheel import Timer
+
+
+_NO_TRACER = Tracer(0)
+"""Disabled tracer for jobs whose app does not trace."""
+
 
 class Job(ABC):
     """
     Base Job class. Each command should have a corresponding Job it creates.
+    The shell's app must provide the job_registry of a BaseShellApp. 
+    An app without a job_history or a tracer still runs jobs, they 
+    are just not recorded.
     
     Args:
         cmd (str): The name of the command that created the job.
         shell (textual_shell.widgets.baseshell): The shell widget for posting messages.
     """
     
+    CPU_BOUND: bool = False
+    """Whether the job counts towards the scheduler's CPU bound cap."""
+    
+    PAUSABLE: bool = True
+    """Whether the job can be paused. Child processes are stopped,
+    asyncio code pauses at its next checkpoint."""
+    
+    PROGRESS_INTERVAL: float = 0.25
+    """Minimum seconds between progress updates sent to the Job Manager."""
+    
     class Status(Enum):
         """Enumeration of the Statuses."""
         PENDING = 0
@@ -25,6 +54,9 @@ class Job(ABC):
         CANCELLED = 2
         COMPLETED = 3
         ERROR = 4
+        TIMEOUT = 5
+        PAUSED = 6
+        JOINED = 7
 
 
     class StatusChange(Message):
@@ -60,6 +92,22 @@ class Job(ABC):
             self.job = job
     
 
+    class StartBatch(Message):
+        """
+        Message to notify the app that many jobs were submitted at once.
+        They are added to the Job Manager as pending in one update.
+        
+        Args:
+            jobs (list[Job]): The jobs that have been submitted.
+        """
+        def __init__(
+            self,
+            jobs: Annotated[list['Job'], 'The jobs that have been submitted.']
+        ) -> None:
+            super().__init__()
+            self.jobs = jobs
+            
+
     class Finish(Message):
         """
         Message to notify the app that the command has finished.
@@ -75,6 +123,57 @@ class Job(ABC):
             self.job_id = job_id
             
     
+    class Progress(Message):
+        """
+        Message with the latest progress of a job.
+        
+        Args:
+            job_id (str): The id of the job.
+            done (float | None): The amount of work done, None to only show the note.
+            total (float | None): The total amount of work if known.
+            note (str | None): A short note about the current step.
+            eta (float | None): Estimated seconds until the job is done.
+        """
+        def __init__(
+            self,
+            job_id: Annotated[str, 'The id of the job.'],
+            done: Annotated[float | None, 'The amount of work done.'],
+            total: Annotated[float | None, 'The total amount of work.'],
+            note: Annotated[str | None, 'A short note about the current step.'],
+            eta: Annotated[float | None, 'Estimated seconds until done.']
+        ) -> None:
+            super().__init__()
+            self.job_id = job_id
+            self.done = done
+            self.total = total
+            self.note = note
+            self.eta = eta
+            
+            
+    class Retry(Message):
+        """
+        Message that a failed job will be run again.
+        
+        Args:
+            job_id (str): The id of the job.
+            attempt (int): The attempt that is next, from 2.
+            attempts (int): The maximum number of attempts.
+            delay (float): Seconds until the attempt starts.
+        """
+        def __init__(
+            self,
+            job_id: Annotated[str, 'The id of the job.'],
+            attempt: Annotated[int, 'The attempt that is next.'],
+            attempts: Annotated[int, 'The maximum number of attempts.'],
+            delay: Annotated[float, 'Seconds until the attempt starts.']
+        ) -> None:
+            super().__init__()
+            self.job_id = job_id
+            self.attempt = attempt
+            self.attempts = attempts
+            self.delay = delay
+            
+    
     class Log(Message):
         """
         Logging event for jobs.
@@ -103,20 +202,74 @@ class Job(ABC):
         shell,
         screen: Screen=None
     ) -> None:
-        self.id = f'{cmd}_{self._generate_id()}'
+        self.registry = getattr(shell.app, 'job_registry', None)
+        if self.registry is None:
+            raise TypeError(
+                f'{type(shell.app).__name__} has no job_registry, '
+                'jobs must run in a BaseShellApp.'
+            )
+            
+        self.history = getattr(shell.app, 'job_history', None)
+        self.tracer = getattr(shell.app, 'tracer', None)
+        if self.tracer is None:
+            self.tracer = _NO_TRACER
+            
+        self.trace_parent = self.tracer.current_id()
+        self._trace_queued: Span = None
+        self.id = self.registry.next_id(cmd)
         self.shell = shell
         self.cmd = cmd
         self.screen = screen
+        self.parent: Job = None
+        self.args: tuple[str] = None
+        self.leader: Job = None
+        self.resumed_from: str = None
+        self._checkpointed = False
+        self.tags: set[str] = {cmd}
+        self._status = self.Status.PENDING
+        self.priority = None
+        self.timeout: float = None
+        self.limits: ProcessLimits = None
+        self.retry: 'RetryPolicy' = None
+        self.attempt = 1
+        self.exception: Exception = None
+        self.result: Any = None
+        self._retry_timer: 'Timer' = None
+        self.task: asyncio.Task = None
+        self.loop: asyncio.AbstractEventLoop = None
+        self.stdin: JobStream = None
+        self.stdout: JobStream = None
+        self.queued_at: float = None
+        self.started_at: float = None
+        self.ended_at: float = None
+        self.error_summary: str = None
+        self._kill_event = asyncio.Event()
+        self._resume_event = asyncio.Event()
+        self._resume_event.set()
+        self._waiting_for_cancel = False
+        self._deadline: asyncio.TimerHandle = None
+        self._timed_out = False
+        self._progress: tuple = None
+        self._progress_scheduled = False
+        self._progress_published = 0.0
+        self._progress_started: float = None
+        self._done_callbacks: list = []
+        self.processes: list[asyncio.subprocess.Process] = []
+        self.cpu_time: float = None
+        self.rss: int = None
+        self.peak_rss: int = None
         
-    def _generate_id(self):
-        """
-        Generate a random 6 digit string.
-        
-        Returns:
-            id (str): The id for the job.
-        """
-        return ''.join(random.choices(string.digits, k=6))
+    @property
+    def status(self) -> 'Job.Status':
+        """The current status of the job."""
+        return self._status
     
+    @status.setter
+    def status(self, status: 'Job.Status') -> None:
+        previous, self._status = self._status, status
+        if previous != status:
+            self.registry.update_status(self, previous)
+        
     def pending(self) -> None:
         """Signal the Job Manager that this job is pending."""
         self.status = self.Status.PENDING
@@ -157,9 +310,20 @@ class Job(ABC):
             )
         )
     
-    def error(self) -> None:
-        """Signal the Job Manager that this job has Errored"""
+    def error(
+        self,
+        summary: Annotated[str, 'A short description of the error.']=None
+    ) -> None:
+        """
+        Signal the Job Manager that this job has Errored
+        
+        Args:
+            summary (str): A short description of the error for the job history.
+        """
         self.status = self.Status.ERROR
+        if summary is not None:
+            self.error_summary = summary
+            
         self.shell.post_message(
             self.StatusChange(
                 self.id,
@@ -167,18 +331,241 @@ class Job(ABC):
             )
         )
         
+    def timed_out(self) -> None:
+        """Signal the Job Manager that this job exceeded its deadline."""
+        self.status = self.Status.TIMEOUT
+        self.shell.post_message(
+            self.StatusChange(
+                self.id,
+                self.Status.TIMEOUT
+            )
+        )
+        
+    def paused(self) -> None:
+        """Signal the Job Manager that this job is paused."""
+        self.status = self.Status.PAUSED
+        self.shell.post_message(
+            self.StatusChange(
+                self.id,
+                self.Status.PAUSED
+            )
+        )
+        
+    def joined(self) -> None:
+        """Signal the Job Manager that this job has joined another."""
+        self.status = self.Status.JOINED
+        self.shell.post_message(
+            self.StatusChange(
+                self.id,
+                self.Status.JOINED
+            )
+        )
+        
+    @property
+    def kill_requested(self) -> bool:
+        """True if the job has been asked to stop."""
+        return self._kill_event.is_set()
+        
+    def kill(self) -> None:
+        """
+        Request the job to stop. A job parked in wait_for_cancel
+        is woken up so it can tear down its resources and finish 
+        normally. A job still waiting to be started, or waiting
+        to be retried, is finished straight away. Any other job 
+        has its task cancelled.
+        """
+        self._kill_event.set()
+        if self.status == self.Status.PAUSED:
+            self.send_signal(signal.SIGCONT)
+            self._resume_event.set()
+            
+        if self._waiting_for_cancel:
+            return
+        
+        if self.task is None:
+            if self._retry_timer is not None:
+                self._retry_timer.cancel()
+                self._retry_timer = None
+                
+            if self.id in self.registry:
+                self.cancelled()
+                self.finish()
+        
+        elif not self.task.done():
+            self.task.cancel()
+        
     async def wait_for_cancel(
         self,
-        sleep_interval: Annotated[int, 'How long the sleep interval should be.']=10
+        sleep_interval: Annotated[int, 'Deprecated, it is ignored.']=None
+    ) -> None:
+        """
+        Wait until the job has been killed. This does not poll, 
+        it resolves as soon as kill is called. Cleanup after the 
+        wait should still go in a finally block as the task can be 
+        cancelled directly.
+        
+        Args:
+            sleep_interval (int): Deprecated, it is ignored as 
+                nothing polls anymore.
+        """
+        if sleep_interval is not None:
+            warnings.warn(
+                'sleep_interval is ignored, wait_for_cancel no longer polls.',
+                DeprecationWarning,
+                stacklevel=2
+            )
+            
+        self._waiting_for_cancel = True
+        try:
+            await self._kill_event.wait()
+            
+        finally:
+            self._waiting_for_cancel = False
+    
+    def pause(self) -> bool:
+        """
+        Pause a running job. The process groups of its child 
+        processes are sent SIGSTOP and its asyncio code stops at 
+        the next checkpoint.
+        
+        Returns:
+            paused (bool): False if the job can not be paused.
+        """
+        if not self.PAUSABLE or self.status != self.Status.RUNNING:
+            return False
+        
+        self._resume_event.clear()
+        self.send_signal(signal.SIGSTOP)
+        self.paused()
+        return True
+        
+    def resume(self) -> bool:
+        """
+        Resume a paused job.
+        
+        Returns:
+            resumed (bool): False if the job was not paused.
+        """
+        if self.status != self.Status.PAUSED:
+            return False
+        
+        self.send_signal(signal.SIGCONT)
+        self._resume_event.set()
+        self.running()
+        return True
+        
+    async def checkpoint(self) -> None:
+        """
+        Wait here while the job is paused. Long running
+        execute methods should call it regularly.
+        """
+        if not self._resume_event.is_set():
+            await self._resume_event.wait()
+            
+    def save_checkpoint(
+        self,
+        state: Annotated[Any, 'Small picklable state, such as an offset.']
+    ) -> bool:
+        """
+        Save the job's progress so that `jobs resume <id>` can 
+        recreate it after it was killed or the app exited. Only 
+        the last checkpoint is kept and it is dropped once the 
+        job completes. Jobs that were not created from a command 
+        line and the stages of a pipeline can not be recreated, 
+        nothing is saved for them. The state is pickled straight 
+        away and written to disk in the background.
+        
+        Args:
+            state (Any): Small picklable state, such as an offset.
+            
+        Returns:
+            saved (bool): False if the job can not be resumed.
+            
+        Raises:
+            pickle.PicklingError: If the state can not be pickled.
+        """
+        if self.args is None or self.stdin is not None or self.stdout is not None:
+            return False
+        
+        self.shell.app.checkpoints.save(self, state)
+        self._checkpointed = True
+        return True
+    
+    def load_checkpoint(self) -> Any:
+        """
+        Get the state of the last checkpoint. A job resumed with
+        `jobs resume <id>` gets the state saved by the job it 
+        replaces, a retried job the state saved by its last attempt.
+        
+        Returns:
+            state (Any): The saved state or None if there is none.
+        """
+        checkpoint = self.shell.app.checkpoints.load(self.id)
+        if checkpoint is None:
+            return None
+        
+        self._checkpointed = True
+        return checkpoint.state
+            
+    def send_signal(
+        self,
+        sig: Annotated[int, 'The signal to send.']
+    ) -> None:
+        """
+        Send a signal to the tracked child processes that are still
+        alive. A process that leads its own process group has the
+        whole group signalled so its descendants are included.
+        
+        Args:
+            sig (int): The signal to send.
+        """
+        for process in self.processes:
+            if process.returncode is not None:
+                continue
+            
+            try:
+                if os.getpgid(process.pid) == process.pid:
+                    os.killpg(process.pid, sig)
+                    
+                else:
+                    os.kill(process.pid, sig)
+                    
+            except ProcessLookupError:
+                pass
+                
+    @property
+    def preexec_fn(self) -> Callable[[], None] | None:
+        """The function that applies the job's limits in a child
+        process before exec, None if there are no limits."""
+        return self.limits.apply if self.limits else None
+    
+    def renice(
+        self,
+        nice: Annotated[int, 'The new niceness.']
     ) -> None:
         """
-        Wait for the jobs task to be cancelled.
+        Set the niceness of the tracked child processes that are still
+        alive, including every process in the groups they lead.
         
         Args:
-            sleep_interval (int): How long to sleep for in between checks. 
+            nice (int): The new niceness, from -20 to 19.
+            
+        Raises:
+            PermissionError: If the niceness is lowered without privileges.
         """
-        while not self.task.cancelled():
-            await asyncio.sleep(sleep_interval)
+        for process in self.processes:
+            if process.returncode is not None:
+                continue
+            
+            try:
+                if os.getpgid(process.pid) == process.pid:
+                    os.setpriority(os.PRIO_PGRP, process.pid, nice)
+                    
+                else:
+                    os.setpriority(os.PRIO_PROCESS, process.pid, nice)
+                    
+            except ProcessLookupError:
+                pass
     
     def send_log(
         self,
@@ -194,20 +581,367 @@ class Job(ABC):
         """
         self.shell.post_message(self.Log(self.cmd, msg, severity))
     
-    async def start(self):
-        """Create a asyncio task for the job and 
-        schedule it for execution."""
-        self.shell.post_message(self.Start(self))
-        self.pending()
+    def progress(
+        self,
+        done: Annotated[float, 'The amount of work done.'],
+        total: Annotated[float, 'The total amount of work if known.']=None,
+        note: Annotated[str, 'A short note about the current step.']=None
+    ) -> None:
+        """
+        Report the progress of the job. This only records the value,
+        the latest one is sent to the Job Manager at most once per 
+        PROGRESS_INTERVAL so it is cheap to call in a tight loop.
+        It is safe to call from other threads.
+        
+        Args:
+            done (float): The amount of work done.
+            total (float): The total amount of work if known.
+            note (str): A short note about the current step.
+        """
+        self._progress = (done, total, note)
+        if self._progress_scheduled or self.loop is None:
+            return
+        
+        self._progress_scheduled = True
+        delay = max(
+            0.0, 
+            self._progress_published + self.PROGRESS_INTERVAL - time.monotonic()
+        )
+        self.loop.call_soon_threadsafe(
+            self.loop.call_later,
+            delay,
+            self._publish_progress
+        )
+        
+    def _publish_progress(self) -> None:
+        """Send the latest progress to the Job Manager."""
+        self._progress_scheduled = False
+        self._progress_published = now = time.monotonic()
+        done, total, note = self._progress
+        if self._progress_started is None:
+            self._progress_started = (now, done)
+        
+        eta = None
+        started, done_at_start = self._progress_started
+        if total is not None and done > done_at_start and now > started:
+            rate = (done - done_at_start) / (now - started)
+            eta = max(0.0, (total - done) / rate)
+            
+        self.shell.post_message(
+            self.Progress(self.id, done, total, note, eta)
+        )
+    
+    def add_done_callback(
+        self,
+        callback: Annotated[Callable[['Job'], None], 'Called with the job.']
+    ) -> None:
+        """
+        Call a function with the job once it has finished,
+        whatever its final status.
+        
+        Args:
+            callback (Callable[[Job], None]): Called with the finished job.
+        """
+        self._done_callbacks.append(callback)
+    
+    def add_process(
+        self,
+        process: Annotated[asyncio.subprocess.Process, 'A child process.']
+    ) -> None:
+        """
+        Track a child process owned by the job so it can 
+        be reaped if the job fails to clean it up.
+        
+        Args:
+            process (asyncio.subprocess.Process): The child process.
+        """
+        self.processes.append(process)
+        
+    def sample_usage(self) -> Usage | None:
+        """
+        Read the CPU time and memory of the tracked child processes 
+        and their descendants from /proc. The CPU time only grows 
+        and the peak RSS is kept for the job's finish record.
+        
+        Returns:
+            usage (Usage | None): The totals or None if nothing is running.
+        """
+        pids = [
+            process.pid for process in self.processes 
+            if process.returncode is None
+        ]
+        if not pids:
+            return None
+        
+        usage = sample_tree(pids)
+        if usage is not None:
+            self.cpu_time = max(self.cpu_time or 0.0, usage.cpu)
+            self.rss = usage.rss
+            self.peak_rss = max(self.peak_rss or 0, usage.rss)
+            
+        return usage
+        
+    async def reap_processes(self) -> None:
+        """Kill the tracked child processes that are still alive,
+        with their process groups, and wait for all of them in parallel."""
+        self.sample_usage()
+        self.send_signal(signal.SIGKILL)
+        await asyncio.gather(
+            *(process.wait() for process in self.processes),
+            return_exceptions=True
+        )
+    
+    async def emit(
+        self,
+        item: Annotated[Any, 'The item to output.']
+    ) -> None:
+        """
+        Output an item. In a pipeline it is written to the next job's 
+        input, waiting while that stream is full. Otherwise it is 
+        sent to the console log.
+        
+        Args:
+            item (Any): The item to output.
+            
+        Raises:
+            StreamClosed: If the next job in the pipeline has finished.
+        """
+        if self.stdout is None:
+            self.send_log(str(item), logging.INFO)
+            
+        else:
+            await self.stdout.put(item)
+    
+    def submit(
+        self,
+        notify: Annotated[bool, 'Send the Start message for this job.']=True
+    ) -> None:
+        """
+        Register the job and add it to the Job Manager as pending.
+        
+        Args:
+            notify (bool): Send the Start message, False when the
+                job is announced with a StartBatch instead.
+        """
+        self.registry.register(self)
+        self.queued_at = time.time()
+        self._trace_queued = self.tracer.start(
+            'Job.queued', self.trace_parent, self.id, cmd=self.cmd
+        )
+        if notify:
+            self.shell.post_message(self.Start(self))
+            self.pending()
+        
+    def _expire(self) -> None:
+        """Kill the job once its deadline has passed."""
+        self._timed_out = True
+        self.send_log(
+            f'{self.id} - Timed out after {self.timeout:g} seconds.',
+            logging.WARNING
+        )
+        self.kill()
+    
+    async def _run(self) -> None:
+        """Execute the job. A job whose output is no longer 
+        read by the rest of its pipeline stops quietly.
+        A job that exceeds its timeout is killed. Uncaught
+        exceptions are logged and put the job in the ERROR status."""
+        with self.tracer.span('Job.execute', self.trace_parent, self.id):
+            if self.timeout is not None:
+                self._deadline = asyncio.get_running_loop().call_later(
+                    self.timeout,
+                    self._expire
+                )
+        
+            try:
+                await self.execute()
+            
+            except StreamClosed:
+                self.completed()
+            
+            except asyncio.CancelledError:
+                if not self._timed_out:
+                    raise
+            
+            except Exception as e:
+                self.exception = e
+                self.send_log(f'{self.id} - {e!r}', logging.ERROR)
+                self.error(repr(e))
+            
+            if self._timed_out:
+                self.timed_out()
+    
+    def launch(self) -> None:
+        """Create the asyncio task for a submitted job."""
+        self.started_at = time.time()
+        self.loop = asyncio.get_running_loop()
+        self.tracer.end(self._trace_queued)
         self.task = asyncio.create_task(
-            self.execute(),
+            self._run(),
             name=self.id
         )
         self.task.add_done_callback(self.finish)
+    
+    async def start(self):
+        """Create a asyncio task for the job and 
+        schedule it for execution. This bypasses the scheduler."""
+        if self.id not in self.registry:
+            self.submit()
+            
+        self.launch()
+        
+    def join(
+        self,
+        leader: Annotated['Job', 'The identical job that is already running.']
+    ) -> None:
+        """
+        Attach to an identical job instead of executing. The job holds
+        no slot and finishes with the status and result of the leader.
+        
+        Args:
+            leader (Job): The identical job that is already running.
+        """
+        self.leader = leader
+        leader.add_done_callback(self._leader_finished)
+        self.joined()
+        self.shell.post_message(
+            self.Progress(self.id, None, None, f'joined {leader.id}', None)
+        )
+        
+    def _leader_finished(self, leader: 'Job') -> None:
+        """Take the outcome of the leader and finish,
+        unless this job was killed in the meantime."""
+        if self.id not in self.registry:
+            return
+        
+        self.status = leader.status
+        self.error_summary = leader.error_summary
+        self.exception = leader.exception
+        self.result = leader.result
+
+        self.finish()
+        
+    def on_result(self, result: Any) -> None:
+        """
+        Handle the result of the job, including one served from 
+        the cache. Subclasses that produce a result override it.
+        
+        Args:
+            result (Any): The result.
+        """
+        pass
+        
+    def complete_from_cache(
+        self,
+        result: Annotated[Any, 'The cached result.'],
+        age: Annotated[float, 'Seconds since the result was produced.']
+    ) -> None:
+        """
+        Complete a submitted job with a cached result instead of executing.
+        
+        Args:
+            result (Any): The cached result.
+            age (float): Seconds since the result was produced.
+        """
+        self.result = result
+        self.send_log(f'{self.id} - Cached result from {age:.0f}s ago.', logging.INFO)
+        self.on_result(result)
+        self.completed()
+        self.finish()
+        
+    def _should_retry(self, task: asyncio.Task | None) -> bool:
+        """Check the retry policy once an attempt has ended. Killed 
+        jobs and the stages of a pipeline are not retried."""
+        if self.retry is None or task is None or task.cancelled():
+            return False
+        
+        if self.kill_requested and not self._timed_out:
+            return False
         
-    def finish(self, task: asyncio.Task):
-        """Send a finish message to clean up the job."""
+        if self.stdin is not None or self.stdout is not None:
+            return False
+        
+        return self.retry.should_retry(self)
+    
+    def _schedule_retry(self) -> None:
+        """Wait for the backoff on the app's timer wheel, 
+        the scheduler slot is released in the meantime."""
+        delay = self.retry.delay(self.attempt)
+        self.attempt += 1
+        if self._deadline is not None:
+            self._deadline.cancel()
+            self._deadline = None
+            
+        self.send_log(
+            f'{self.id} - {self.status.name}, retrying in {delay:.1f}s '
+            f'(attempt {self.attempt} of {self.retry.max_attempts}).',
+            logging.WARNING
+        )
+        self.task = None
+        self.processes.clear()
+        self._trace_queued = self.tracer.start(
+            'Job.backoff', self.trace_parent, self.id, attempt=self.attempt
+        )
+        self.pending()
+        self.shell.post_message(
+            self.Retry(self.id, self.attempt, self.retry.max_attempts, delay)
+        )
+        self._retry_timer = self.shell.app.timer_wheel.schedule(delay, self._requeue)
+        
+    def _requeue(self) -> None:
+        """Reset the state of the failed attempt and 
+        queue the job for its next attempt."""
+        self._retry_timer = None
+        self._kill_event.clear()
+        self._resume_event.set()
+        self._timed_out = False
+        self.exception = None
+        self.error_summary = None
+        self._progress = None
+        self._progress_started = None
+        self.shell.app.job_scheduler.requeue(self)
+        
+    def finish(self, task: asyncio.Task=None):
+        """Unregister the job, close its streams, record it in 
+        the job history and send a finish message to clean it up.
+        A failed attempt is retried instead if the job's retry 
+        policy allows it."""
+        if self._should_retry(task):
+            self._schedule_retry()
+            return
+        
+        self.tracer.end(self._trace_queued)
+        span = self.tracer.start('Job.finish', self.trace_parent, self.id)
+        self.ended_at = time.time()
+        if task is not None and task.cancelled():
+            self.status = self.Status.CANCELLED
+            
+        elif self.status == self.Status.RUNNING:
+            self.status = self.Status.COMPLETED
+            
+        if self._deadline is not None:
+            self._deadline.cancel()
+            
+        if self.stdout is not None:
+            self.stdout.close()
+            
+        if self.stdin is not None:
+            self.stdin.detach()
+            
+        if self._checkpointed and self.status == self.Status.COMPLETED:
+            self.shell.app.checkpoints.remove(self.id)
+            
+        self.registry.unregister(self.id)
+        if self.history is not None:
+            self.history.record(self)
+            
         self.shell.post_message(self.Finish(self.id))
+        for callback in self._done_callbacks:
+            callback(self)
+            
+        if span is not None:
+            span.args['status'] = self.status.name
+            self.tracer.end(span)
         
     @abstractmethod
     async def execute(self):
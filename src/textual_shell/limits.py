@@ -0,0 +1,204 @@
+import os
+from typing import Annotated
+
+try:
+    import resource
+
+except ImportError:
+    resource = None
+
+from .utils import parse_duration, parse_size, pop_option
+
+
+NICE_OPTION = '--nice'
+"""Option for the niceness of the child processes."""
+
+CPUS_OPTION = '--cpus'
+"""Option for the CPUs the child processes may run on, such as 0-3,6."""
+
+MEMORY_OPTION = '--max-memory'
+"""Option for the address space limit, such as 2G."""
+
+CPU_TIME_OPTION = '--max-cpu'
+"""Option for the CPU time limit, such as 10m."""
+
+FILES_OPTION = '--max-files'
+"""Option for the open file limit."""
+
+
+def parse_cpus(
+    value: Annotated[str, 'The CPUs, such as 0-3,6.']
+) -> Annotated[frozenset[int], 'The CPU numbers.']:
+    """
+    Parse a CPU list in the format used by taskset.
+
+    Args:
+        value (str): The CPUs, such as 0-3,6.
+
+    Returns:
+        cpus (frozenset[int]): The CPU numbers.
+
+    Raises:
+        ValueError: If the value is not a CPU list.
+    """
+    cpus = set()
+    for part in value.split(','):
+        first, _, last = part.partition('-')
+        first = int(first)
+        last = int(last) if last else first
+        if first < 0 or last < first:
+            raise ValueError(f'Invalid CPU range: {part}')
+
+        cpus.update(range(first, last + 1))
+
+    return frozenset(cpus)
+
+
+class ProcessLimits:
+    """
+    Scheduling priority and resource limits for the child processes
+    of a job. They are applied in the child between fork and exec, so
+    the process never runs without them. Unset values are inherited
+    from the app.
+
+    Args:
+        nice (int | None): Added to the niceness of the child.
+        cpus (frozenset[int] | None): The CPUs the child may run on.
+        max_memory (int | None): Address space limit in bytes.
+        max_cpu (int | None): CPU time limit in seconds.
+        max_files (int | None): Limit on open file descriptors.
+    """
+
+    __slots__ = ('nice', 'cpus', 'max_memory', 'max_cpu', 'max_files')
+
+    def __init__(
+        self,
+        nice: Annotated[int | None, 'Added to the niceness of the child.']=None,
+        cpus: Annotated[frozenset[int] | None, 'The CPUs the child may run on.']=None,
+        max_memory: Annotated[int | None, 'Address space limit in bytes.']=None,
+        max_cpu: Annotated[int | None, 'CPU time limit in seconds.']=None,
+        max_files: Annotated[int | None, 'Limit on open file descriptors.']=None
+    ) -> None:
+        self.nice = nice
+        self.cpus = cpus
+        self.max_memory = max_memory
+        self.max_cpu = max_cpu
+        self.max_files = max_files
+
+    def __bool__(self) -> bool:
+        return any(getattr(self, name) is not None for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        values = ', '.join(
+            f'{name}={getattr(self, name)}' for name in self.__slots__
+            if getattr(self, name) is not None
+        )
+        return f'ProcessLimits({values})'
+
+    def merge(
+        self,
+        other: Annotated['ProcessLimits | None', 'The limits that take precedence.']
+    ) -> 'ProcessLimits':
+        """
+        Combine two sets of limits.
+
+        Args:
+            other (ProcessLimits | None): The limits that take precedence.
+
+        Returns:
+            limits (ProcessLimits): The values of other where they are set,
+                else these values.
+        """
+        if other is None:
+            return self
+
+        return ProcessLimits(**{
+            name: getattr(other, name) if getattr(other, name) is not None
+            else getattr(self, name)
+            for name in self.__slots__
+        })
+
+    @classmethod
+    def pop_options(
+        cls,
+        args: Annotated[list[str], 'The arguments of the command line.']
+    ) -> 'ProcessLimits | None':
+        """
+        Remove the limit options from the arguments of a command line.
+
+        Args:
+            args (list[str]): The arguments of the command line. Modified in place.
+
+        Returns:
+            limits (ProcessLimits | None): The limits or None if none were given.
+
+        Raises:
+            ValueError: If an option has an invalid value or is not
+                supported on this system.
+        """
+        nice = pop_option(args, NICE_OPTION)
+        cpus = pop_option(args, CPUS_OPTION)
+        max_memory = pop_option(args, MEMORY_OPTION)
+        max_cpu = pop_option(args, CPU_TIME_OPTION)
+        max_files = pop_option(args, FILES_OPTION)
+
+        if cpus is not None and not hasattr(os, 'sched_setaffinity'):
+            raise ValueError(f'{CPUS_OPTION} is not supported on this system.')
+
+        if cpus is not None:
+            cpus = parse_cpus(cpus)
+            unusable = cpus - os.sched_getaffinity(0)
+            if unusable:
+                raise ValueError(
+                    f'{CPUS_OPTION}: CPUs {",".join(map(str, sorted(unusable)))} '
+                    'are not available to this process.'
+                )
+
+        if resource is None and any(
+            value is not None for value in (max_memory, max_cpu, max_files)
+        ):
+            raise ValueError('Resource limits are not supported on this system.')
+
+        limits = cls(
+            nice=int(nice) if nice is not None else None,
+            cpus=cpus,
+            max_memory=parse_size(max_memory) if max_memory is not None else None,
+            max_cpu=max(1, round(parse_duration(max_cpu))) if max_cpu is not None else None,
+            max_files=int(max_files) if max_files is not None else None
+        )
+        return limits or None
+
+    def apply(self) -> None:
+        """
+        Apply the limits to the calling process. Meant to be the
+        preexec_fn of a subprocess, it runs in the child before exec.
+        Only the soft resource limits are set, capped by the hard ones.
+
+        Popen has no arguments for these limits, so they need a
+        preexec_fn even though the app runs threads, such as the
+        process pool's pump and the ThreadJob workers. A child forked
+        while another thread holds a lock could deadlock if it took
+        that lock, so this only makes system calls: it does not
+        import, log or take locks. If a call fails, the subprocess
+        is not started and the caller gets a SubprocessError.
+        """
+        if self.nice:
+            os.nice(self.nice)
+
+        if self.cpus is not None:
+            os.sched_setaffinity(0, self.cpus)
+
+        for limit, value in (
+            ('RLIMIT_AS', self.max_memory),
+            ('RLIMIT_CPU', self.max_cpu),
+            ('RLIMIT_NOFILE', self.max_files)
+        ):
+            if value is None:
+                continue
+
+            limit = getattr(resource, limit)
+            _, hard = resource.getrlimit(limit)
+            if hard != resource.RLIM_INFINITY:
+                value = min(value, hard)
+
+            resource.setrlimit(limit, (value, hard))
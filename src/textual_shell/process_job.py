@@ -0,0 +1,624 @@
+import asyncio
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from abc import abstractmethod
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import resource_tracker
+from multiprocessing.connection import Connection, wait
+from typing import Annotated, Any, NamedTuple
+
+from .job import Job
+from .scheduler import usable_cpu_count
+
+
+LOG_BATCH_SIZE = 64
+"""Number of buffered log records that triggers a flush from a worker."""
+
+LOG_FLUSH_INTERVAL = 0.25
+"""Maximum seconds a log record waits in a worker before it is flushed."""
+
+_worker_conn: Connection = None
+_worker_buffer: list[tuple[str, int]] = []
+_worker_last_flush = 0.0
+_worker_progress: tuple = None
+_worker_last_progress = 0.0
+
+
+def _flush_logs() -> None:
+    """Ship the buffered log records of the worker in one batch."""
+    global _worker_last_flush, _worker_progress
+    if _worker_progress is not None:
+        _worker_conn.send(('progress', _worker_progress))
+        _worker_progress = None
+
+    if _worker_buffer:
+        _worker_conn.send(('logs', list(_worker_buffer)))
+        _worker_buffer.clear()
+
+    _worker_last_flush = time.monotonic()
+
+
+def _worker_main(conn: Connection) -> None:
+    """Run the work sent by the pool until it sends None or goes away."""
+    global _worker_conn
+    _worker_conn = conn
+    while True:
+        try:
+            task = conn.recv()
+
+        except EOFError:
+            return
+
+        if task is None:
+            return
+
+        work, args = task
+        try:
+            message = ('result', work(WorkerLog(), *args))
+
+        except BaseException as e:
+            message = ('error', e)
+
+        _flush_logs()
+        try:
+            conn.send(message)
+
+        except Exception as e:
+            conn.send(('error', RuntimeError(f'Could not send back the {message[0]}: {e!r}')))
+
+
+class WorkerLog:
+    """
+    Log handle passed to the work function of a ProcessJob.
+    Records are buffered in the worker and sent back to the
+    app in batches.
+    """
+
+    def __call__(
+        self,
+        msg: Annotated[str, 'The log message.'],
+        severity: Annotated[int, 'The level of the severity.']=logging.INFO
+    ) -> None:
+        """
+        Buffer a log record.
+
+        Args:
+            msg (str): The log message.
+            severity (int): The severity level of the log.
+        """
+        _worker_buffer.append((msg, severity))
+        if (
+            len(_worker_buffer) >= LOG_BATCH_SIZE
+            or time.monotonic() - _worker_last_flush >= LOG_FLUSH_INTERVAL
+        ):
+            _flush_logs()
+
+    def progress(
+        self,
+        done: Annotated[float, 'The amount of work done.'],
+        total: Annotated[float, 'The total amount of work if known.']=None,
+        note: Annotated[str, 'A short note about the current step.']=None
+    ) -> None:
+        """
+        Report the progress of the work. Only the latest value is
+        sent back, at most once per Job.PROGRESS_INTERVAL.
+
+        Args:
+            done (float): The amount of work done.
+            total (float): The total amount of work if known.
+            note (str): A short note about the current step.
+        """
+        global _worker_progress, _worker_last_progress
+        _worker_progress = (done, total, note)
+        now = time.monotonic()
+        if now - _worker_last_progress >= Job.PROGRESS_INTERVAL:
+            _worker_conn.send(('progress', _worker_progress))
+            _worker_progress = None
+            _worker_last_progress = now
+
+
+class _Task(NamedTuple):
+    """A job waiting for or running on a worker."""
+    job: 'ProcessJob'
+    future: Future
+    work: Any
+    args: tuple
+
+
+class _Worker:
+    """A worker process, the pipe to it and the task it is running."""
+
+    def __init__(self, context) -> None:
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn,),
+            name='process-job-worker'
+        )
+        self.process.start()
+        child_conn.close()
+        self.task: _Task = None
+
+    def close(self) -> None:
+        """Reap the process and close the pipe."""
+        if self.process.is_alive():
+            self.process.kill()
+
+        self.process.join()
+        self.process.close()
+        self.conn.close()
+
+
+class ProcessPool:
+    """
+    The shared pool of worker processes. Each worker runs one job at
+    a time and talks to the app over its own pipe, so killing a job
+    only terminates the worker running it. The other workers carry
+    on and a new one is started when there is work for it. A 
+    background thread pumps the messages sent by the workers back 
+    to their jobs on the event loop. It also spawns the workers, 
+    so starting one never blocks the event loop.
+
+    Args:
+        max_workers (int): The number of worker processes.
+    """
+
+    def __init__(
+        self,
+        max_workers: Annotated[int, 'The number of worker processes.']
+    ) -> None:
+        self.max_workers = max_workers
+        self.context = multiprocessing.get_context('spawn')
+        self.workers: list[_Worker] = []
+        self.pending: deque[_Task] = deque()
+        self.closed = False
+        self._retired: list[_Worker] = []
+        self._starting = 0
+        self._lock = threading.Lock()
+        self._wakeup_reader, self._wakeup_writer = self.context.Pipe(duplex=False)
+        self._pump = threading.Thread(
+            target=self._pump_messages,
+            name='process-job-pump',
+            daemon=True
+        )
+        self._pump.start()
+
+    def submit(
+        self,
+        job: Annotated['ProcessJob', 'The job the work belongs to.'],
+        work: Annotated[Any, 'The work function.'],
+        args: Annotated[tuple, 'The arguments of the work function.']
+    ) -> Future:
+        """
+        Queue the work of a job for the next free worker.
+
+        Args:
+            job (ProcessJob): The job the work belongs to.
+            work (Callable): The work function, it must be picklable.
+            args (tuple): The arguments of the work function.
+
+        Returns:
+            future (Future): Resolves to the value returned by the work.
+
+        Raises:
+            RuntimeError: If the pool has been shut down.
+        """
+        future = Future()
+        with self._lock:
+            if self.closed:
+                raise RuntimeError('The process pool has been shut down.')
+
+            self.pending.append(_Task(job, future, work, args))
+            self._dispatch()
+
+        return future
+
+    def cancel(
+        self,
+        future: Annotated[Future, 'The future returned by submit.']
+    ) -> None:
+        """
+        Drop work that is still queued or kill the worker running it.
+        The worker is replaced by a new one for the next job.
+
+        Args:
+            future (Future): The future returned by submit.
+        """
+        with self._lock:
+            if future.cancel():
+                self.pending = deque(
+                    task for task in self.pending if task.future is not future
+                )
+                return
+
+            worker = next(
+                (worker for worker in self.workers
+                 if worker.task is not None and worker.task.future is future),
+                None
+            )
+            if worker is None:
+                return
+
+            worker.task = None
+            worker.process.kill()
+            self.workers.remove(worker)
+            self._retired.append(worker)
+            self._dispatch()
+
+        self._wake()
+
+    def _dispatch(self) -> None:
+        """Hand queued work to idle workers and have the pump start
+        new ones, up to max_workers, for the rest. Called with the 
+        lock held."""
+        while self.pending:
+            worker = next((worker for worker in self.workers if worker.task is None), None)
+            if worker is None:
+                missing = min(
+                    len(self.pending),
+                    self.max_workers - len(self.workers)
+                ) - self._starting
+                if missing > 0:
+                    self._starting += missing
+                    self._wake()
+
+                return
+
+            task = self.pending.popleft()
+            if not task.future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                worker.conn.send((task.work, task.args))
+
+            except Exception as e:
+                task.future.set_exception(e)
+                continue
+
+            worker.task = task
+            self._notify(task.job, 'pid', worker.process.pid)
+
+    def _wake(self) -> None:
+        """Make the pump wait on the current set of workers."""
+        try:
+            self._wakeup_writer.send_bytes(b'')
+
+        except OSError:
+            pass
+
+    @staticmethod
+    def _notify(job: 'ProcessJob', kind: str, payload: Any) -> None:
+        """Pass a worker message to its job on the event loop."""
+        try:
+            job.loop.call_soon_threadsafe(job.on_worker_message, kind, payload)
+
+        except RuntimeError:
+            pass
+
+    def _pump_messages(self) -> None:
+        """Forward worker messages to their jobs and reap 
+        the workers that exit, until the pool is shut down."""
+        while True:
+            with self._lock:
+                if self.closed and not self.workers and not self._retired:
+                    break
+
+                waiting = {self._wakeup_reader: None}
+                for worker in (*self.workers, *self._retired):
+                    waiting[worker.conn] = worker
+                    waiting[worker.process.sentinel] = worker
+
+            for ready in wait(list(waiting)):
+                worker = waiting[ready]
+                if worker is not None and worker.conn.closed:
+                    continue
+
+                if worker is None:
+                    while self._wakeup_reader.poll():
+                        self._wakeup_reader.recv_bytes()
+
+                    self._start_workers()
+
+                elif ready is worker.conn:
+                    self._receive(worker)
+
+                elif not worker.conn.poll():
+                    self._lost(worker)
+
+        self._wakeup_reader.close()
+        self._wakeup_writer.close()
+
+    def _start_workers(self) -> None:
+        """Spawn the workers asked for by _dispatch. Spawning happens 
+        on the pump thread so it never blocks the event loop."""
+        while True:
+            with self._lock:
+                if not self._starting:
+                    return
+
+            try:
+                worker = _Worker(self.context)
+
+            except Exception as e:
+                with self._lock:
+                    self._starting = 0
+                    failed = [] if self.workers else list(self.pending)
+                    if failed:
+                        self.pending.clear()
+
+                for task in failed:
+                    if task.future.set_running_or_notify_cancel():
+                        task.future.set_exception(e)
+
+                return
+
+            with self._lock:
+                self._starting -= 1
+                self.workers.append(worker)
+                if self.closed:
+                    self._stop(worker)
+
+                else:
+                    self._dispatch()
+
+    def _receive(self, worker: _Worker) -> None:
+        """Handle the next message from a worker."""
+        try:
+            kind, payload = worker.conn.recv()
+
+        except (EOFError, OSError):
+            self._lost(worker)
+            return
+
+        with self._lock:
+            task = worker.task
+            if task is None:
+                return
+
+            if kind in ('result', 'error'):
+                worker.task = None
+                if self.closed:
+                    self._stop(worker)
+                
+                self._dispatch()
+
+        if kind == 'result':
+            task.future.set_result(payload)
+
+        elif kind == 'error':
+            task.future.set_exception(payload)
+
+        else:
+            self._notify(task.job, kind, payload)
+
+    def _lost(self, worker: _Worker) -> None:
+        """Reap a worker that exited, failing the job it was running."""
+        with self._lock:
+            if worker in self.workers:
+                self.workers.remove(worker)
+
+            elif worker in self._retired:
+                self._retired.remove(worker)
+
+            else:
+                return
+
+            task, worker.task = worker.task, None
+            if not self.closed:
+                self._dispatch()
+
+        worker.close()
+        if task is not None:
+            task.future.set_exception(
+                BrokenProcessPool('The worker process running the job died.')
+            )
+
+    def _stop(self, worker: _Worker) -> None:
+        """Ask an idle worker to exit. Called with the lock held."""
+        try:
+            worker.conn.send(None)
+
+        except OSError:
+            pass
+
+    def shutdown(self, wait: bool=False) -> None:
+        """
+        Drop the queued work, kill the workers that are running
+        a job and let the idle ones exit.
+
+        Args:
+            wait (bool): Wait for the workers to exit.
+        """
+        with self._lock:
+            self.closed = True
+            for task in self.pending:
+                task.future.cancel()
+
+            self.pending.clear()
+            for worker in self.workers:
+                if worker.task is None:
+                    self._stop(worker)
+
+                else:
+                    worker.process.kill()
+
+        self._wake()
+        if wait:
+            self._pump.join()
+
+
+MAX_WORKERS: int | None = None
+"""Number of worker processes. None uses the usable CPU count."""
+
+_pool: ProcessPool = None
+
+
+def get_process_pool() -> ProcessPool:
+    """
+    Get the shared process pool, creating it on first use.
+
+    Returns:
+        pool (ProcessPool): The shared pool.
+    """
+    global _pool
+    if _pool is None:
+        start_resource_tracker()
+        _pool = ProcessPool(MAX_WORKERS or usable_cpu_count())
+
+    return _pool
+
+
+def discard_process_pool(
+    pool: Annotated[ProcessPool, 'The pool to discard.']=None,
+    wait: Annotated[bool, 'Wait for the workers to exit.']=False
+) -> None:
+    """
+    Shut down the shared pool so the next job creates a fresh one.
+
+    Args:
+        pool (ProcessPool): Only discard the shared pool if it is this one.
+        wait (bool): Wait for the workers to exit.
+    """
+    global _pool
+    if _pool is None or (pool is not None and pool is not _pool):
+        return
+
+    current, _pool = _pool, None
+    current.shutdown(wait=wait)
+
+
+atexit.register(discard_process_pool)
+
+
+def start_resource_tracker() -> None:
+    """
+    Start the resource tracker that multiprocessing needs to spawn
+    workers, if it is not running yet. The tracker is handed the file
+    descriptor of sys.stderr, which Textual replaces with one that has
+    none while the app runs. So it is first started when a ProcessJob
+    subclass is defined, usually as the app's modules are imported,
+    and only apps that have process jobs start it.
+    """
+    if os.name == 'posix':
+        resource_tracker.ensure_running()
+
+
+class ProcessJob(Job):
+    """
+    Base class for CPU bound jobs. The work function runs in the
+    shared process pool so the event loop stays responsive.
+    Subclasses implement work as a staticmethod, it receives a
+    WorkerLog followed by the values returned by get_work_args.
+
+    Killing a running ProcessJob terminates its worker, the jobs
+    running on the other workers are not affected.
+    """
+
+    CPU_BOUND = True
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        """Start the resource tracker while sys.stderr is still real."""
+        super().__init_subclass__(**kwargs)
+        start_resource_tracker()
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.worker_pid: int = None
+
+    @staticmethod
+    @abstractmethod
+    def work(log: WorkerLog, *args) -> Any:
+        """Work function executed in a worker process.
+        Subclasses must implement this as a staticmethod."""
+        pass
+
+    def get_work_args(self) -> tuple:
+        """
+        Get the arguments for the work function.
+        They must be picklable.
+
+        Returns:
+            args (tuple): The arguments.
+        """
+        return ()
+
+    def on_result(self, result: Any) -> None:
+        """
+        Handle the value returned by the work function.
+
+        Args:
+            result (Any): The returned value.
+        """
+        pass
+
+    def on_worker_message(self, kind: str, payload: Any) -> None:
+        """
+        Handle a message sent by the worker running the job.
+
+        Args:
+            kind (str): Either pid, logs or progress.
+            payload (Any): The pid, a batch of log records or the progress.
+        """
+        if kind == 'pid':
+            self.worker_pid = payload
+
+        elif kind == 'logs':
+            for msg, severity in payload:
+                self.send_log(msg, severity)
+
+        elif kind == 'progress':
+            self.progress(*payload)
+
+    def send_signal(self, sig: int) -> None:
+        """
+        Send a signal to the worker running the job, used to pause
+        and resume it. The pool's other workers are not affected.
+        
+        Args:
+            sig (int): The signal to send.
+        """
+        super().send_signal(sig)
+        if self.worker_pid is None:
+            return
+        
+        try:
+            os.kill(self.worker_pid, sig)
+            
+        except ProcessLookupError:
+            pass
+
+    async def execute(self) -> None:
+        """Run the work function in the shared process pool."""
+        self.running()
+        pool = get_process_pool()
+        future = pool.submit(self, self.work, self.get_work_args())
+        try:
+            result = await asyncio.wrap_future(future)
+
+        except asyncio.CancelledError:
+            pool.cancel(future)
+            raise
+
+        except BrokenProcessPool as e:
+            self.send_log(f'{self.id} - {e}', logging.ERROR)
+            self.error(str(e))
+            return
+
+        except Exception as e:
+            self.exception = e
+            self.send_log(f'{self.id} - {e!r}', logging.ERROR)
+            self.error(repr(e))
+            return
+
+        finally:
+            self.worker_pid = None
+
+        self.result = result
+        self.on_result(result)
+        self.completed()
@@ -0,0 +1,119 @@
+import time
+from typing import Annotated
+
+
+class TokenBucket:
+    """
+    Token bucket that refills continuously. A start takes one token,
+    a burst can take up to the capacity at once.
+
+    Args:
+        rate (float): Tokens added per second.
+        capacity (int): The most tokens the bucket holds.
+    """
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(
+        self,
+        rate: Annotated[float, 'Tokens added per second.'],
+        capacity: Annotated[int, 'The most tokens the bucket holds.']
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last update."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(
+        self,
+        count: Annotated[int, 'The number of starts.']=1
+    ) -> bool:
+        """
+        Take tokens for starts. More starts than the capacity are
+        allowed from a full bucket, the excess is paid back before
+        the bucket admits anything else.
+
+        Args:
+            count (int): The number of starts.
+
+        Returns:
+            taken (bool): False if there are not enough tokens.
+        """
+        self._refill()
+        if self.tokens < min(count, self.capacity):
+            return False
+
+        self.tokens -= count
+        return True
+
+    def wait_time(
+        self,
+        count: Annotated[int, 'The number of starts.']=1
+    ) -> float:
+        """
+        Get the seconds until take would succeed.
+
+        Args:
+            count (int): The number of starts.
+
+        Returns:
+            seconds (float): 0 if the tokens are available now.
+        """
+        self._refill()
+        missing = min(count, self.capacity) - self.tokens
+        return max(0.0, missing / self.rate)
+
+    def available(self) -> int:
+        """
+        Get the number of whole tokens available now.
+
+        Returns:
+            tokens (int): The tokens that can be taken.
+        """
+        self._refill()
+        return max(0, int(self.tokens))
+
+
+class RateLimit:
+    """
+    Declaration of how fast a command's jobs may be started,
+    such as 10 starts per second with bursts of up to 20.
+
+    Args:
+        starts (int): The number of starts allowed per interval.
+        per (float): The interval in seconds.
+        burst (int | None): The most starts at once, defaults to starts.
+    """
+
+    __slots__ = ('starts', 'per', 'burst')
+
+    def __init__(
+        self,
+        starts: Annotated[int, 'The number of starts allowed per interval.'],
+        per: Annotated[float, 'The interval in seconds.']=1.0,
+        burst: Annotated[int | None, 'The most starts at once.']=None
+    ) -> None:
+        if starts < 1 or per <= 0:
+            raise ValueError('A rate limit needs at least one start per positive interval.')
+
+        self.starts = starts
+        self.per = per
+        self.burst = burst or starts
+
+    def __repr__(self) -> str:
+        return f'RateLimit(starts={self.starts}, per={self.per}, burst={self.burst})'
+
+    def bucket(self) -> TokenBucket:
+        """
+        Create a full token bucket that enforces the limit.
+
+        Returns:
+            bucket (TokenBucket): The bucket.
+        """
+        return TokenBucket(self.starts / self.per, self.burst)
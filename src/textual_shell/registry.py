@@ -0,0 +1,230 @@
+import fnmatch
+import itertools
+from collections import defaultdict
+from typing import TYPE_CHECKING, Annotated, Iterator
+
+if TYPE_CHECKING:
+    from .job import Job
+
+
+class DuplicateJob(Exception):
+    """Custom Exception for when a job id is already registered."""
+    pass
+
+
+def _has_magic(pattern: str) -> bool:
+    """Check if a pattern has glob wildcards."""
+    return any(char in pattern for char in '*?[')
+
+
+class JobRegistry:
+    """
+    Central registry for the jobs of a shell app. It allocates
+    the job ids and maps them to the live jobs.
+
+    Ids are the command name followed by a monotonically increasing
+    counter so they are compact and never collide within a session.
+
+    The jobs are indexed by command, tag and status so that bulk
+    operations select their jobs without scanning the registry.
+    """
+
+    def __init__(self) -> None:
+        self._counter = itertools.count(1)
+        self._jobs: dict[str, 'Job'] = {}
+        self._by_cmd: dict[str, set[str]] = defaultdict(set)
+        self._by_tag: dict[str, set[str]] = defaultdict(set)
+        self._by_status: dict['Job.Status', set[str]] = defaultdict(set)
+
+    def next_id(
+        self,
+        cmd: Annotated[str, 'The name of the command creating the job.']
+    ) -> Annotated[str, 'A unique job id.']:
+        """
+        Allocate a new job id.
+
+        Args:
+            cmd (str): The name of the command creating the job.
+
+        Returns:
+            job_id (str): The unique id for the job.
+        """
+        return f'{cmd}_{next(self._counter)}'
+
+    def reserve(
+        self,
+        job_ids: Annotated[list[str], 'Ids allocated in an earlier session.']
+    ) -> None:
+        """
+        Move the counter past ids that are still referenced, such as
+        those of checkpointed jobs, so new jobs never reuse them.
+
+        Args:
+            job_ids (list[str]): Ids allocated in an earlier session.
+        """
+        numbers = [
+            int(number) for _, _, number in
+            (job_id.rpartition('_') for job_id in job_ids)
+            if number.isdigit()
+        ]
+        if numbers:
+            self._counter = itertools.count(
+                max(max(numbers) + 1, next(self._counter))
+            )
+
+    def register(
+        self,
+        job: Annotated['Job', 'The job to register.']
+    ) -> None:
+        """
+        Register a job.
+
+        Args:
+            job (Job): The job to register.
+
+        Raises:
+            DuplicateJob: If a job with the same id is already registered.
+        """
+        if job.id in self._jobs:
+            raise DuplicateJob(f'Job: {job.id} is already registered!')
+
+        self._jobs[job.id] = job
+        self._by_cmd[job.cmd].add(job.id)
+        self._by_status[job.status].add(job.id)
+        for tag in job.tags:
+            self._by_tag[tag].add(job.id)
+
+    def unregister(
+        self,
+        job_id: Annotated[str, 'The id of the job.']
+    ) -> Annotated['Job | None', 'The removed job.']:
+        """
+        Remove a job from the registry.
+
+        Args:
+            job_id (str): The id of the job.
+
+        Returns:
+            job (Job | None): The removed job or None if it was not registered.
+        """
+        job = self._jobs.pop(job_id, None)
+        if job is None:
+            return None
+
+        self._discard(self._by_cmd, job.cmd, job_id)
+        self._discard(self._by_status, job.status, job_id)
+        for tag in job.tags:
+            self._discard(self._by_tag, tag, job_id)
+
+        return job
+
+    @staticmethod
+    def _discard(index: dict, key, job_id: str) -> None:
+        """Remove a job id from an index and drop the key once it is empty."""
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(job_id)
+            if not ids:
+                del index[key]
+
+    def update_status(
+        self,
+        job: Annotated['Job', 'The job whose status changed.'],
+        previous: Annotated['Job.Status', 'The status it had before.']
+    ) -> None:
+        """
+        Move a registered job to its new status in the index.
+
+        Args:
+            job (Job): The job whose status changed.
+            previous (Job.Status): The status it had before.
+        """
+        if job.id not in self._jobs:
+            return
+
+        self._discard(self._by_status, previous, job.id)
+        self._by_status[job.status].add(job.id)
+
+    def select(
+        self,
+        pattern: Annotated[str | None, 'A job id or a glob pattern of ids.']=None,
+        tag: Annotated[str | None, 'A tag the jobs must have.']=None,
+        status: Annotated['Job.Status | None', 'The status the jobs must have.']=None
+    ) -> list['Job']:
+        """
+        Select the jobs matching every given criterion. A pattern such 
+        as bash_* is resolved through the command index, any other 
+        pattern is only matched against the jobs left by the tag 
+        and status indexes.
+
+        Args:
+            pattern (str | None): A job id or a glob pattern of ids.
+            tag (str | None): A tag the jobs must have.
+            status (Job.Status | None): The status the jobs must have.
+
+        Returns:
+            jobs (list[Job]): The matching jobs in the order they were created.
+        """
+        selected: set[str] = None
+        for ids in (
+            self._by_tag.get(tag, set()) if tag is not None else None,
+            self._by_status.get(status, set()) if status is not None else None
+        ):
+            if ids is not None:
+                selected = set(ids) if selected is None else selected & ids
+
+        if pattern is not None:
+            prefix, _, suffix = pattern.rpartition('_')
+            if not _has_magic(pattern):
+                ids = {pattern} if pattern in self._jobs else set()
+
+            elif suffix == '*' and not _has_magic(prefix):
+                ids = self._by_cmd.get(prefix, set())
+
+            else:
+                ids = set(fnmatch.filter(
+                    self._jobs if selected is None else selected, pattern
+                ))
+
+            selected = set(ids) if selected is None else selected & ids
+
+        if selected is None:
+            return []
+
+        return sorted(
+            (self._jobs[job_id] for job_id in selected),
+            key=lambda job: int(job.id.rpartition('_')[2])
+        )
+
+    def get(
+        self,
+        job_id: Annotated[str, 'The id of the job.']
+    ) -> Annotated['Job | None', 'The job.']:
+        """
+        Look up a job by its id.
+
+        Args:
+            job_id (str): The id of the job.
+
+        Returns:
+            job (Job | None): The job or None if it does not exist.
+        """
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> list['Job']:
+        """
+        Get all of the registered jobs.
+
+        Returns:
+            jobs (list[Job]): The registered jobs.
+        """
+        return list(self._jobs.values())
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._jobs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._jobs))
+
+    def __len__(self) -> int:
+        return len(self._jobs)
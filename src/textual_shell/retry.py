@@ -0,0 +1,193 @@
+import math
+import random
+from typing import Annotated
+
+from .job import Job
+from .utils import parse_duration, pop_option
+
+
+RETRIES_OPTION = '--retries'
+"""Option for the number of times a failed job is run again."""
+
+BACKOFF_OPTION = '--backoff'
+"""Option for the delay before the first retry, such as 500ms."""
+
+
+class RetryPolicy:
+    """
+    When and how often a failed job is run again. The delay before
+    each retry grows exponentially and half of it is random, so jobs
+    that failed together do not retry in lockstep. Unset values
+    take the defaults.
+
+    A job that raised is retried if the exception is one of the
+    retryable exceptions. A job that called error() or timed out is
+    retried if its status is one of the retryable statuses. An empty
+    tuple or set retries none of them, only None takes the default.
+    Killed jobs and the stages of a pipeline are never retried.
+
+    Args:
+        attempts (int | None): The maximum number of times the job is run.
+        backoff (float | None): Seconds before the first retry.
+        max_backoff (float | None): Cap on the seconds between retries.
+        multiplier (float | None): Growth of the delay per attempt.
+        exceptions (tuple[type[Exception]] | None): The retryable exceptions.
+        statuses (frozenset[Job.Status] | None): The retryable statuses.
+    """
+
+    DEFAULT_ATTEMPTS = 3
+    """Runs of a job when the policy does not set attempts."""
+
+    DEFAULT_BACKOFF = 1.0
+    """Seconds before the first retry when the policy does not set it."""
+
+    DEFAULT_MAX_BACKOFF = 60.0
+    """Cap on the seconds between retries when the policy does not set it."""
+
+    DEFAULT_MULTIPLIER = 2.0
+    """Growth of the delay when the policy does not set it."""
+
+    DEFAULT_STATUSES = frozenset({Job.Status.ERROR, Job.Status.TIMEOUT})
+    """Statuses that are retried when the policy does not set them."""
+
+    __slots__ = (
+        'attempts',
+        'backoff',
+        'max_backoff',
+        'multiplier',
+        'exceptions',
+        'statuses'
+    )
+
+    def __init__(
+        self,
+        attempts: Annotated[int | None, 'The maximum number of runs.']=None,
+        backoff: Annotated[float | None, 'Seconds before the first retry.']=None,
+        max_backoff: Annotated[float | None, 'Cap on the seconds between retries.']=None,
+        multiplier: Annotated[float | None, 'Growth of the delay per attempt.']=None,
+        exceptions: Annotated[tuple[type[Exception]] | None, 'The retryable exceptions.']=None,
+        statuses: Annotated[frozenset[Job.Status] | None, 'The retryable statuses.']=None
+    ) -> None:
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.multiplier = multiplier
+        self.exceptions = exceptions
+        self.statuses = statuses
+
+    def __repr__(self) -> str:
+        values = ', '.join(
+            f'{name}={getattr(self, name)}' for name in self.__slots__
+            if getattr(self, name) is not None
+        )
+        return f'RetryPolicy({values})'
+
+    @property
+    def max_attempts(self) -> int:
+        """The maximum number of times a job is run."""
+        return self.attempts if self.attempts is not None else self.DEFAULT_ATTEMPTS
+
+    def merge(
+        self,
+        other: Annotated['RetryPolicy | None', 'The policy that takes precedence.']
+    ) -> 'RetryPolicy':
+        """
+        Combine two policies.
+
+        Args:
+            other (RetryPolicy | None): The policy that takes precedence.
+
+        Returns:
+            policy (RetryPolicy): The values of other where they are set,
+                else these values.
+        """
+        if other is None:
+            return self
+
+        return RetryPolicy(**{
+            name: getattr(other, name) if getattr(other, name) is not None
+            else getattr(self, name)
+            for name in self.__slots__
+        })
+
+    @classmethod
+    def pop_options(
+        cls,
+        args: Annotated[list[str], 'The arguments of the command line.']
+    ) -> 'RetryPolicy | None':
+        """
+        Remove the retry options from the arguments of a command line.
+
+        Args:
+            args (list[str]): The arguments of the command line. Modified in place.
+
+        Returns:
+            policy (RetryPolicy | None): The policy or None if no options were given.
+
+        Raises:
+            ValueError: If an option is missing its value or is not a number.
+            InvalidDuration: If the backoff is not a duration.
+        """
+        retries = pop_option(args, RETRIES_OPTION)
+        backoff = pop_option(args, BACKOFF_OPTION)
+        if retries is None and backoff is None:
+            return None
+
+        return cls(
+            attempts=int(retries) + 1 if retries is not None else None,
+            backoff=parse_duration(backoff) if backoff is not None else None
+        )
+
+    def delay(
+        self,
+        attempt: Annotated[int, 'The attempt that failed, from 1.']
+    ) -> float:
+        """
+        Get the delay before the next attempt. Half of the
+        exponential backoff is fixed and half is random.
+
+        Args:
+            attempt (int): The attempt that failed, from 1.
+
+        Returns:
+            delay (float): Seconds to wait before running the job again.
+        """
+        backoff = self.backoff if self.backoff is not None else self.DEFAULT_BACKOFF
+        multiplier = self.multiplier if self.multiplier is not None else self.DEFAULT_MULTIPLIER
+        cap = self.max_backoff if self.max_backoff is not None else self.DEFAULT_MAX_BACKOFF
+        exponent = attempt - 1
+        if multiplier > 1:
+            # Past this exponent the delay is capped, stop there so a
+            # large number of attempts can not overflow the power.
+            if backoff <= 0 or cap <= backoff:
+                exponent = 0
+
+            else:
+                exponent = min(exponent, math.ceil(math.log(cap / backoff, multiplier)))
+
+        delay = min(cap, backoff * multiplier ** exponent)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def should_retry(
+        self,
+        job: Annotated[Job, 'The job whose attempt has ended.']
+    ) -> bool:
+        """
+        Check if a job should be run again.
+
+        Args:
+            job (Job): The job whose attempt has ended.
+
+        Returns:
+            retry (bool): True if the failure is retryable and
+                attempts are left.
+        """
+        if job.attempt >= self.max_attempts:
+            return False
+
+        if job.exception is not None:
+            exceptions = self.exceptions if self.exceptions is not None else (Exception,)
+            return isinstance(job.exception, exceptions)
+
+        statuses = self.statuses if self.statuses is not None else self.DEFAULT_STATUSES
+        return job.status in statuses
@@ -0,0 +1,518 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+from collections import Counter, defaultdict, deque
+from enum import IntEnum
+from typing import Annotated
+
+from .cache import MISS, CacheStore
+from .job import Job
+from .limits import ProcessLimits
+from .rate_limit import TokenBucket
+from .retry import RetryPolicy
+
+
+def usable_cpu_count() -> int:
+    """
+    Get the number of CPUs this process is allowed to run on.
+
+    Returns:
+        count (int): The number of usable CPUs.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+
+    return os.cpu_count() or 1
+
+
+CPU = 'CPU'
+"""Marker for groups waiting on the CPU bound cap."""
+
+
+class Priority(IntEnum):
+    """
+    Enumeration of the priority classes. Lower values are started first.
+    INTERACTIVE jobs bypass the queue and do not count towards any cap.
+    """
+    INTERACTIVE = 0
+    HIGH = 1
+    NORMAL = 2
+    LOW = 3
+
+
+class JobScheduler:
+    """
+    Admit jobs for execution without exceeding the concurrency caps.
+    Jobs waiting for a slot are shown as PENDING and are started in
+    priority order, first come first served within a priority class.
+
+    It also resolves each job's timeout: the one given for the 
+    invocation, else the command's TIMEOUT, else the default_timeout.
+    The limits and the retry policy given for the invocation are 
+    merged over the command's LIMITS and RETRY the same way.
+
+    A command that declares a RATE_LIMIT has its starts metered by a
+    token bucket. Groups over the limit are parked per command, so
+    they never hold up other commands, and go back to the queue in
+    their original order as the bucket refills.
+
+    A command that declares SINGLE_FLIGHT has a job with the same
+    arguments as one of its live jobs join that job instead of 
+    being queued. A command that declares a CACHE has a job with 
+    the same arguments as a fresh cached result completed from 
+    the cache straight away.
+
+    Args:
+        max_concurrent (int): Global cap on the number of running jobs.
+        max_cpu_bound (int): Cap on the number of running CPU bound jobs.
+            Defaults to the number of usable CPUs.
+        default_timeout (float): Seconds any job may run for. None for no limit.
+        cache (CacheStore): The result caches of the commands.
+    """
+
+    DEFAULT_MAX_CONCURRENT = 64
+
+    def __init__(
+        self,
+        max_concurrent: Annotated[int, 'Global cap on running jobs.']=None,
+        max_cpu_bound: Annotated[int, 'Cap on running CPU bound jobs.']=None,
+        default_timeout: Annotated[float, 'Seconds any job may run for.']=None,
+        cache: Annotated[CacheStore, 'The result caches of the commands.']=None
+    ) -> None:
+        self.max_concurrent = max_concurrent or self.DEFAULT_MAX_CONCURRENT
+        self.max_cpu_bound = max_cpu_bound or usable_cpu_count()
+        self.default_timeout = default_timeout
+        self.cache = cache if cache is not None else CacheStore()
+        self._queue: list[tuple[int, int, list[Job]]] = []
+        self._sequence = itertools.count()
+        self._parked: dict[str, deque] = defaultdict(deque)
+        self._parked_cpu: deque = deque()
+        self._running = 0
+        self._running_cpu = 0
+        self._running_per_cmd: Counter = Counter()
+        self._buckets: dict[str, TokenBucket] = {}
+        self._parked_rate: dict[str, list] = defaultdict(list)
+        self._rate_wakeups: dict[str, asyncio.TimerHandle] = {}
+        self._flights: dict[tuple, Job] = {}
+        self._uncacheable: set[str] = set()
+        self.closed = False
+
+    @property
+    def running(self) -> int:
+        """The number of jobs holding a slot."""
+        return self._running
+
+    @property
+    def pending(self) -> int:
+        """The number of jobs waiting for a slot."""
+        entries = itertools.chain(
+            self._queue,
+            self._parked_cpu,
+            *self._parked.values(),
+            *self._parked_rate.values()
+        )
+        return sum(len(entry[2]) for entry in entries)
+
+    def _get_command(self, job: Job):
+        """Look up the command that created the job."""
+        return job.shell.get_cmd_obj(job.cmd)
+
+    def _command_cap(self, job: Job) -> int | None:
+        """Get the cap declared by the job's command if there is one."""
+        command = self._get_command(job)
+        return getattr(command, 'MAX_CONCURRENT', None)
+
+    def _get_bucket(self, job: Job) -> TokenBucket | None:
+        """Get the token bucket for the rate limit of the job's command."""
+        if job.cmd in self._buckets:
+            return self._buckets[job.cmd]
+
+        limit = getattr(self._get_command(job), 'RATE_LIMIT', None)
+        bucket = limit.bucket() if limit is not None else None
+        self._buckets[job.cmd] = bucket
+        return bucket
+
+    def _get_priority(self, job: Job) -> Priority:
+        """Get the priority declared by the job's command."""
+        command = self._get_command(job)
+        return getattr(command, 'PRIORITY', Priority.NORMAL)
+
+    def _get_timeout(self, job: Job) -> float | None:
+        """Get the timeout declared by the job's command or the default.
+        Interactive jobs are not subject to the default."""
+        command = self._get_command(job)
+        timeout = getattr(command, 'TIMEOUT', None)
+        if timeout is not None or job.priority == Priority.INTERACTIVE:
+            return timeout
+
+        return self.default_timeout
+
+    def _get_limits(self, job: Job) -> ProcessLimits | None:
+        """Merge the limits given for the job over the command's."""
+        command = self._get_command(job)
+        limits = getattr(command, 'LIMITS', None)
+        if limits is None:
+            return job.limits
+
+        return limits.merge(job.limits)
+
+    def _get_retry(self, job: Job) -> RetryPolicy | None:
+        """Merge the retry policy given for the job over the command's."""
+        command = self._get_command(job)
+        policy = getattr(command, 'RETRY', None)
+        if policy is None:
+            return job.retry
+
+        return policy.merge(job.retry)
+
+    def submit(
+        self,
+        job: Annotated[Job, 'The job to schedule.'],
+        priority: Annotated[Priority, 'Override the priority of the command.']=None
+    ) -> None:
+        """
+        Queue the job for execution. The job is registered and shown
+        as PENDING straight away and started once a slot is free.
+
+        Args:
+            job (Job): The job to schedule.
+            priority (Priority): Override the priority declared by the command.
+        """
+        self.submit_group([job], priority)
+
+    def submit_group(
+        self,
+        jobs: Annotated[list[Job], 'The jobs to schedule together.'],
+        priority: Annotated[Priority, 'Override the priority of the commands.']=None
+    ) -> None:
+        """
+        Queue jobs that must run at the same time, such as the stages
+        of a pipeline. They are admitted together once there is room
+        for all of them, or when nothing else is running.
+
+        Args:
+            jobs (list[Job]): The jobs to schedule together.
+            priority (Priority): Override the priority declared by the commands.
+        """
+        if self.closed:
+            return
+
+        if priority is None:
+            priority = min(self._get_priority(job) for job in jobs)
+
+        for job in jobs:
+            self._prepare(job, priority)
+            job.submit()
+
+        if self._enqueue(jobs, priority):
+            self._dispatch()
+
+    def submit_many(
+        self,
+        jobs: Annotated[list[Job], 'The independent jobs to schedule.'],
+        priority: Annotated[Priority, 'Override the priority of the commands.']=None
+    ) -> None:
+        """
+        Queue many independent jobs at once, such as those launched 
+        by a script. They are announced with a single StartBatch 
+        message instead of a Start and a status change per job, and 
+        the queue is dispatched once for the whole batch. Each job 
+        is admitted on its own, like one passed to submit.
+
+        Args:
+            jobs (list[Job]): The independent jobs to schedule.
+            priority (Priority): Override the priority declared by the commands.
+        """
+        if self.closed or not jobs:
+            return
+
+        priorities = []
+        for job in jobs:
+            job_priority = priority if priority is not None else self._get_priority(job)
+            self._prepare(job, job_priority)
+            job.submit(notify=False)
+            priorities.append(job_priority)
+
+        jobs[0].shell.post_message(Job.StartBatch(jobs))
+        queued = False
+        for job, job_priority in zip(jobs, priorities):
+            queued |= self._enqueue([job], job_priority)
+
+        if queued:
+            self._dispatch()
+
+    def _prepare(self, job: Job, priority: Priority) -> None:
+        """Resolve the priority, timeout, limits and retry policy of a job."""
+        job.priority = priority
+        if job.timeout is None:
+            job.timeout = self._get_timeout(job)
+
+        job.limits = self._get_limits(job)
+        job.retry = self._get_retry(job)
+
+    def _enqueue(self, jobs: list[Job], priority: Priority) -> bool:
+        """
+        Add submitted jobs to the queue, unless a single job is served
+        from the cache or joins a live job. Interactive jobs are
+        launched straight away.
+
+        Returns:
+            queued (bool): True if the queue needs to be dispatched.
+        """
+        if len(jobs) == 1 and (self._serve_cached(jobs[0]) or self._join_flight(jobs[0])):
+            return False
+
+        if priority == Priority.INTERACTIVE:
+            for job in jobs:
+                job.launch()
+
+            return False
+
+        heapq.heappush(self._queue, (priority, next(self._sequence), jobs))
+        return True
+
+    def _serve_cached(self, job: Job) -> bool:
+        """
+        Complete the job from its command's cache or have its
+        result cached once it completes. Only the job.result of a
+        completed job is cached. The first job of a command that 
+        completes without one logs a warning, as nothing will ever 
+        be served from that cache.
+
+        Returns:
+            served (bool): True if the job was completed from the cache.
+        """
+        if job.args is None or job.stdin is not None or job.stdout is not None:
+            return False
+
+        cache = self.cache.get_cache(self._get_command(job))
+        if cache is None:
+            return False
+
+        entry = cache.get(job.args)
+        if entry is not MISS:
+            job.complete_from_cache(*entry)
+            return True
+
+        def store(job: Job) -> None:
+            if job.status != Job.Status.COMPLETED:
+                return
+
+            if job.result is not None:
+                cache.put(job.args, job.result)
+
+            elif job.cmd not in self._uncacheable:
+                self._uncacheable.add(job.cmd)
+                job.send_log(
+                    f'{job.id} - Nothing was cached, {job.cmd} jobs must set their result.',
+                    logging.WARNING
+                )
+
+        job.add_done_callback(store)
+        return False
+
+    def _join_flight(self, job: Job) -> bool:
+        """
+        Join the job to a live job of a single flight command with
+        the same arguments, or make it the leader for those arguments.
+
+        Returns:
+            joined (bool): True if the job joined another.
+        """
+        command = self._get_command(job)
+        if not getattr(command, 'SINGLE_FLIGHT', False) or job.args is None:
+            return False
+
+        key = (job.cmd, job.args)
+        leader = self._flights.get(key)
+        if leader is not None:
+            job.join(leader)
+            return True
+
+        self._flights[key] = job
+        job.add_done_callback(lambda job: self._land_flight(key, job))
+        return False
+
+    def _land_flight(self, key: tuple, job: Job) -> None:
+        """Forget the leader of a single flight once it has finished."""
+        if self._flights.get(key) is job:
+            del self._flights[key]
+
+    def requeue(
+        self,
+        job: Annotated[Job, 'The registered job to run again.']
+    ) -> None:
+        """
+        Queue a job that has already been submitted for another 
+        attempt. It waits for a slot like a newly submitted job.
+
+        Args:
+            job (Job): The registered job to run again.
+        """
+        if self.closed:
+            return
+
+        if job.priority == Priority.INTERACTIVE:
+            job.launch()
+            return
+
+        heapq.heappush(self._queue, (job.priority, next(self._sequence), [job]))
+        self._dispatch()
+
+    def close(self) -> None:
+        """
+        Stop admitting jobs, used when the app exits. Queued jobs are
+        forgotten and anything submitted afterwards is dropped.
+        """
+        self.closed = True
+        self._queue.clear()
+        self._parked.clear()
+        self._parked_cpu.clear()
+        self._parked_rate.clear()
+        for wakeup in self._rate_wakeups.values():
+            wakeup.cancel()
+
+        self._rate_wakeups.clear()
+
+    def _blocked_by(self, jobs: list[Job]) -> str | None:
+        """
+        Find what keeps a group from starting.
+
+        Returns:
+            blocker (str | None): The name of the command whose cap is
+                reached, CPU if the CPU bound cap is reached or None.
+        """
+        per_cmd = Counter(job.cmd for job in jobs)
+        firsts = {job.cmd: job for job in reversed(jobs)}
+        for cmd, count in per_cmd.items():
+            cap = self._command_cap(firsts[cmd])
+            running = self._running_per_cmd[cmd]
+            if cap is not None and running > 0 and running + count > cap:
+                return cmd
+
+        cpu_bound = sum(1 for job in jobs if job.CPU_BOUND)
+        if (
+            cpu_bound 
+            and self._running_cpu > 0 
+            and self._running_cpu + cpu_bound > self.max_cpu_bound
+        ):
+            return CPU
+
+        return None
+
+    def _dispatch(self) -> None:
+        """Start queued jobs until the global cap is reached."""
+        while self._queue:
+            priority, sequence, jobs = self._queue[0]
+            jobs = [job for job in jobs if not job.kill_requested]
+            if not jobs:
+                heapq.heappop(self._queue)
+                continue
+
+            if self._running > 0 and self._running + len(jobs) > self.max_concurrent:
+                return
+
+            entry = heapq.heappop(self._queue)
+            blocker = self._blocked_by(jobs)
+            if blocker == CPU:
+                self._parked_cpu.append(entry)
+
+            elif blocker is not None:
+                self._parked[blocker].append(entry)
+
+            elif limited := self._take_tokens(jobs):
+                self._park_rate_limited(limited, entry)
+
+            else:
+                for job in jobs:
+                    self._acquire(job)
+
+    def _take_tokens(self, jobs: list[Job]) -> str | None:
+        """
+        Take the tokens for starting a group from the buckets of its
+        commands. Nothing is taken unless every bucket has enough.
+
+        Returns:
+            cmd (str | None): The first command whose bucket is short or None.
+        """
+        per_cmd = Counter(job.cmd for job in jobs)
+        firsts = {job.cmd: job for job in reversed(jobs)}
+        buckets = []
+        for cmd, count in per_cmd.items():
+            bucket = self._get_bucket(firsts[cmd])
+            if bucket is not None:
+                if bucket.wait_time(count) > 0:
+                    return cmd
+
+                buckets.append((bucket, count))
+
+        for bucket, count in buckets:
+            bucket.take(count)
+
+        return None
+
+    def _park_rate_limited(self, cmd: str, entry: tuple) -> None:
+        """Park a group until the bucket of the command has refilled."""
+        heapq.heappush(self._parked_rate[cmd], entry)
+        self._arm_rate_wakeup(cmd)
+
+    def _arm_rate_wakeup(self, cmd: str) -> None:
+        """Wake up once the first parked group of the command can start."""
+        if cmd in self._rate_wakeups:
+            return
+
+        count = sum(1 for job in self._parked_rate[cmd][0][2] if job.cmd == cmd)
+        self._rate_wakeups[cmd] = asyncio.get_running_loop().call_later(
+            self._buckets[cmd].wait_time(count),
+            self._unpark_rate_limited,
+            cmd
+        )
+
+    def _unpark_rate_limited(self, cmd: str) -> None:
+        """Queue as many parked groups of the command as the 
+        bucket has tokens for, at least one, in their original order."""
+        del self._rate_wakeups[cmd]
+        parked = self._parked_rate.get(cmd)
+        if not parked:
+            return
+
+        for _ in range(max(1, self._buckets[cmd].available())):
+            heapq.heappush(self._queue, heapq.heappop(parked))
+            if not parked:
+                del self._parked_rate[cmd]
+                break
+
+        self._dispatch()
+        if self._parked_rate.get(cmd):
+            self._arm_rate_wakeup(cmd)
+
+    def _acquire(self, job: Job) -> None:
+        """Give the job a slot and launch it."""
+        self._running += 1
+        self._running_per_cmd[job.cmd] += 1
+        if job.CPU_BOUND:
+            self._running_cpu += 1
+
+        job.launch()
+        job.task.add_done_callback(lambda task: self._release(job))
+
+    def _release(self, job: Job) -> None:
+        """Free the slot held by the job and start the next ones."""
+        self._running -= 1
+        self._running_per_cmd[job.cmd] -= 1
+        if self._running_per_cmd[job.cmd] <= 0:
+            del self._running_per_cmd[job.cmd]
+
+        if parked := self._parked.get(job.cmd):
+            heapq.heappush(self._queue, parked.popleft())
+            if not parked:
+                del self._parked[job.cmd]
+
+        if job.CPU_BOUND:
+            self._running_cpu -= 1
+            if self._parked_cpu:
+                heapq.heappush(self._queue, self._parked_cpu.popleft())
+
+        self._dispatch()
@@ -0,0 +1,106 @@
+import asyncio
+from typing import Annotated, Any
+
+
+class EndOfStream(Exception):
+    """Custom Exception for reading from a stream that has been closed and drained."""
+    pass
+
+
+class StreamClosed(Exception):
+    """Custom Exception for writing to a stream whose reader has gone away."""
+    pass
+
+
+_EOF = object()
+
+
+class JobStream:
+    """
+    Bounded stream connecting the output of one job to the input of
+    the next in a pipeline. Writers wait while the stream is full so a
+    fast producer cannot run ahead of a slow consumer.
+
+    Args:
+        maxsize (int): The number of items the stream can buffer.
+    """
+
+    DEFAULT_MAXSIZE = 256
+
+    def __init__(
+        self,
+        maxsize: Annotated[int, 'The number of items the stream can buffer.']=None
+    ) -> None:
+        self._queue = asyncio.Queue(maxsize or self.DEFAULT_MAXSIZE)
+        self._closed = False
+        self._detached = False
+
+    @property
+    def closed(self) -> bool:
+        """True once the writer has closed the stream."""
+        return self._closed
+
+    async def put(
+        self,
+        item: Annotated[Any, 'The item to write.']
+    ) -> None:
+        """
+        Write an item, waiting while the stream is full.
+
+        Args:
+            item (Any): The item to write.
+
+        Raises:
+            StreamClosed: If the stream is closed or the reader has gone away.
+        """
+        if self._closed or self._detached:
+            raise StreamClosed()
+
+        await self._queue.put(item)
+        if self._detached:
+            raise StreamClosed()
+
+    async def get(self) -> Any:
+        """
+        Read the next item, waiting while the stream is empty.
+
+        Returns:
+            item (Any): The next item.
+
+        Raises:
+            EndOfStream: If the stream is closed and drained.
+        """
+        if self._closed and self._queue.empty():
+            raise EndOfStream()
+
+        item = await self._queue.get()
+        if item is _EOF:
+            raise EndOfStream()
+
+        return item
+
+    def close(self) -> None:
+        """Signal the reader that no more items will be written."""
+        if self._closed:
+            return
+
+        self._closed = True
+        if self._queue.empty():
+            self._queue.put_nowait(_EOF)
+
+    def detach(self) -> None:
+        """Signal the writer that nothing will read the stream anymore.
+        Buffered items are dropped and blocked writers are woken up."""
+        self._detached = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    def __aiter__(self) -> 'JobStream':
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            return await self.get()
+
+        except EndOfStream:
+            raise StopAsyncIteration
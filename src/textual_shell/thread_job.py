@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import threading
+from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Any
+
+from .job import Job
+from .scheduler import usable_cpu_count
+
+
+LOG_FLUSH_INTERVAL = 0.1
+"""Seconds log records from a thread are collected before they are sent."""
+
+CANCEL_GRACE = 5.0
+"""Seconds a killed ThreadJob is given to notice its cancellation token."""
+
+
+class JobCancelled(Exception):
+    """Custom Exception raised by a cancellation token that has been cancelled."""
+    pass
+
+
+class CancellationToken:
+    """Thread safe flag a ThreadJob's run method checks to stop early."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """True once cancellation has been requested."""
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Request cancellation."""
+        self._event.set()
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Raise if cancellation has been requested.
+
+        Raises:
+            JobCancelled: If the token has been cancelled.
+        """
+        if self._event.is_set():
+            raise JobCancelled()
+
+    def wait(
+        self,
+        timeout: Annotated[float, 'Seconds to wait for.']=None
+    ) -> bool:
+        """
+        Sleep until cancelled or the timeout expires.
+        Use it instead of time.sleep in run.
+
+        Args:
+            timeout (float): Seconds to wait for.
+
+        Returns:
+            cancelled (bool): True if the token was cancelled.
+        """
+        return self._event.wait(timeout)
+
+
+MAX_WORKERS: int | None = None
+"""Size of the shared thread pool. None uses the usable CPU count + 4 capped at 32."""
+
+_pool: ThreadPoolExecutor = None
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    """
+    Get the shared thread pool, creating it on first use.
+
+    Returns:
+        pool (ThreadPoolExecutor): The shared pool.
+    """
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(
+            max_workers=MAX_WORKERS or min(32, usable_cpu_count() + 4),
+            thread_name_prefix='thread-job'
+        )
+
+    return _pool
+
+
+def shutdown_thread_pool(
+    wait: Annotated[bool, 'Wait for the running jobs to return.']=False
+) -> None:
+    """
+    Shut down the shared thread pool.
+
+    Args:
+        wait (bool): Wait for the running jobs to return.
+    """
+    global _pool
+    if _pool is None:
+        return
+
+    current, _pool = _pool, None
+    current.shutdown(wait=wait, cancel_futures=True)
+
+
+class ThreadJob(Job):
+    """
+    Base class for jobs that call blocking code. The synchronous run
+    method executes in the shared thread pool so the prompt does not
+    freeze. Use self.log from run, records are sent back to the app
+    in batches. Killing the job cancels self.token, run should check
+    it regularly. Threads can not be stopped from the outside
+    so thread jobs can not be paused.
+    """
+
+    PAUSABLE = False
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.token = CancellationToken()
+        self._log_lock = threading.Lock()
+        self._log_buffer: list[tuple[str, int]] = []
+        self._flush_scheduled = False
+
+    @abstractmethod
+    def run(self) -> Any:
+        """Blocking work executed in a worker thread.
+        Subclasses must implement this."""
+        pass
+
+    def on_result(self, result: Any) -> None:
+        """
+        Handle the value returned by run.
+
+        Args:
+            result (Any): The returned value.
+        """
+        pass
+
+    def log(
+        self,
+        msg: Annotated[str, 'The log message.'],
+        severity: Annotated[int, 'The level of the severity.']=logging.INFO
+    ) -> None:
+        """
+        Send a log from the worker thread. Records are buffered
+        and flushed to the app in one batch per interval.
+
+        Args:
+            msg (str): The log message.
+            severity (int): The severity level of the log.
+        """
+        with self._log_lock:
+            self._log_buffer.append((msg, severity))
+            if self._flush_scheduled:
+                return
+
+            self._flush_scheduled = True
+
+        self.loop.call_soon_threadsafe(
+            self.loop.call_later,
+            LOG_FLUSH_INTERVAL,
+            self._flush_logs
+        )
+
+    def _flush_logs(self) -> None:
+        """Send the buffered log records on the event loop."""
+        with self._log_lock:
+            batch, self._log_buffer = self._log_buffer, []
+            self._flush_scheduled = False
+
+        for msg, severity in batch:
+            self.send_log(msg, severity)
+
+    async def execute(self) -> None:
+        """Run the blocking work in the shared thread pool."""
+        self.running()
+        future = asyncio.wrap_future(get_thread_pool().submit(self.run))
+
+        try:
+            result = await asyncio.shield(future)
+
+        except asyncio.CancelledError:
+            self.token.cancel()
+            try:
+                await asyncio.wait_for(future, CANCEL_GRACE)
+
+            except asyncio.TimeoutError:
+                self.send_log(
+                    f'{self.id} - Did not stop within {CANCEL_GRACE} seconds.',
+                    logging.WARNING
+                )
+
+            except Exception:
+                pass
+
+            self._flush_logs()
+            raise
+
+        except JobCancelled:
+            self._flush_logs()
+            self.cancelled()
+            return
+
+        except Exception as e:
+            self.exception = e
+            self._flush_logs()
+            self.send_log(f'{self.id} - {e!r}', logging.ERROR)
+            self.error(repr(e))
+            return
+
+        self._flush_logs()
+        self.result = result
+        self.on_result(result)
+        self.completed()
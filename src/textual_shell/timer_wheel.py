@@ -0,0 +1,199 @@
+import asyncio
+import math
+from typing import Annotated, Callable
+
+from textual import log
+
+
+class Timer:
+    """
+    Handle for a callback scheduled on a TimerWheel.
+
+    Args:
+        deadline (int): The tick the callback is due at.
+        callback (Callable[[], None]): The function to call.
+    """
+
+    __slots__ = ('deadline', 'callback', 'cancelled')
+
+    def __init__(
+        self,
+        deadline: Annotated[int, 'The tick the callback is due at.'],
+        callback: Annotated[Callable[[], None], 'The function to call.']
+    ) -> None:
+        self.deadline = deadline
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """Stop the callback from being called."""
+        self.cancelled = True
+
+
+class TimerWheel:
+    """
+    Hierarchical timer wheel. Level 0 has one slot per tick, every
+    level above covers a whole rotation of the level below per slot.
+    Timers are inserted and cancelled in constant time and move down
+    a level each time the level below wraps around. A single task
+    drives every timer and sleeps straight to the next occupied slot
+    or cascade point, so idle timers cost nothing between ticks.
+    A callback that raises is logged and does not stop the wheel.
+
+    Args:
+        tick (float): Seconds per tick, the resolution of the timers.
+        slots (int): Slots per level.
+        levels (int): Number of levels.
+    """
+
+    def __init__(
+        self,
+        tick: Annotated[float, 'Seconds per tick.']=0.1,
+        slots: Annotated[int, 'Slots per level.']=64,
+        levels: Annotated[int, 'Number of levels.']=4
+    ) -> None:
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self._wheels: list[list[list[Timer]]] = [
+            [[] for _ in range(slots)] for _ in range(levels)
+        ]
+        self._overflow: list[Timer] = []
+        self._count = 0
+        self._current = 0
+        self._origin: float = None
+        self._changed: asyncio.Event = None
+        self._task: asyncio.Task = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _now_tick(self, loop: asyncio.AbstractEventLoop) -> float:
+        """The current time in ticks since the wheel started."""
+        return (loop.time() - self._origin) / self.tick
+
+    def _insert(self, timer: Timer) -> None:
+        """Put a timer in the slot for its deadline."""
+        delta = max(timer.deadline - self._current, 1)
+        span = 1
+        for level in range(self.levels):
+            span *= self.slots
+            if delta < span:
+                slot = timer.deadline // (span // self.slots) % self.slots
+                self._wheels[level][slot].append(timer)
+                return
+
+        self._overflow.append(timer)
+
+    def schedule(
+        self,
+        delay: Annotated[float, 'Seconds until the callback is due.'],
+        callback: Annotated[Callable[[], None], 'The function to call.']
+    ) -> Timer:
+        """
+        Call a function after a delay. It is called from the
+        wheel's task, at most one tick late.
+
+        Args:
+            delay (float): Seconds until the callback is due.
+            callback (Callable[[], None]): The function to call.
+
+        Returns:
+            timer (Timer): A handle to cancel the timer with.
+        """
+        loop = asyncio.get_running_loop()
+        if self._task is None:
+            self._origin = loop.time()
+            self._current = 0
+            self._changed = asyncio.Event()
+            self._task = loop.create_task(self._run(), name='timer-wheel')
+
+        deadline = math.ceil(self._now_tick(loop) + delay / self.tick)
+        timer = Timer(max(deadline, self._current + 1), callback)
+        self._insert(timer)
+        self._count += 1
+        self._changed.set()
+        return timer
+
+    def _next_tick(self) -> int:
+        """Find the next tick with work: an occupied level 0 slot
+        or the next time level 0 wraps and the levels above cascade."""
+        wrap = (self._current // self.slots + 1) * self.slots
+        for tick in range(self._current + 1, wrap):
+            if self._wheels[0][tick % self.slots]:
+                return tick
+
+        return wrap
+
+    def _advance(self, tick: int) -> None:
+        """Move the wheel to a tick, cascade and fire its timers."""
+        self._current = tick
+        span = 1
+        cascades = []
+        for level in range(1, self.levels):
+            span *= self.slots
+            if tick % span:
+                break
+
+            cascades.append((level, tick // span % self.slots))
+
+        if len(cascades) == self.levels - 1:
+            overflow, self._overflow = self._overflow, []
+            for timer in overflow:
+                self._insert(timer)
+
+        for level, slot in reversed(cascades):
+            timers, self._wheels[level][slot] = self._wheels[level][slot], []
+            for timer in timers:
+                self._insert(timer)
+
+        slot = tick % self.slots
+        timers, self._wheels[0][slot] = self._wheels[0][slot], []
+        for timer in timers:
+            if timer.deadline > tick:
+                self._insert(timer)
+                continue
+
+            self._count -= 1
+            if timer.cancelled:
+                continue
+
+            try:
+                timer.callback()
+
+            except Exception as e:
+                log(f'Timer callback {timer.callback!r} raised: {e!r}')
+
+    async def _run(self) -> None:
+        """Sleep until the next tick with work and process it."""
+        loop = asyncio.get_running_loop()
+        while True:
+            if self._count == 0:
+                self._changed.clear()
+                await self._changed.wait()
+                continue
+
+            target = self._next_tick()
+            wait = (target - self._now_tick(loop)) * self.tick
+            if wait > 0:
+                self._changed.clear()
+                try:
+                    await asyncio.wait_for(self._changed.wait(), wait)
+                    continue
+
+                except asyncio.TimeoutError:
+                    pass
+
+            self._advance(target)
+
+    def stop(self) -> None:
+        """Cancel the wheel's task and drop every timer."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        self._wheels = [
+            [[] for _ in range(self.slots)] for _ in range(self.levels)
+        ]
+        self._overflow.clear()
+        self._count = 0
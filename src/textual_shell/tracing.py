@@ -0,0 +1,235 @@
+import itertools
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Annotated, Any, Iterator
+
+
+SHELL_LANE = 'shell'
+"""Lane of the spans recorded by the shell widgets."""
+
+_current_span: ContextVar['Span | None'] = ContextVar('current_span', default=None)
+
+
+class Span:
+    """
+    A timed stage of a command line or a job. Times are monotonic
+    nanoseconds. The lane groups spans into one row of the trace
+    viewer, every job has its own.
+
+    Args:
+        name (str): The name of the stage.
+        span_id (int): The id of the span.
+        parent_id (int | None): The id of the enclosing span.
+        lane (str): The row the span is drawn on.
+        args (dict): Extra values shown with the span.
+    """
+
+    __slots__ = ('name', 'span_id', 'parent_id', 'lane', 'start', 'end', 'args')
+
+    def __init__(
+        self,
+        name: Annotated[str, 'The name of the stage.'],
+        span_id: Annotated[int, 'The id of the span.'],
+        parent_id: Annotated[int | None, 'The id of the enclosing span.'],
+        lane: Annotated[str, 'The row the span is drawn on.'],
+        args: Annotated[dict, 'Extra values shown with the span.'],
+        start: Annotated[int, 'Monotonic nanoseconds the span started at.']=None
+    ) -> None:
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.lane = lane
+        self.args = args
+        self.start = time.monotonic_ns() if start is None else start
+        self.end: int = None
+
+
+class Tracer:
+    """
+    Records spans for the lifecycle of command lines and jobs in a
+    bounded buffer, the oldest are dropped once it is full. Spans
+    opened with span() become the parent of spans and jobs created
+    inside them. The buffer exports to the Chrome trace event format
+    which Perfetto and chrome://tracing open.
+
+    Args:
+        max_spans (int): The number of spans to keep, 0 disables tracing.
+    """
+
+    def __init__(
+        self,
+        max_spans: Annotated[int, 'The number of spans to keep.']=10000
+    ) -> None:
+        self.enabled = max_spans > 0
+        self._spans: deque[Span] = deque(maxlen=max_spans or None)
+        self._ids = itertools.count(1)
+
+    def current_id(self) -> int | None:
+        """
+        Get the id of the innermost span opened with span().
+
+        Returns:
+            span_id (int | None): The id or None outside of a span.
+        """
+        span = _current_span.get()
+        return span.span_id if span is not None else None
+
+    def start(
+        self,
+        name: Annotated[str, 'The name of the stage.'],
+        parent: Annotated[int, 'The id of the parent span.']=None,
+        lane: Annotated[str, 'The row the span is drawn on.']=SHELL_LANE,
+        start: Annotated[int, 'Monotonic nanoseconds it started at.']=None,
+        **args: Any
+    ) -> Span | None:
+        """
+        Open a span. It is recorded once it is ended.
+
+        Args:
+            name (str): The name of the stage.
+            parent (int): The id of the parent span, defaults to the current span.
+            lane (str): The row the span is drawn on.
+            start (int): Monotonic nanoseconds it started at, defaults to now.
+            **args (Any): Extra values shown with the span.
+
+        Returns:
+            span (Span | None): The span or None if tracing is disabled.
+        """
+        if not self.enabled:
+            return None
+
+        if parent is None:
+            parent = self.current_id()
+
+        return Span(name, next(self._ids), parent, lane, args, start)
+
+    def end(
+        self,
+        span: Annotated[Span | None, 'The span to end.']
+    ) -> None:
+        """
+        Close a span and record it.
+
+        Args:
+            span (Span | None): The span returned by start.
+        """
+        if span is None or span.end is not None:
+            return
+
+        span.end = time.monotonic_ns()
+        self._spans.append(span)
+
+    @contextmanager
+    def span(
+        self,
+        name: Annotated[str, 'The name of the stage.'],
+        parent: Annotated[int, 'The id of the parent span.']=None,
+        lane: Annotated[str, 'The row the span is drawn on.']=SHELL_LANE,
+        start: Annotated[int, 'Monotonic nanoseconds it started at.']=None,
+        **args: Any
+    ) -> Iterator[Span | None]:
+        """
+        Record a span around a block. It is the current span
+        inside the block.
+
+        Args:
+            name (str): The name of the stage.
+            parent (int): The id of the parent span, defaults to the current span.
+            lane (str): The row the span is drawn on.
+            start (int): Monotonic nanoseconds it started at, defaults to now.
+            **args (Any): Extra values shown with the span.
+
+        Yields:
+            span (Span | None): The span or None if tracing is disabled.
+        """
+        span = self.start(name, parent, lane, start, **args)
+        if span is None:
+            yield None
+            return
+
+        token = _current_span.set(span)
+        try:
+            yield span
+
+        finally:
+            _current_span.reset(token)
+            self.end(span)
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def clear(self) -> None:
+        """Drop the recorded spans."""
+        self._spans.clear()
+
+    def chrome_trace(self) -> dict:
+        """
+        Convert the recorded spans to the Chrome trace event format.
+        Parents on another lane are linked to their children by flow
+        arrows.
+
+        Returns:
+            trace (dict): The trace, ready to be dumped as JSON.
+        """
+        pid = os.getpid()
+        lanes: dict[str, int] = {}
+        spans = list(self._spans)
+        by_id = {span.span_id: span for span in spans}
+        events = []
+        for span in spans:
+            tid = lanes.setdefault(span.lane, len(lanes))
+            events.append({
+                'name': span.name,
+                'cat': 'job' if span.lane != SHELL_LANE else 'shell',
+                'ph': 'X',
+                'ts': span.start / 1000,
+                'dur': (span.end - span.start) / 1000,
+                'pid': pid,
+                'tid': tid,
+                'args': {
+                    'span_id': span.span_id,
+                    'parent_id': span.parent_id,
+                    **{key: str(value) for key, value in span.args.items()}
+                }
+            })
+
+            parent = by_id.get(span.parent_id)
+            if parent is not None and parent.lane != span.lane:
+                flow = {'name': 'parent', 'cat': 'link', 'id': span.span_id, 'pid': pid}
+                events.append({
+                    **flow,
+                    'ph': 's',
+                    'ts': parent.start / 1000,
+                    'tid': lanes.setdefault(parent.lane, len(lanes))
+                })
+                events.append({**flow, 'ph': 'f', 'bp': 'e', 'ts': span.start / 1000, 'tid': tid})
+
+        for lane, tid in lanes.items():
+            events.append({
+                'name': 'thread_name',
+                'ph': 'M',
+                'pid': pid,
+                'tid': tid,
+                'args': {'name': lane}
+            })
+
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    @staticmethod
+    def write(
+        trace: Annotated[dict, 'The trace returned by chrome_trace.'],
+        path: Annotated[str, 'The path of the JSON file.']
+    ) -> None:
+        """
+        Write a trace to a JSON file.
+
+        Args:
+            trace (dict): The trace returned by chrome_trace.
+            path (str): The path of the JSON file.
+        """
+        with open(path, 'w') as trace_file:
+            json.dump(trace, trace_file)
@@ -0,0 +1,135 @@
+import os
+from typing import Annotated, Iterable, NamedTuple
+
+
+PROC = '/proc'
+"""Mount point of the proc filesystem."""
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+"""Kernel clock ticks per second, the unit of CPU times in /proc."""
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+"""Bytes per memory page, the unit of RSS in /proc."""
+
+
+class ProcessSample(NamedTuple):
+    """CPU time and memory of one process read from /proc."""
+    pid: int
+    ppid: int
+    cpu: float
+    rss: int
+
+
+class Usage(NamedTuple):
+    """Resources used by the process tree of a job."""
+    cpu: float
+    rss: int
+
+
+def usage_supported() -> bool:
+    """
+    Check if process usage can be read on this system.
+
+    Returns:
+        supported (bool): True if /proc is available.
+    """
+    return os.path.isdir(os.path.join(PROC, 'self'))
+
+
+def read_process(
+    pid: Annotated[int, 'The id of the process.']
+) -> ProcessSample | None:
+    """
+    Read the CPU time and resident memory of a process.
+    The CPU time includes children it has already reaped.
+
+    Args:
+        pid (int): The id of the process.
+
+    Returns:
+        sample (ProcessSample | None): The sample or None if the process is gone.
+    """
+    try:
+        with open(os.path.join(PROC, str(pid), 'stat'), 'rb') as stat_file:
+            stat = stat_file.read()
+
+    except OSError:
+        return None
+
+    # The command name is in parentheses and may contain spaces.
+    fields = stat[stat.rindex(b')') + 2:].split()
+    ticks = sum(int(field) for field in fields[11:15])
+    return ProcessSample(
+        pid=pid,
+        ppid=int(fields[1]),
+        cpu=ticks / CLOCK_TICKS,
+        rss=int(fields[21]) * PAGE_SIZE
+    )
+
+
+def _children_of(pid: int) -> list[int] | None:
+    """Read the direct children of a process, None if the kernel does not expose them."""
+    path = os.path.join(PROC, str(pid), 'task', str(pid), 'children')
+    try:
+        with open(path, 'rb') as children_file:
+            return [int(child) for child in children_file.read().split()]
+
+    except FileNotFoundError:
+        return None
+
+    except OSError:
+        return []
+
+
+def _scan_children() -> dict[int, list[int]]:
+    """Map every process to its children by scanning /proc."""
+    children: dict[int, list[int]] = {}
+    for entry in os.listdir(PROC):
+        if entry.isdigit() and (sample := read_process(int(entry))):
+            children.setdefault(sample.ppid, []).append(sample.pid)
+
+    return children
+
+
+def sample_tree(
+    pids: Annotated[Iterable[int], 'The root processes of the tree.']
+) -> Usage | None:
+    """
+    Add up the CPU time and resident memory of processes and all
+    of their descendants.
+
+    Args:
+        pids (Iterable[int]): The root processes of the tree.
+
+    Returns:
+        usage (Usage | None): The totals or None if every process is gone.
+    """
+    cpu = 0.0
+    rss = 0
+    found = False
+    scanned: dict[int, list[int]] = None
+    stack = list(pids)
+    seen = set()
+    while stack:
+        pid = stack.pop()
+        if pid in seen:
+            continue
+
+        seen.add(pid)
+        sample = read_process(pid)
+        if sample is None:
+            continue
+
+        found = True
+        cpu += sample.cpu
+        rss += sample.rss
+        children = _children_of(pid)
+        if children is None:
+            if scanned is None:
+                scanned = _scan_children()
+
+            children = scanned.get(pid, [])
+
+        stack.extend(children)
+
+    return Usage(cpu, rss) if found else None
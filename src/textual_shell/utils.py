@@ -0,0 +1,163 @@
+import os
+import re
+from typing import Annotated
+
+
+class InvalidDuration(Exception):
+    """Custom Exception for durations that can not be parsed."""
+    pass
+
+
+DURATION_UNITS = {
+    'ms': 0.001,
+    's': 1,
+    'm': 60,
+    'h': 3600,
+    'd': 86400
+}
+
+_DURATION_PATTERN = re.compile(r'(\d+(?:\.\d+)?)(ms|s|m|h|d)?')
+
+
+def parse_duration(
+    value: Annotated[str, 'The duration, such as 30s, 5m, 1h30m or 250ms.']
+) -> Annotated[float, 'The duration in seconds.']:
+    """
+    Parse a human readable duration. A bare number is in seconds.
+
+    Args:
+        value (str): The duration, such as 30s, 5m, 1h30m or 250ms.
+
+    Returns:
+        seconds (float): The duration in seconds.
+
+    Raises:
+        InvalidDuration: If the value is not a duration.
+    """
+    value = value.strip().lower()
+    position = 0
+    seconds = 0.0
+    while position < len(value):
+        match = _DURATION_PATTERN.match(value, position)
+        if match is None:
+            raise InvalidDuration(f'Invalid duration: {value}')
+
+        number, unit = match.groups()
+        seconds += float(number) * DURATION_UNITS[unit or 's']
+        position = match.end()
+
+    if position == 0:
+        raise InvalidDuration(f'Invalid duration: {value}')
+
+    return seconds
+
+
+def pop_option(
+    args: Annotated[list[str], 'The arguments of the command line.'],
+    option: Annotated[str, 'The name of the option, such as --timeout.']
+) -> Annotated[str | None, 'The value of the option.']:
+    """
+    Remove an option and its value from the arguments.
+    Both `--option value` and `--option=value` are accepted.
+
+    Args:
+        args (list[str]): The arguments of the command line. Modified in place.
+        option (str): The name of the option, such as --timeout.
+
+    Returns:
+        value (str | None): The value of the option or None if it is absent.
+
+    Raises:
+        ValueError: If the option is missing its value.
+    """
+    for index, arg in enumerate(args):
+        if arg == option:
+            if index + 1 >= len(args):
+                raise ValueError(f'{option} requires a value.')
+
+            value = args[index + 1]
+            del args[index:index + 2]
+            return value
+
+        if arg.startswith(f'{option}='):
+            del args[index]
+            return arg[len(option) + 1:]
+
+    return None
+
+
+BYTE_UNITS = ('B', 'K', 'M', 'G', 'T')
+
+
+def format_bytes(
+    size: Annotated[int, 'A number of bytes.']
+) -> Annotated[str, 'The size such as 512B, 12.5M or 1.2G.']:
+    """
+    Format a number of bytes for display.
+
+    Args:
+        size (int): A number of bytes.
+
+    Returns:
+        text (str): The size such as 512B, 12.5M or 1.2G.
+    """
+    value = float(size)
+    for unit in BYTE_UNITS:
+        if value < 1024 or unit == BYTE_UNITS[-1]:
+            break
+
+        value /= 1024
+
+    if unit == 'B':
+        return f'{int(value)}B'
+
+    return f'{value:.1f}{unit}'
+
+
+_SIZE_PATTERN = re.compile(r'(\d+(?:\.\d+)?)([bkmgt]?)')
+
+
+def parse_size(
+    value: Annotated[str, 'The size, such as 512M, 2G or 4096.']
+) -> Annotated[int, 'The size in bytes.']:
+    """
+    Parse a human readable size. A bare number is in bytes.
+
+    Args:
+        value (str): The size, such as 512M, 2G or 4096.
+
+    Returns:
+        size (int): The size in bytes.
+
+    Raises:
+        ValueError: If the value is not a size.
+    """
+    match = _SIZE_PATTERN.fullmatch(value.strip().lower())
+    if match is None:
+        raise ValueError(f'Invalid size: {value}')
+
+    number, unit = match.groups()
+    exponent = BYTE_UNITS.index(unit.upper() or 'B')
+    return int(float(number) * 1024 ** exponent)
+
+
+def write_atomic(
+    path: Annotated[str, 'The path of the file.'],
+    data: Annotated[bytes, 'The new contents of the file.']
+) -> None:
+    """
+    Replace the contents of a file atomically. The data is written
+    and synced to a temporary file that then replaces the file, so
+    a crash can not leave a truncated file behind.
+
+    Args:
+        path (str): The path of the file.
+        data (bytes): The new contents of the file.
+    """
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'wb') as temp_file:
+        temp_file.write(data)
+        temp_file.flush()
+        os.fsync(temp_file.fileno())
+
+    os.replace(temp_path, path)
@@ -8,6 +8,7 @@ from textual.widgets import (
 )
 
 from ..job import Job
+from ..utils import format_bytes
 
 
 class JobManager(Widget):
@@ -24,44 +25,59 @@ class JobManager(Widget):
     
     """
     
-    job_list: dict[str, Job] = {}
-    
     def compose(self) -> ComposeResult:
         yield Label('Job Manager')
         yield DataTable()
         
     def on_mount(self) -> None:
         table = self.query_one(DataTable)
-        self.column_keys = table.add_columns('Jobs', 'Status')
+        self.column_keys = table.add_columns(
+            'Jobs', 'Status', 'Progress', 'ETA', 'CPU', 'RSS', 'Attempts'
+        )
         
     def add_job(
         self,
         job: Annotated[Job, 'The job to add.']
     ) -> None:
         """
-        Add a new job to the table and dictionary.
+        Add a new job to the table. 
+        The job itself is tracked by the app's job registry.
         
         Args:
             job (Job): The job to add.
         """
-        self.job_list[job.id] = job
         table = self.query_one(DataTable)
-        row = (job.id, job.status)
+        row = (job.id, job.status, '', '', '', '', '')
         table.add_row(*row, key=job.id)
         
+    def add_jobs(
+        self,
+        jobs: Annotated[list[Job], 'The jobs to add.']
+    ) -> None:
+        """
+        Add many new jobs at once. The screen is refreshed 
+        once after all of them have been added.
+        
+        Args:
+            jobs (list[Job]): The jobs to add.
+        """
+        with self.app.batch_update():
+            for job in jobs:
+                self.add_job(job)
+        
     def remove_job(
         self,
         job_id: Annotated[str, 'The id of the job.']
     ) -> None:
         """
-        Remove a job from the table and dictionary.
+        Remove a job from the table if it is shown.
         
         Args:
             job_id (str): The id of the job.
         """
-        job = self.job_list.pop(job_id)
         table = self.query_one(DataTable)
-        table.remove_row(job_id)
+        if job_id in table.rows:
+            table.remove_row(job_id)
         
     def update_job_status(
         self,
@@ -76,12 +92,138 @@ class JobManager(Widget):
             status (Job.Status): The jobs current status.
         """
         table = self.query_one(DataTable)
+        if job_id not in table.rows:
+            return
+        
         table.update_cell(
             row_key=job_id,
             column_key=self.column_keys[1],
             value=status
         )
         
+    @staticmethod
+    def format_progress(
+        done: Annotated[float | None, 'The amount of work done.'],
+        total: Annotated[float | None, 'The total amount of work.'],
+        note: Annotated[str | None, 'A short note about the current step.']
+    ) -> str:
+        """
+        Format the progress of a job for the table.
+        
+        Args:
+            done (float | None): The amount of work done, None to only show the note.
+            total (float | None): The total amount of work if known.
+            note (str | None): A short note about the current step.
+            
+        Returns:
+            progress (str): The percentage and counts followed by the note.
+        """
+        if done is None:
+            return note or ''
+        
+        if total:
+            text = f'{done / total:.0%} ({done:g}/{total:g})'
+            
+        else:
+            text = f'{done:g}'
+            
+        return f'{text} {note}' if note else text
+    
+    @staticmethod
+    def format_eta(
+        eta: Annotated[float | None, 'Estimated seconds until done.']
+    ) -> str:
+        """
+        Format an estimated time remaining for the table.
+        
+        Args:
+            eta (float | None): Estimated seconds until the job is done.
+            
+        Returns:
+            eta (str): The time as 45s, 3m05s or 2h10m.
+        """
+        if eta is None:
+            return ''
+        
+        seconds = int(eta)
+        if seconds < 60:
+            return f'{seconds}s'
+        
+        if seconds < 3600:
+            return f'{seconds // 60}m{seconds % 60:02d}s'
+        
+        return f'{seconds // 3600}h{seconds % 3600 // 60:02d}m'
+        
+    def update_job_progress(
+        self,
+        event: Annotated[Job.Progress, 'The latest progress of the job.']
+    ) -> None:
+        """
+        Update the progress and ETA of the job in the table.
+        
+        Args:
+            event (Job.Progress): The latest progress of the job.
+        """
+        table = self.query_one(DataTable)
+        if event.job_id not in table.rows:
+            return
+        
+        table.update_cell(
+            row_key=event.job_id,
+            column_key=self.column_keys[2],
+            value=self.format_progress(event.done, event.total, event.note)
+        )
+        table.update_cell(
+            row_key=event.job_id,
+            column_key=self.column_keys[3],
+            value=self.format_eta(event.eta)
+        )
+        
+    def update_job_usage(
+        self,
+        job: Annotated[Job, 'The job that was sampled.']
+    ) -> None:
+        """
+        Update the CPU time and resident memory of the job in the table.
+        
+        Args:
+            job (Job): The job that was sampled.
+        """
+        table = self.query_one(DataTable)
+        if job.id not in table.rows or job.cpu_time is None:
+            return
+        
+        table.update_cell(
+            row_key=job.id,
+            column_key=self.column_keys[4],
+            value=f'{job.cpu_time:.1f}s'
+        )
+        table.update_cell(
+            row_key=job.id,
+            column_key=self.column_keys[5],
+            value=format_bytes(job.rss)
+        )
+        
+    def update_job_attempts(
+        self,
+        event: Annotated[Job.Retry, 'The retry of the job.']
+    ) -> None:
+        """
+        Show which attempt of the job is next.
+        
+        Args:
+            event (Job.Retry): The retry of the job.
+        """
+        table = self.query_one(DataTable)
+        if event.job_id not in table.rows:
+            return
+        
+        table.update_cell(
+            row_key=event.job_id,
+            column_key=self.column_keys[6],
+            value=f'{event.attempt}/{event.attempts}'
+        )
+        
     def switch_job_screen(
         self,
         job_id: Annotated[str, 'The id of the job']
@@ -92,24 +234,23 @@ class JobManager(Widget):
         Args:
             job_id (str): The id of the job.
         """
-        try:
-            job = self.job_list[job_id]
-            if job.screen:
-                self.app.push_screen(job.screen)
-                
-            else:
-                self.notify(
-                    message=f'{job_id.upper()} has no screen to attach to.',
-                    title='Screen Not Found',
-                    severity='warning'
-                )
-        
-        except KeyError as e:
+        job = self.app.job_registry.get(job_id)
+        if job is None:
             self.notify(
                 message=f'Job with ID: [{job_id.upper()}] does not exist',
                 title='Job Not Found',
                 severity='error'
             )
+            
+        elif job.screen:
+            self.app.push_screen(job.screen)
+            
+        else:
+            self.notify(
+                message=f'{job_id.upper()} has no screen to attach to.',
+                title='Screen Not Found',
+                severity='warning'
+            )
         
     def kill_job(
         self,
@@ -121,12 +262,25 @@ class JobManager(Widget):
         Args:
             job_id (str): The id of the job.
         """
-        try:
-            job = self.job_list[job_id]
-            job.task.cancel()
+        if job := self.app.job_registry.get(job_id):
+            job.kill()
+            
+    def kill_jobs(
+        self,
+        job_ids: Annotated[list[str], 'The ids of the jobs.']
+    ) -> None:
+        """
+        Cancel many jobs at once. Their rows are removed in the 
+        same update instead of one by one as each job finishes, 
+        so the screen is refreshed once for all of them.
         
-        except KeyError as e:
-            pass
+        Args:
+            job_ids (list[str]): The ids of the jobs.
+        """
+        with self.app.batch_update():
+            for job_id in job_ids:
+                self.kill_job(job_id)
+                self.remove_job(job_id)
     
     def on_data_table_cell_selected(
         self,
@@ -1,3 +1,4 @@
+import re
 from collections import deque
 from typing import Annotated, List
 
@@ -14,6 +15,9 @@ from .prompt import Prompt, PromptInput
 from .suggestions import Suggestions
 
 
+_STAGE_PATTERN = re.compile(r'&&|;|&|\|')
+
+
 class BaseShell(Widget):
     """
     Base class for the shell. 
@@ -266,11 +270,12 @@ class BaseShell(Widget):
     ) -> None:
         """
         Get the suggestions for the current state of the command line.
+        Only the last stage of a pipeline or chain is considered.
         
         Args:
             cmd_line (str): The input from the prompt.
         """
-        cmd_input = cmd_line.split(' ')
+        cmd_input = _STAGE_PATTERN.split(cmd_line)[-1].lstrip(' ').split(' ')
         if len(cmd_input) == 1:
             val = cmd_input[0]
             suggestions = ([cmd for cmd in self.command_list if cmd.startswith(val)] 
@@ -324,14 +329,19 @@ class BaseShell(Widget):
         
     def on_prompt_command_entered(self, event: Prompt.CommandEntered) -> None:
         """
-        Handler for when a command has been entered.
-        Execute the command in a worker thread.
+        Handler for when a command has been entered. The trace
+        span starts when the message was posted.
         
         Args:
             event (Prompt.CommandEntered)
         """
         event.stop()
-        self.command_entered(event.cmd)
+        with self.app.tracer.span(
+            'Prompt.CommandEntered',
+            start=event.created,
+            cmdline=event.cmd
+        ):
+            self.command_entered(event.cmd)
         
     def on_suggestions_focus_change(self, event: Suggestions.FocusChange) -> None:
         """
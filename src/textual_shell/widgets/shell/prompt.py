@@ -1,3 +1,4 @@
+import time
 from typing import Annotated
 
 from textual import events
@@ -5,7 +6,7 @@ from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.message import Message
 from textual.widget import Widget
-from textual.widgets import Input, Label
+from textual.widgets import Input, Label, LoadingIndicator
 
 
 class PromptInput(Input):
@@ -94,6 +95,7 @@ class Prompt(Widget):
         def __init__(self, cmd: str):
             super().__init__()
             self.cmd = cmd
+            self.created = time.monotonic_ns()
 
     
     def __init__(
@@ -135,3 +137,21 @@ class Prompt(Widget):
         prompt_input.value = ''
         prompt_input.action_home()
         self.post_message(self.CommandEntered(event.value))
+        
+    def set_busy(
+        self,
+        busy: Annotated[bool, 'Whether jobs are being created.']
+    ) -> None:
+        """
+        Show a spinner between the prompt and the input 
+        while the jobs of a command line are being created.
+        
+        Args:
+            busy (bool): Whether jobs are being created.
+        """
+        indicators = self.query(LoadingIndicator)
+        if busy and not indicators:
+            self.mount(LoadingIndicator(), before=self.query_one(PromptInput))
+            
+        elif not busy:
+            indicators.remove()
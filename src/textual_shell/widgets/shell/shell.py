@@ -1,7 +1,14 @@
-from textual import work
+from typing import Annotated, Iterable
+
+from textual.worker import Worker, WorkerState
 
 from .base_shell import BaseShell
+from ...chain import InvalidChain, JobChain, WAIT, split_chain
 from ...job import Job
+from ...limits import ProcessLimits
+from ...retry import RetryPolicy
+from ...stream import JobStream
+from ...utils import InvalidDuration, parse_duration, pop_option
 
 
 class Shell(BaseShell):
@@ -12,7 +19,8 @@ class Shell(BaseShell):
     
     Pressing the up arrow key will cycle up through the history.
     Pressing the down arrow key will cycle down through the history,
-    Pressing ctrl+c will clear the prompt input.
+    Pressing ctrl+c will clear the prompt input, or cancel the
+    command lines whose jobs are still being created.
     
     Args:
         commands (List[Command]): List of shell commands.
@@ -46,6 +54,11 @@ class Shell(BaseShell):
                 padding-left: 1;
             }
             
+            LoadingIndicator {
+                width: 10;
+                height: 1;
+            }
+            
             PromptInput {
                 border: hidden;
                 background: transparent;
@@ -73,12 +86,119 @@ class Shell(BaseShell):
         }
     """
     
-    def command_entered(self, cmdline):
-        """"""
-        cmdline = cmdline.strip(' ')
-        if len(cmdline) == 0:
-            return
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.pending_creates: set[Worker] = set()
+        
+    def pop_job_options(
+        self,
+        cmd_name: Annotated[str, 'The name of the command.'],
+        cmd_args: Annotated[list[str], 'The arguments of the command.'],
+        end: Annotated[int | None, 'Where the arguments of a nested command start.']=None
+    ) -> dict | None:
+        """
+        Remove the options every command accepts from its arguments.
+        A --timeout option, such as --timeout 30s, sets the job's deadline.
+        The --nice, --cpus, --max-memory, --max-cpu and --max-files 
+        options set the limits of the job's child processes.
+        A --tags option, such as --tags import,nightly, tags the job.
+        The --retries and --backoff options set its retry policy.
+        The options of a nested command line, from end onwards, are
+        left for the nested command. The user is notified if an 
+        option is invalid.
+        
+        Args:
+            cmd_name (str): The name of the command.
+            cmd_args (list[str]): The arguments of the command. Modified in place.
+            end (int | None): Where the arguments of a nested command start.
+            
+        Returns:
+            options (dict | None): The parsed options or None if one is invalid.
+        """
+        head = cmd_args if end is None else cmd_args[:end]
+        try:
+            timeout = pop_option(head, '--timeout')
+            if timeout is not None:
+                timeout = parse_duration(timeout)
+                
+            options = {
+                'timeout': timeout,
+                'limits': ProcessLimits.pop_options(head),
+                'tags': pop_option(head, '--tags'),
+                'retry': RetryPolicy.pop_options(head)
+            }
+        
+        except (ValueError, InvalidDuration) as e:
+            self.notify(
+                f'[b]Command:[/b] {cmd_name} {e}',
+                severity='error',
+                title='Invalid Option'
+            )
+            return None
         
+        if end is not None:
+            cmd_args[:] = head + cmd_args[end:]
+            
+        return options
+        
+    def set_job_options(
+        self,
+        job: Annotated[Job | None, 'The job created by the command.'],
+        cmd_name: Annotated[str, 'The name of the command.'],
+        cmd_args: Annotated[list[str], 'The arguments of the command.'],
+        options: Annotated[dict, 'The options from pop_job_options.']
+    ) -> Job | None:
+        """
+        Record the arguments of a new job and apply the options to it.
+        The user is notified if the command did not create a job.
+        
+        Args:
+            job (Job | None): The job created by the command.
+            cmd_name (str): The name of the command.
+            cmd_args (list[str]): The arguments of the command.
+            options (dict): The options from pop_job_options.
+            
+        Returns:
+            job (Job | None): The job or None if it was not created.
+        """
+        if job is None:
+            self.notify(
+                f'[b]Command:[/b] {cmd_name} failed to create job',
+                severity='error',
+                title='Job Failed'
+            )
+            return None
+        
+        job.args = tuple(arg for arg in cmd_args if arg)
+        if options['timeout'] is not None:
+            job.timeout = options['timeout']
+            
+        if options['limits'] is not None:
+            job.limits = options['limits']
+            
+        if options['retry'] is not None:
+            job.retry = options['retry']
+            
+        if options['tags'] is not None:
+            job.tags.update(tag for tag in options['tags'].split(',') if tag)
+            
+        return job
+    
+    def build_job(
+        self,
+        cmdline: Annotated[str, 'A single command and its arguments.']
+    ) -> Job | None:
+        """
+        Use the command instance to create the job for a command line,
+        with the options of pop_job_options applied to it.
+        The user is notified if it fails.
+        
+        Args:
+            cmdline (str): A single command and its arguments.
+            
+        Returns:
+            job (Job | None): The created job or None if it failed.
+        """
         cmd_args = cmdline.split(' ')
         cmd_name = cmd_args.pop(0)
             
@@ -86,11 +206,11 @@ class Shell(BaseShell):
             
             if cmd.name == 'help':
                 if len(cmd_args) == 0:
-                    return
+                    return None
                 
                 if show_help := self.get_cmd_obj(cmd_args[0]):
-                    job = cmd.create_job(show_help)
-                    self.start_job(job)
+                    with self.app.tracer.span('Command.create_job', cmd=cmd.name):
+                        return cmd.create_job(show_help)
                     
                 else:
                     self.notify(
@@ -99,18 +219,19 @@ class Shell(BaseShell):
                         title='Invalid Command',
                         timeout=5
                     )
+                    return None
                     
             else:
-                job = cmd.create_job(*cmd_args)
-                if job is None:
-                    self.notify(
-                        f'[b]Command:[/b] {cmd_name} failed to create job',
-                        severity='error',
-                        title='Job Failed'
-                    )
-                    return
+                options = self.pop_job_options(
+                    cmd_name, cmd_args, cmd.nested_index(cmd_args)
+                )
+                if options is None:
+                    return None
                 
-                self.start_job(job)
+                with self.app.tracer.span('Command.create_job', cmd=cmd.name):
+                    job = cmd.create_job(*cmd_args)
+                    
+                return self.set_job_options(job, cmd_name, cmd_args, options)
         
         else:
             self.notify(
@@ -119,13 +240,352 @@ class Shell(BaseShell):
                 title='Invalid Command',
                 timeout=5
             )
+            return None
+        
+    async def abuild_job(
+        self,
+        cmdline: Annotated[str, 'A single command and its arguments.']
+    ) -> Job | None:
+        """
+        Create the job for a command line, awaiting the command's
+        acreate_job if it has one. An exception raised while creating
+        the job is shown to the user.
+        
+        Args:
+            cmdline (str): A single command and its arguments.
+            
+        Returns:
+            job (Job | None): The created job or None if it failed.
+        """
+        cmd_args = cmdline.split(' ')
+        cmd_name = cmd_args.pop(0)
+        cmd = self.get_cmd_obj(cmd_name)
+        if cmd is None or not cmd.creates_async:
+            return self.build_job(cmdline)
+        
+        options = self.pop_job_options(cmd_name, cmd_args, cmd.nested_index(cmd_args))
+        if options is None:
+            return None
+        
+        try:
+            with self.app.tracer.span('Command.acreate_job', cmd=cmd.name):
+                job = await cmd.acreate_job(*cmd_args)
+                
+        except Exception as e:
+            self.notify(
+                f'[b]Command:[/b] {cmd_name} {e!r}',
+                severity='error',
+                title='Job Failed'
+            )
+            return None
+        
+        return self.set_job_options(job, cmd_name, cmd_args, options)
+    
+    def split_stages(
+        self,
+        segment: Annotated[str, 'A command or a pipeline of commands.']
+    ) -> list[str] | None:
+        """
+        Split one step of a command line into the stages of its
+        pipeline. The user is notified if a stage is empty.
+        
+        Args:
+            segment (str): A command or a pipeline of commands.
+            
+        Returns:
+            stages (list[str] | None): The command lines of the stages 
+                or None if it is invalid.
+        """
+        stages = [stage.strip(' ') for stage in segment.split('|')]
+        if '' in stages:
+            self.notify(
+                'Every stage of a pipeline needs a command.',
+                severity='error',
+                title='Invalid Pipeline',
+                timeout=5
+            )
+            return None
+        
+        return stages
+    
+    def build_stage(
+        self,
+        segment: Annotated[str, 'A command or a pipeline of commands.']
+    ) -> list[Job] | None:
+        """
+        Create the jobs for one step of a command line. Commands 
+        separated by | are a pipeline, one job per stage.
+        The user is notified if it fails.
+        
+        Args:
+            segment (str): A command or a pipeline of commands.
+            
+        Returns:
+            jobs (list[Job] | None): The jobs in order or None if it failed.
+        """
+        stages = self.split_stages(segment)
+        if stages is None:
+            return None
+        
+        jobs = []
+        for stage in stages:
+            job = self.build_job(stage)
+            if job is None:
+                return None
+            
+            jobs.append(job)
+            
+        return jobs
+    
+    async def abuild_stage(
+        self,
+        segment: Annotated[str, 'A command or a pipeline of commands.']
+    ) -> list[Job] | None:
+        """
+        Create the jobs for one step of a command line, 
+        awaiting the commands that create their jobs asynchronously.
+        
+        Args:
+            segment (str): A command or a pipeline of commands.
+            
+        Returns:
+            jobs (list[Job] | None): The jobs in order or None if it failed.
+        """
+        stages = self.split_stages(segment)
+        if stages is None:
+            return None
+        
+        jobs = []
+        for stage in stages:
+            job = await self.abuild_job(stage)
+            if job is None:
+                return None
+            
+            jobs.append(job)
+            
+        return jobs
+    
+    def creates_async(
+        self,
+        steps: Annotated[list[tuple[str, str | None]], 'The steps of a command line.']
+    ) -> bool:
+        """
+        Check if any command of a command line creates its job asynchronously.
+        
+        Args:
+            steps (list[tuple[str, str | None]]): The steps of a command line.
+            
+        Returns:
+            creates_async (bool): True if the jobs must be created in a worker.
+        """
+        for segment, _ in steps:
+            for stage in segment.split('|'):
+                cmd = self.get_cmd_obj(stage.strip(' ').split(' ')[0])
+                if cmd is not None and cmd.creates_async:
+                    return True
+                
+        return False
+    
+    def command_entered(self, cmdline):
+        """
+        Create the jobs for the command line and schedule them.
+        Commands separated by | are run as a pipeline, each job's
+        output streams into the input of the next. Steps can be
+        chained with && (if the previous completed), ; (after the
+        previous) and & (in the background), `wait` waits for the
+        background steps. If a command creates its job asynchronously
+        the whole line is built in a worker instead.
+        
+        Args:
+            cmdline (str): The command line entered.
+        """
+        with self.app.tracer.span('Shell.command_entered'):
+            self._command_entered(cmdline)
+            
+    def _command_entered(self, cmdline: str) -> None:
+        """Build the chain for the command line and run it."""
+        cmdline = cmdline.strip(' ')
+        if len(cmdline) == 0:
+            return
+        
+        try:
+            steps = split_chain(cmdline)
+            
+        except InvalidChain as e:
+            self.notify(
+                str(e),
+                severity='error',
+                title='Invalid Chain',
+                timeout=5
+            )
             return
         
+        if self.creates_async(steps):
+            self.create_jobs_async(cmdline, steps)
+            return
+        
+        chain = JobChain(self.start_stage)
+        for segment, operator in steps:
+            if segment == WAIT:
+                chain.add([], operator)
+                continue
+            
+            jobs = self.build_stage(segment)
+            if jobs is None:
+                return
+            
+            chain.add(jobs, operator)
+            
+        chain.run()
+        self.record_history(cmdline)
+        
+    def create_jobs_async(
+        self,
+        cmdline: Annotated[str, 'The command line entered.'],
+        steps: Annotated[list[tuple[str, str | None]], 'The steps of the command line.']
+    ) -> None:
+        """
+        Build and run the chain of a command line in a worker so the 
+        prompt stays responsive. A spinner is shown next to the prompt
+        until every pending line has been built.
+        
+        Args:
+            cmdline (str): The command line entered.
+            steps (list[tuple[str, str | None]]): The steps of the command line.
+        """
+        worker = self.run_worker(
+            self._build_chain(cmdline, steps),
+            name=cmdline,
+            group='create_jobs',
+            exit_on_error=False
+        )
+        self.pending_creates.add(worker)
+        self._get_prompt().set_busy(True)
+        
+    async def _build_chain(
+        self,
+        cmdline: str,
+        steps: list[tuple[str, str | None]]
+    ) -> None:
+        """Await the jobs of every step, then run the chain. Nothing 
+        is started if a job fails to be created or ctrl+c cancels it."""
+        chain = JobChain(self.start_stage)
+        for segment, operator in steps:
+            if segment == WAIT:
+                chain.add([], operator)
+                continue
+            
+            jobs = await self.abuild_stage(segment)
+            if jobs is None:
+                return
+            
+            chain.add(jobs, operator)
+            
+        chain.run()
+        self.record_history(cmdline)
+        
+    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+        """Hide the spinner once no command line is being built."""
+        worker = event.worker
+        if worker not in self.pending_creates or not worker.is_finished:
+            return
+        
+        event.stop()
+        self.pending_creates.discard(worker)
+        if event.state == WorkerState.CANCELLED:
+            self.notify(
+                f'Cancelled: {worker.name}',
+                title='Command Cancelled',
+                timeout=5
+            )
+            
+        elif event.state == WorkerState.ERROR:
+            self.notify(
+                f'{worker.name} {worker.error!r}',
+                severity='error',
+                title='Job Failed'
+            )
+            
+        if not self.pending_creates:
+            self._get_prompt().set_busy(False)
+            
+    def action_clear_prompt(self) -> None:
+        """
+        When ctrl+c is pressed cancel the command lines whose jobs
+        are still being created, or clear the command line if there 
+        are none.
+        """
+        if self.pending_creates:
+            for worker in list(self.pending_creates):
+                worker.cancel()
+                
+            return
+        
+        super().action_clear_prompt()
+        
+    def record_history(
+        self,
+        cmdline: Annotated[str, 'The command line that was run.']
+    ) -> None:
+        """
+        Add a command line to the history.
+        
+        Args:
+            cmdline (str): The command line that was run.
+        """
         self.history_list.appendleft(cmdline)
         self.history_count += 1
         self.mutate_reactive(Shell.history_list)
         self.current_history_index = None
 
-    @work()
-    async def start_job(self, job: Job):
-        await job.start()
+    def start_stage(self, jobs: list[Job]):
+        """
+        Start the jobs of one step of a command line.
+        
+        Args:
+            jobs (list[Job]): A single job or the stages of a pipeline.
+        """
+        with self.app.tracer.span('Shell.start_job', jobs[0].trace_parent):
+            if len(jobs) == 1:
+                self.start_job(jobs[0])
+                
+            else:
+                self.start_pipeline(jobs)
+
+    def start_job(self, job: Job):
+        """
+        Hand the job to the app's scheduler. It will be shown 
+        as pending until a slot is free to start it.
+        
+        Args:
+            job (Job): The job to start.
+        """
+        self.app.job_scheduler.submit(job)
+        
+    def start_jobs(self, jobs: Iterable[Job]):
+        """
+        Hand many independent jobs to the app's scheduler at once,
+        such as those launched by a script. Each job gets a single 
+        task when it starts and the Job Manager adds all of them 
+        in one update.
+        
+        Args:
+            jobs (Iterable[Job]): The jobs to start.
+        """
+        with self.app.tracer.span('Shell.start_jobs'):
+            self.app.job_scheduler.submit_many(list(jobs))
+        
+    def start_pipeline(self, jobs: list[Job]):
+        """
+        Connect the jobs with bounded streams and hand them to
+        the app's scheduler to be started together.
+        
+        Args:
+            jobs (list[Job]): The stages of the pipeline in order.
+        """
+        for upstream, downstream in zip(jobs, jobs[1:]):
+            stream = JobStream()
+            upstream.stdout = stream
+            downstream.stdin = stream
+            
+        self.app.job_scheduler.submit_group(jobs)
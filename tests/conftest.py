@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+from textual_shell.commands import Jobs
+from textual_shell.widgets import Shell
+
+from .helpers import ShellApp
+
+
+@pytest.fixture
+def run_shell(tmp_path):
+    """
+    Run a script against a headless shell app. The script is called
+    with the app, the pilot and the shell once the app is mounted.
+    """
+    def run(script, commands=(), **attributes):
+        app_type = type('TestShellApp', (ShellApp,), attributes)
+        app = app_type([Jobs(), *commands], str(tmp_path / 'config.yaml'))
+
+        async def main():
+            async with app.run_test() as pilot:
+                await script(app, pilot, app.query_one(Shell))
+                await pilot.pause(0.1)
+
+        asyncio.run(main())
+        return app
+
+    return run
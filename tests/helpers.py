@@ -0,0 +1,67 @@
+import asyncio
+
+from textual.app import ComposeResult
+
+from textual_shell.app import BaseShellApp
+from textual_shell.command import Command, CommandNode
+from textual_shell.job import Job
+from textual_shell.widgets import ConsoleLog, JobManager, Shell
+
+
+class ShellApp(BaseShellApp):
+    """Minimal app with a shell, a job manager and a console log."""
+
+    def __init__(self, commands: list[Command], config_path: str, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.cmd_list = commands
+        self.config_path = config_path
+
+    def compose(self) -> ComposeResult:
+        yield Shell(self.cmd_list, prompt='$ ')
+        yield JobManager()
+        yield ConsoleLog(self.config_path)
+
+
+class StepJob(Job):
+    """Job that records its run, sleeps and completes."""
+
+    def __init__(self, name: str, delay: float, runs: list, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.name = name
+        self.delay = delay
+        self.runs = runs
+
+    async def execute(self):
+        self.running()
+        self.runs.append(self.name)
+        await asyncio.sleep(self.delay)
+        self.completed()
+
+
+class Step(Command):
+    """Command whose jobs are StepJobs, named after their first argument."""
+
+    DEFINITION = {'step': CommandNode(name='step', description='Run a step.')}
+
+    def __init__(self, delay: float = 0.0) -> None:
+        super().__init__()
+        self.delay = delay
+        self.runs: list[str] = []
+
+    def create_job(self, *args) -> StepJob:
+        return StepJob(
+            args[0] if args else self.name,
+            self.delay,
+            self.runs,
+            shell=self.shell,
+            cmd=self.name
+        )
+
+
+async def settle(pilot, condition, timeout: float = 5.0) -> None:
+    """Wait until the condition holds, failing after the timeout."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, 'timed out waiting for the condition'
+        await pilot.pause(0.02)
@@ -0,0 +1,42 @@
+from textual_shell.job import Job
+
+from .helpers import Step, settle
+
+
+def start_step(app, pilot, shell):
+    shell.command_entered('step a')
+    return settle(pilot, lambda: any(
+        job.cmd == 'step' and job.status == Job.Status.RUNNING
+        for job in app.job_registry.jobs()
+    ))
+
+
+def test_quit_stops_the_jobs_while_the_screens_are_up(run_shell):
+    step = Step(delay=30)
+    seen = []
+
+    async def script(app, pilot, shell):
+        await start_step(app, pilot, shell)
+        job = app.job_registry.jobs()[0]
+        job.add_done_callback(lambda job: seen.append(
+            (job.status, app._get_job_manager() is not None)
+        ))
+        await app.action_quit()
+
+    app = run_shell(script, [step])
+    assert seen == [(Job.Status.CANCELLED, True)]
+    assert app.job_scheduler.closed
+
+
+def test_unmount_stops_the_jobs_that_are_left(run_shell):
+    step = Step(delay=30)
+    jobs = []
+
+    async def script(app, pilot, shell):
+        await start_step(app, pilot, shell)
+        jobs.extend(app.job_registry.jobs())
+
+    app = run_shell(script, [step])
+    assert [job.status for job in jobs] == [Job.Status.CANCELLED]
+    assert len(app.job_registry) == 0
+    assert app.job_scheduler.closed
@@ -0,0 +1,64 @@
+import asyncio
+
+from textual.widgets import LoadingIndicator
+
+from .helpers import Step, StepJob, settle
+
+
+class Resolve(Step):
+    """Command that awaits a lookup before it creates its job."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.ready = asyncio.Event()
+        self.cancelled = False
+
+    async def acreate_job(self, *args) -> StepJob:
+        try:
+            await self.ready.wait()
+
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+        return self.create_job(*args)
+
+
+def spinning(app) -> bool:
+    return len(app.query(LoadingIndicator)) > 0
+
+
+def test_jobs_are_created_in_a_worker_behind_a_spinner(run_shell):
+    resolve, step = Resolve(), Step()
+
+    async def script(app, pilot, shell):
+        shell.command_entered('resolve a && step b')
+        await settle(pilot, lambda: spinning(app))
+        shell.command_entered('step c')
+        await settle(pilot, lambda: step.runs == ['c'])
+        assert resolve.runs == [] and spinning(app)
+
+        resolve.ready.set()
+        await settle(pilot, lambda: step.runs == ['c', 'b'])
+        await settle(pilot, lambda: not spinning(app))
+        assert not shell.pending_creates
+
+    run_shell(script, [resolve, step])
+    assert resolve.runs == ['a']
+
+
+def test_ctrl_c_cancels_a_job_that_is_being_created(run_shell):
+    resolve = Resolve()
+
+    async def script(app, pilot, shell):
+        shell.command_entered('resolve a')
+        await settle(pilot, lambda: spinning(app))
+        await pilot.press('ctrl+c')
+        await settle(pilot, lambda: resolve.cancelled and not spinning(app))
+        resolve.ready.set()
+        await pilot.pause(0.1)
+        assert len(app.job_registry) == 0
+
+    app = run_shell(script, [resolve])
+    assert resolve.runs == []
+    assert len(app.job_history) == 0
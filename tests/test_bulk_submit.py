@@ -0,0 +1,26 @@
+from textual_shell.widgets import JobManager
+
+from .helpers import Step, settle
+
+
+def test_start_jobs_adds_the_rows_in_one_batch(run_shell, monkeypatch):
+    step = Step(delay=0.2)
+    calls = []
+    add_job = JobManager.add_job
+    add_jobs = JobManager.add_jobs
+    monkeypatch.setattr(JobManager, 'add_job', lambda self, job: (
+        calls.append(('add_job', job.id)), add_job(self, job)
+    ))
+    monkeypatch.setattr(JobManager, 'add_jobs', lambda self, jobs: (
+        calls.append(('add_jobs', [job.id for job in jobs])), add_jobs(self, jobs)
+    ))
+
+    async def script(app, pilot, shell):
+        shell.start_jobs(step.create_job(name) for name in 'abc')
+        await settle(pilot, lambda: calls)
+        await settle(pilot, lambda: len(app.job_registry) == 0)
+
+    run_shell(script, [step])
+    assert calls[0] == ('add_jobs', ['step_1', 'step_2', 'step_3'])
+    assert [name for name, _ in calls].count('add_jobs') == 1
+    assert sorted(step.runs) == ['a', 'b', 'c']
@@ -0,0 +1,91 @@
+import time
+from types import SimpleNamespace
+
+from textual_shell.cache import MISS, CachePolicy, CacheStore, ResultCache
+from textual_shell.job import Job
+
+from .helpers import Step, StepJob, settle
+
+
+def test_the_least_recently_used_entry_is_evicted():
+    cache = ResultCache(CachePolicy(max_entries=2))
+    cache.put(('a',), 1)
+    cache.put(('b',), 2)
+    assert cache.get(('a',))[0] == 1
+    cache.put(('c',), 3)
+    assert cache.get(('b',)) is MISS
+    assert [key for key, _, _ in cache.entries()] == [('a',), ('c',)]
+    assert cache.stats().evictions == 1
+
+
+def test_an_expired_entry_is_dropped_on_lookup():
+    cache = ResultCache(CachePolicy(ttl=60))
+    cache.put(('old',), 1, stored_at=time.time() - 61)
+    cache.put(('new',), 2, stored_at=time.time() - 30)
+    assert cache.get(('old',)) is MISS
+    result, age = cache.get(('new',))
+    assert result == 2 and 30 <= age < 60
+    stats = cache.stats()
+    assert (stats.entries, stats.hits, stats.misses, stats.expirations) == (1, 1, 1, 1)
+
+
+def test_persisted_caches_survive_a_new_store(tmp_path):
+    path = str(tmp_path / 'cache.pickle')
+    kept = SimpleNamespace(name='kept', CACHE=CachePolicy(persist=True))
+    dropped = SimpleNamespace(name='dropped', CACHE=CachePolicy())
+    store = CacheStore(path)
+    store.get_cache(kept).put(('x',), 'result')
+    store.get_cache(dropped).put(('x',), 'result')
+    store.save()
+
+    store = CacheStore(path)
+    assert store.get_cache(kept).get(('x',))[0] == 'result'
+    assert store.get_cache(dropped).get(('x',)) is MISS
+    assert store.get_cache(SimpleNamespace(name='plain')) is None
+
+
+class LookupJob(StepJob):
+    """Step job whose result is its name."""
+
+    async def execute(self):
+        self.running()
+        self.runs.append(self.name)
+        self.result = self.name
+        self.completed()
+
+
+class Lookup(Step):
+    CACHE = CachePolicy()
+
+    def create_job(self, *args) -> LookupJob:
+        return LookupJob(args[0], 0, self.runs, shell=self.shell, cmd=self.name)
+
+
+class Plain(Step):
+    CACHE = CachePolicy()
+
+
+def test_only_jobs_that_set_a_result_are_cached(run_shell, monkeypatch):
+    warnings = []
+    send_log = Job.send_log
+
+    def record(job, msg, severity):
+        if 'Nothing was cached' in msg:
+            warnings.append(msg)
+
+        send_log(job, msg, severity)
+
+    monkeypatch.setattr(Job, 'send_log', record)
+    lookup, plain = Lookup(), Plain()
+
+    async def script(app, pilot, shell):
+        for cmdline in ('lookup a', 'lookup a', 'plain b', 'plain b'):
+            shell.command_entered(cmdline)
+            await settle(pilot, lambda: len(app.job_registry) == 0)
+
+    app = run_shell(script, [lookup, plain])
+    assert lookup.runs == ['a']
+    assert plain.runs == ['b', 'b']
+    assert len(warnings) == 1
+    assert warnings[0].endswith('Nothing was cached, plain jobs must set their result.')
+    assert [record.status for record in app.job_history] == [Job.Status.COMPLETED] * 4
@@ -0,0 +1,71 @@
+import pytest
+
+from .helpers import Step, StepJob, settle
+
+
+class FailJob(StepJob):
+    """Step job that records its run and errors."""
+
+    async def execute(self):
+        self.running()
+        self.runs.append(self.name)
+        self.error('failed on purpose')
+
+
+class Fail(Step):
+    """Command whose jobs always fail."""
+
+    def create_job(self, *args) -> FailJob:
+        return FailJob(args[0], 0, self.runs, shell=self.shell, cmd=self.name)
+
+
+class ProbeJob(StepJob):
+    """Step job that records whether a step job is still live when it starts."""
+
+    async def execute(self):
+        self.running()
+        self.runs.append(any(job.cmd == 'step' for job in self.registry.jobs()))
+        self.completed()
+
+
+class Probe(Step):
+    """Command whose jobs run a ProbeJob."""
+
+    def create_job(self, *args) -> ProbeJob:
+        return ProbeJob('probe', 0, self.runs, shell=self.shell, cmd=self.name)
+
+
+@pytest.mark.parametrize('cmdline, expected', [
+    ('step a && fail b && step c', ['a', 'b']),
+    ('fail a ; step b', ['a', 'b']),
+    ('fail a && step b ; step c', ['a', 'c']),
+    ('fail a && step b & step c', ['a', 'c']),
+])
+def test_steps_run_according_to_their_operators(run_shell, cmdline, expected):
+    step, fail = Step(), Fail()
+    fail.runs = step.runs
+
+    async def script(app, pilot, shell):
+        shell.command_entered(cmdline)
+        await settle(pilot, lambda: len(app.job_history) > 0 and len(app.job_registry) == 0)
+        await pilot.pause(0.1)
+
+    run_shell(script, [step, fail])
+    assert sorted(step.runs) == expected
+
+
+@pytest.mark.parametrize('cmdline, step_live', [
+    ('step a & probe', True),
+    ('step a & wait && probe', False),
+])
+def test_wait_holds_back_until_the_background_finishes(run_shell, cmdline, step_live):
+    step, probe = Step(delay=0.3), Probe()
+
+    async def script(app, pilot, shell):
+        shell.command_entered(cmdline)
+        await settle(pilot, lambda: probe.runs)
+        await settle(pilot, lambda: len(app.job_registry) == 0)
+
+    run_shell(script, [step, probe])
+    assert probe.runs == [step_live]
+    assert step.runs == ['a']
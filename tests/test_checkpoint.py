@@ -0,0 +1,143 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+from textual_shell import checkpoint
+from textual_shell.checkpoint import CheckpointStore
+from textual_shell.command import Command, CommandNode
+from textual_shell.job import Job
+
+from .helpers import settle
+
+
+class Counter(Job):
+    """Job that counts to ten from its last checkpoint."""
+
+    def __init__(self, starts: list, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.starts = starts
+
+    async def execute(self):
+        self.running()
+        start = self.load_checkpoint() or 0
+        self.starts.append((self.id, start))
+        for count in range(start, 10):
+            await asyncio.sleep(0.05)
+            self.save_checkpoint(count + 1)
+
+        self.completed()
+
+
+class Ck(Command):
+    DEFINITION = {'ck': CommandNode(name='ck', description='Count.')}
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.starts = []
+
+    def create_job(self, *args) -> Counter:
+        return Counter(self.starts, shell=self.shell, cmd=self.name)
+
+
+@pytest.mark.parametrize('persist', [False, True])
+def test_resume_a_resumed_job(run_shell, tmp_path, persist):
+    ck = Ck()
+
+    async def script(app, pilot, shell):
+        if persist:
+            app.checkpoints = CheckpointStore(str(tmp_path / 'checkpoints'))
+
+        def saved(job_id):
+            checkpoint = app.checkpoints.load(job_id)
+            return checkpoint.state if checkpoint is not None else 0
+
+        async def run_until_killed(cmdline):
+            shell.command_entered(cmdline)
+            await settle(pilot, lambda: any(j.cmd == 'ck' for j in app.job_registry.jobs()))
+            job = next(j for j in app.job_registry.jobs() if j.cmd == 'ck')
+            await settle(pilot, lambda: saved(job.id) >= 2)
+            shell.command_entered(f'jobs kill {job.id}')
+            await settle(pilot, lambda: job.id not in app.job_registry)
+            return job
+
+        first = await run_until_killed('ck')
+        second = await run_until_killed(f'jobs resume {first.id}')
+        assert second.resumed_from == first.id
+        assert app.checkpoints.load(first.id) is None
+        assert app.checkpoints.load(second.id).job_id == second.id
+
+        shell.command_entered(f'jobs resume {second.id}')
+        await settle(pilot, lambda: len(ck.starts) == 3)
+        third_id, third_start = ck.starts[-1]
+        assert third_start >= ck.starts[1][1]
+        await settle(pilot, lambda: len(app.job_registry) == 0)
+        assert app.checkpoints.ids() == []
+
+    run_shell(script, [ck])
+
+
+def fake_job(job_id='ck_1'):
+    return type('FakeJob', (), {
+        'id': job_id, 'cmd': 'ck', 'args': (), 'tags': {'ck'},
+        'timeout': None, 'limits': None, 'retry': None
+    })()
+
+
+def test_move_rewrites_the_job_id(tmp_path):
+    for store in (CheckpointStore(), CheckpointStore(str(tmp_path))):
+        job = fake_job()
+        store.save(job, 5)
+        store.move('ck_1', 'ck_4')
+        assert store.ids() == ['ck_4']
+        assert store.load('ck_4').job_id == 'ck_4'
+        assert store.load('ck_4').state == 5
+        store.move('ck_1', 'ck_9')
+        assert store.ids() == ['ck_4']
+
+
+def test_saves_are_written_in_the_background_newest_first(tmp_path, monkeypatch):
+    release = threading.Event()
+    written = []
+    write_atomic = checkpoint.write_atomic
+
+    def slow_write(path, data):
+        if os.path.dirname(path) == str(tmp_path):
+            release.wait(5)
+            written.append(os.path.basename(path))
+
+        write_atomic(path, data)
+
+    monkeypatch.setattr(checkpoint, 'write_atomic', slow_write)
+    store = CheckpointStore(str(tmp_path))
+    job = fake_job()
+    for state in range(5):
+        store.save(job, state)
+
+    assert store.load('ck_1').state == 4
+    assert store.ids() == ['ck_1']
+    release.set()
+    store.flush()
+    assert written in (['ck_1.ckpt'], ['ck_1.ckpt', 'ck_1.ckpt'])
+    assert CheckpointStore(str(tmp_path)).load('ck_1').state == 4
+
+    store.remove('ck_1')
+    assert store.load('ck_1') is None and store.ids() == []
+    store.flush()
+    assert os.listdir(tmp_path) == []
+
+
+def test_ids_that_are_not_a_file_name_are_rejected(tmp_path):
+    directory = tmp_path / 'checkpoints'
+    store = CheckpointStore(str(directory))
+    store.save(fake_job('x'), 1)
+    store.flush()
+    os.rename(directory / 'x.ckpt', tmp_path / 'x.ckpt')
+
+    assert store.load('../x') is None
+    store.remove('../x')
+    store.flush()
+    assert (tmp_path / 'x.ckpt').exists()
+    with pytest.raises(ValueError):
+        store.save(fake_job('../x'), 1)
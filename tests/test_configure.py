@@ -0,0 +1,9 @@
+from textual_shell.configure import get_config, write_config
+
+
+def test_write_config_replaces_the_file(tmp_path):
+    path = str(tmp_path / 'config.yaml')
+    write_config(path, {'Jobs': {'timeout': 5}})
+    write_config(path, {'Jobs': {'timeout': 10}})
+    assert get_config(path) == {'Jobs': {'timeout': 10}}
+    assert [file.name for file in tmp_path.iterdir()] == ['config.yaml']
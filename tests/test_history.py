@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+from textual_shell.commands.jobs import HistoryReport
+from textual_shell.history import JobHistory
+from textual_shell.job import Job
+
+from .helpers import Step, settle
+
+
+def finished(number: int, status=Job.Status.COMPLETED) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=f'job_{number}',
+        cmd='job',
+        status=status,
+        queued_at=number,
+        started_at=number + 0.5,
+        ended_at=number + 1.5,
+        error_summary=None,
+        cpu_time=None,
+        peak_rss=None
+    )
+
+
+def test_the_oldest_records_are_overwritten():
+    history = JobHistory(3)
+    for number in range(5):
+        history.record(finished(number))
+
+    assert [record.id for record in history] == ['job_2', 'job_3', 'job_4']
+    assert history.total == 5
+    assert history.query(last=1)[0].duration == 1.0
+
+
+def test_a_capacity_of_zero_keeps_no_records():
+    history = JobHistory(0)
+    history.record(finished(0))
+    assert len(history) == 0
+    assert list(history) == []
+    assert history.total == 1
+
+
+def test_jobs_history_reports_the_matching_jobs(run_shell, monkeypatch):
+    logs = []
+    monkeypatch.setattr(HistoryReport, 'send_log', lambda self, msg, severity: logs.append(msg))
+    step = Step()
+
+    async def script(app, pilot, shell):
+        shell.command_entered('step a')
+        shell.command_entered('step b')
+        await settle(pilot, lambda: len(app.job_history) == 2)
+        shell.command_entered('jobs history --cmd step --last 1')
+        await settle(pilot, lambda: len(logs) == 2)
+
+    run_shell(script, [step])
+    assert logs[0].startswith('2 of 2 finished jobs matched - COMPLETED 2 - duration mean')
+    assert logs[1].startswith('step_') and ' COMPLETED ran ' in logs[1]
+
+
+def test_jobs_history_works_with_the_history_disabled(run_shell, monkeypatch):
+    logs = []
+    monkeypatch.setattr(HistoryReport, 'send_log', lambda self, msg, severity: logs.append(msg))
+
+    async def script(app, pilot, shell):
+        shell.command_entered('step a')
+        await settle(pilot, lambda: app.job_history.total == 1)
+        shell.command_entered('jobs history')
+        await settle(pilot, lambda: logs)
+
+    run_shell(script, [Step()], JOB_HISTORY_SIZE=0)
+    assert logs == ['0 of 1 finished jobs matched']
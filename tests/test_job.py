@@ -0,0 +1,61 @@
+import warnings
+from types import SimpleNamespace
+
+import pytest
+
+from textual_shell.job import Job
+from textual_shell.registry import JobRegistry
+
+from .helpers import Step, StepJob, settle
+
+
+class LegacyJob(StepJob):
+    """Step job that waits for its kill the way older commands did."""
+
+    async def execute(self):
+        self.running()
+        self.runs.append(self.name)
+        with warnings.catch_warnings(record=True) as self.caught:
+            warnings.simplefilter('always')
+            await self.wait_for_cancel(sleep_interval=10)
+
+        self.completed()
+
+
+class Legacy(Step):
+    def create_job(self, *args) -> LegacyJob:
+        self.job = LegacyJob('legacy', 0, self.runs, shell=self.shell, cmd=self.name)
+        return self.job
+
+
+def test_wait_for_cancel_still_takes_the_deprecated_sleep_interval(run_shell):
+    legacy = Legacy()
+
+    async def script(app, pilot, shell):
+        shell.command_entered('legacy')
+        await settle(pilot, lambda: legacy.runs == ['legacy'])
+        legacy.job.kill()
+        await settle(pilot, lambda: len(app.job_registry) == 0, timeout=1.0)
+
+    run_shell(script, [legacy])
+    assert [warning.category for warning in legacy.job.caught] == [DeprecationWarning]
+
+
+def test_a_job_runs_in_an_app_without_a_history_or_tracer():
+    messages = []
+    app = SimpleNamespace(job_registry=JobRegistry())
+    shell = SimpleNamespace(app=app, post_message=messages.append)
+    job = StepJob('a', 0, [], shell=shell, cmd='step')
+    assert job.id == 'step_1' and not job.tracer.enabled
+    app.job_registry.register(job)
+    job.running()
+    job.finish()
+    assert job.status == Job.Status.COMPLETED
+    assert job.id not in app.job_registry
+    assert isinstance(messages[-1], Job.Finish)
+
+
+def test_a_job_needs_the_job_registry_of_its_app():
+    shell = SimpleNamespace(app=SimpleNamespace(), post_message=print)
+    with pytest.raises(TypeError, match='jobs must run in a BaseShellApp'):
+        StepJob('a', 0, [], shell=shell, cmd='step')
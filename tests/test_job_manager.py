@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+from textual.widgets import DataTable
+
+from textual_shell.usage import usage_supported
+from textual_shell.widgets import JobManager
+
+from .helpers import Step, StepJob, settle
+
+
+class ChildJob(StepJob):
+    """Step job that owns a sleeping child process until it is killed."""
+
+    async def execute(self):
+        self.running()
+        process = await asyncio.create_subprocess_exec('sleep', '30')
+        self.add_process(process)
+        self.runs.append(self.name)
+        await self.wait_for_cancel()
+        self.completed()
+
+
+class Child(Step):
+    def create_job(self, *args) -> ChildJob:
+        return ChildJob('child', 0, self.runs, shell=self.shell, cmd=self.name)
+
+
+def test_kill_removes_the_rows_in_one_update(run_shell, monkeypatch):
+    step = Step(delay=30)
+    removed = []
+    remove_row = DataTable.remove_row
+
+    def spy(table, row_key):
+        removed.append((row_key, table.app._batch_count))
+        return remove_row(table, row_key)
+
+    monkeypatch.setattr(DataTable, 'remove_row', spy)
+
+    async def script(app, pilot, shell):
+        for name in 'abc':
+            shell.command_entered(f'step {name}')
+
+        await settle(pilot, lambda: len(step.runs) == 3)
+        shell.command_entered('jobs kill step_*')
+        await settle(pilot, lambda: len(app.job_registry) == 0)
+
+    run_shell(script, [step])
+    steps = [(key, batched) for key, batched in removed if key.startswith('step')]
+    assert sorted(key for key, _ in steps) == ['step_1', 'step_2', 'step_3']
+    assert all(batched for _, batched in steps)
+
+
+@pytest.mark.skipif(not usage_supported(), reason='needs /proc')
+def test_sampling_fills_the_cpu_and_rss_columns(run_shell):
+    child = Child()
+    cells = []
+
+    async def script(app, pilot, shell):
+        shell.command_entered('child')
+        await settle(pilot, lambda: child.runs == ['child'])
+        job = app.job_registry.jobs()[0]
+        app.sample_job_usage()
+        job_manager = app.query_one(JobManager)
+        table = job_manager.query_one(DataTable)
+        for column in job_manager.column_keys[4:6]:
+            cells.append(table.get_cell(job.id, column))
+
+        job.kill()
+        await settle(pilot, lambda: len(app.job_registry) == 0)
+
+    run_shell(script, [child])
+    cpu, rss = cells
+    assert cpu.endswith('s') and float(cpu[:-1]) >= 0
+    assert rss[-1] in 'BKMGT' and float(rss[:-1]) > 0
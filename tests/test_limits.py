@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from textual_shell.commands import Bash
+from textual_shell.job import Job
+from textual_shell.limits import ProcessLimits
+
+from .helpers import settle
+
+
+def test_pop_options_parses_and_removes_the_limits():
+    args = ['-c', '--nice', '5', '--max-memory=2G', '--max-cpu', '90s', '--max-files', '64', 'x']
+    limits = ProcessLimits.pop_options(args)
+    assert args == ['-c', 'x']
+    assert (limits.nice, limits.max_memory, limits.max_cpu, limits.max_files) == (
+        5, 2 * 1024 ** 3, 90, 64
+    )
+    assert ProcessLimits.pop_options(['x']) is None
+
+
+def test_cpus_must_be_available_to_the_app():
+    usable = min(os.sched_getaffinity(0))
+    assert ProcessLimits.pop_options(['--cpus', str(usable)]).cpus == {usable}
+    with pytest.raises(ValueError, match='not available'):
+        ProcessLimits.pop_options(['--cpus', '999'])
+
+    with pytest.raises(ValueError):
+        ProcessLimits.pop_options(['--cpus', '3-1'])
+
+
+def test_merge_prefers_the_invocation():
+    merged = ProcessLimits(nice=5, max_files=64).merge(ProcessLimits(nice=10))
+    assert (merged.nice, merged.max_files) == (10, 64)
+
+
+def bash_jobs(app):
+    return [job for job in app.job_registry.jobs() if job.cmd == 'bash']
+
+
+def test_an_invalid_cpu_option_creates_no_job(run_shell):
+    async def script(app, pilot, shell):
+        shell.command_entered('bash --cpus 999')
+        await pilot.pause(0.2)
+        assert bash_jobs(app) == []
+        assert len(app.job_history) == 0
+
+    run_shell(script, [Bash()])
+
+
+def test_limits_that_fail_only_fail_the_job(run_shell, monkeypatch):
+    def fail(self):
+        raise OSError('limits rejected')
+
+    monkeypatch.setattr(ProcessLimits, 'apply', fail)
+
+    async def script(app, pilot, shell):
+        shell.command_entered('bash --nice 5')
+        await settle(pilot, lambda: len(app.job_history) == 1)
+        assert [record.status for record in app.job_history] == [Job.Status.ERROR]
+        assert app.screen is shell.screen
+
+    app = run_shell(script, [Bash()])
+    assert app.return_code in (None, 0)
+
+
+def test_renice_changes_the_niceness_of_the_processes(run_shell):
+    async def script(app, pilot, shell):
+        shell.command_entered('bash')
+        await settle(pilot, lambda: any(job.processes for job in bash_jobs(app)))
+        job = bash_jobs(app)[0]
+        pid = job.processes[0].pid
+        shell.command_entered(f'jobs renice {job.id} 7')
+        await settle(pilot, lambda: os.getpriority(os.PRIO_PROCESS, pid) == 7)
+        job.kill()
+        await settle(pilot, lambda: job.id not in app.job_registry)
+
+    run_shell(script, [Bash()])
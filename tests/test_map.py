@@ -0,0 +1,59 @@
+from textual_shell.commands import Map
+from textual_shell.job import Job
+
+from .helpers import Step, StepJob, settle
+
+
+class Echo(Step):
+    """Step command that records all of its arguments."""
+
+    def create_job(self, *args) -> StepJob:
+        return StepJob(
+            ' '.join(args),
+            self.delay,
+            self.runs,
+            shell=self.shell,
+            cmd=self.name
+        )
+
+
+def map_records(app):
+    return [record for record in app.job_history if record.cmd == 'map']
+
+
+def test_map_runs_the_command_for_every_input(run_shell):
+    echo = Echo()
+
+    async def script(app, pilot, shell):
+        shell.command_entered('map -j 2 echo {} ::: a b c')
+        await settle(pilot, lambda: map_records(app))
+        assert map_records(app)[0].status == Job.Status.COMPLETED
+
+    run_shell(script, [echo, Map()])
+    assert sorted(echo.runs) == ['a', 'b', 'c']
+
+
+def test_options_after_the_command_belong_to_it(run_shell):
+    echo = Echo()
+
+    async def script(app, pilot, shell):
+        shell.command_entered('map -j=1 echo -j 9 --timeout 1s {} ::: a b')
+        await settle(pilot, lambda: map_records(app))
+        assert map_records(app)[0].status == Job.Status.COMPLETED
+
+    run_shell(script, [echo, Map()])
+    assert echo.runs == ['-j 9 --timeout 1s a', '-j 9 --timeout 1s b']
+
+
+def test_map_reads_the_inputs_from_a_file(run_shell, tmp_path):
+    echo = Echo()
+    inputs = tmp_path / 'inputs.txt'
+    inputs.write_text('a\n\n  b  \nc\n')
+
+    async def script(app, pilot, shell):
+        shell.command_entered(f'map echo < {inputs}')
+        await settle(pilot, lambda: map_records(app))
+        assert map_records(app)[0].status == Job.Status.COMPLETED
+
+    run_shell(script, [echo, Map()])
+    assert sorted(echo.runs) == ['a', 'b', 'c']
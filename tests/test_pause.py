@@ -0,0 +1,102 @@
+import asyncio
+
+from textual_shell.command import Command, CommandNode
+from textual_shell.job import Job
+
+from .helpers import settle
+
+
+def process_state(pid: int) -> str:
+    with open(f'/proc/{pid}/stat') as stat:
+        return stat.read().rsplit(')', 1)[1].split()[0]
+
+
+class TickJob(Job):
+    """Job that owns a sleeping child process and counts ticks between checkpoints."""
+
+    def __init__(self, start: int, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.ticks = start
+        self.process = None
+        self.restored = None
+
+    async def execute(self):
+        self.running()
+        self.restored = self.load_checkpoint()
+        self.ticks = self.restored or self.ticks
+        self.process = await asyncio.create_subprocess_exec(
+            'sleep', '30', start_new_session=True
+        )
+        self.add_process(self.process)
+        try:
+            while True:
+                await self.checkpoint()
+                self.ticks += 1
+                self.save_checkpoint(self.ticks)
+                await asyncio.sleep(0.02)
+
+        finally:
+            self.process.kill()
+            await self.process.wait()
+
+
+class Tick(Command):
+    DEFINITION = {'tick': CommandNode(name='tick', description='Count ticks.')}
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.jobs: list[TickJob] = []
+
+    def create_job(self, *args) -> TickJob:
+        self.jobs.append(TickJob(int(args[0]), shell=self.shell, cmd=self.name))
+        return self.jobs[-1]
+
+
+def test_pausing_stops_the_processes_and_the_checkpoints(run_shell):
+    tick = Tick()
+
+    async def script(app, pilot, shell):
+        shell.command_entered('tick 0')
+        await settle(pilot, lambda: tick.jobs and tick.jobs[0].ticks > 2)
+        job = tick.jobs[0]
+        shell.command_entered(f'jobs pause {job.id}')
+        await settle(pilot, lambda: job.status == Job.Status.PAUSED)
+        await settle(pilot, lambda: process_state(job.process.pid) == 'T')
+        ticks = job.ticks
+        await pilot.pause(0.2)
+        assert job.ticks == ticks
+
+        shell.command_entered(f'jobs resume {job.id}')
+        await settle(pilot, lambda: job.ticks > ticks)
+        assert job.status == Job.Status.RUNNING
+        assert process_state(job.process.pid) != 'T'
+        job.kill()
+        await settle(pilot, lambda: len(app.job_registry) == 0)
+
+    run_shell(script, [tick])
+    assert tick.jobs[0].process.returncode is not None
+
+
+def test_a_killed_job_is_recreated_from_its_checkpoint(run_shell):
+    tick = Tick()
+
+    async def script(app, pilot, shell):
+        shell.command_entered('tick 0')
+        await settle(pilot, lambda: tick.jobs and tick.jobs[0].ticks > 2)
+        first = tick.jobs[0]
+        shell.command_entered(f'jobs kill {first.id}')
+        await settle(pilot, lambda: first.id not in app.job_registry)
+        saved = first.ticks
+
+        shell.command_entered(f'jobs resume {first.id}')
+        await settle(pilot, lambda: len(tick.jobs) == 2 and tick.jobs[1].ticks > saved)
+        second = tick.jobs[1]
+        assert second.restored == saved
+        assert second.resumed_from == first.id
+        assert app.checkpoints.load(first.id) is None
+        assert app.checkpoints.load(second.id).state >= saved
+        second.kill()
+        await settle(pilot, lambda: len(app.job_registry) == 0)
+
+    run_shell(script, [tick])
+    assert tick.jobs[0].status == Job.Status.CANCELLED
@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+
+from textual_shell.command import Command, CommandNode
+from textual_shell import process_job
+from textual_shell.job import Job
+from textual_shell.process_job import ProcessJob, get_process_pool
+
+from .helpers import settle
+
+
+class SpinJob(ProcessJob):
+    """Process job that sleeps in its worker and returns the worker's pid."""
+
+    def __init__(self, seconds: float, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.seconds = seconds
+
+    @staticmethod
+    def work(log, seconds):
+        time.sleep(seconds)
+        return os.getpid()
+
+    def get_work_args(self) -> tuple:
+        return (self.seconds,)
+
+
+class Spin(Command):
+    """Command whose jobs sleep for their first argument in a worker."""
+
+    DEFINITION = {'spin': CommandNode(name='spin', description='Sleep in a worker.')}
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.jobs: list[SpinJob] = []
+
+    def create_job(self, *args) -> SpinJob:
+        job = SpinJob(float(args[0]), shell=self.shell, cmd=self.name)
+        self.jobs.append(job)
+        return job
+
+
+def test_killing_a_job_leaves_the_other_workers_alone(run_shell, monkeypatch):
+    monkeypatch.setattr(process_job, 'MAX_WORKERS', 2)
+    spin = Spin()
+
+    async def script(app, pilot, shell):
+        shell.command_entered('spin 30')
+        shell.command_entered('spin 1.5')
+        await settle(pilot, lambda: len(spin.jobs) == 2 and all(
+            job.worker_pid is not None for job in spin.jobs
+        ), timeout=20)
+        killed, survivor = spin.jobs
+        pid = survivor.worker_pid
+        shell.command_entered(f'jobs kill {killed.id}')
+        await settle(pilot, lambda: survivor.id not in app.job_registry, timeout=20)
+        assert killed.status == Job.Status.CANCELLED
+        assert survivor.status == Job.Status.COMPLETED
+        assert survivor.result == pid
+
+        shell.command_entered('spin 0')
+        await settle(pilot, lambda: len(spin.jobs) == 3, timeout=20)
+        await settle(pilot, lambda: spin.jobs[2].id not in app.job_registry, timeout=20)
+        assert spin.jobs[2].status == Job.Status.COMPLETED
+        assert spin.jobs[2].result in (pid, *[
+            worker.process.pid for worker in get_process_pool().workers
+        ])
+
+    run_shell(script, [spin], MAX_CPU_BOUND_JOBS=2)
+
+
+def test_an_exception_in_the_worker_fails_only_its_job(run_shell):
+    spin = Spin()
+
+    async def script(app, pilot, shell):
+        shell.command_entered('spin nan')
+        shell.command_entered('spin 0')
+        await settle(pilot, lambda: len(spin.jobs) == 2, timeout=20)
+        await settle(pilot, lambda: len(app.job_registry) == 0, timeout=20)
+        failed, completed = spin.jobs
+        assert failed.status == Job.Status.ERROR
+        assert isinstance(failed.exception, ValueError)
+        assert completed.status == Job.Status.COMPLETED
+
+    run_shell(script, [spin])
+
+
+def test_workers_are_spawned_off_the_event_loop(run_shell, monkeypatch):
+    spawned_on = []
+    init = process_job._Worker.__init__
+
+    def spy(self, context):
+        spawned_on.append(threading.current_thread().name)
+        init(self, context)
+
+    monkeypatch.setattr(process_job._Worker, '__init__', spy)
+    spin = Spin()
+
+    async def script(app, pilot, shell):
+        shell.command_entered('spin 0')
+        await settle(pilot, lambda: spin.jobs and spin.jobs[0].id not in app.job_registry, timeout=20)
+        assert spin.jobs[0].status == Job.Status.COMPLETED
+
+    run_shell(script, [spin])
+    assert spawned_on == ['process-job-pump']
@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+import pytest
+
+from textual_shell.widgets import JobManager
+
+from .helpers import Step, StepJob, settle
+
+
+class CountJob(StepJob):
+    """Step job that reports its progress on every item."""
+
+    PROGRESS_INTERVAL = 0.2
+
+    async def execute(self):
+        self.running()
+        for done in range(1, 51):
+            self.progress(done, 50)
+            await asyncio.sleep(0.01)
+
+        self.progress(50, 50, 'done')
+        await asyncio.sleep(self.delay)
+        self.completed()
+
+
+class Count(Step):
+    def create_job(self, *args) -> CountJob:
+        return CountJob('count', self.delay, self.runs, shell=self.shell, cmd=self.name)
+
+
+@pytest.mark.parametrize('delay', [0.5, 0.0])
+def test_progress_inside_the_interval_is_merged_and_the_last_is_sent(run_shell, monkeypatch, delay):
+    published = []
+    update = JobManager.update_job_progress
+
+    def record(self, event):
+        published.append((time.monotonic(), event.done, event.note))
+        update(self, event)
+
+    monkeypatch.setattr(JobManager, 'update_job_progress', record)
+
+    async def script(app, pilot, shell):
+        shell.command_entered('count')
+        await settle(pilot, lambda: published and published[-1][2] == 'done')
+
+    run_shell(script, [Count(delay=delay)])
+    assert 2 <= len(published) < 10
+    assert published[-1][1:] == (50, 'done')
+    gaps = [later[0] - earlier[0] for earlier, later in zip(published, published[1:])]
+    assert min(gaps) >= 0.15
@@ -0,0 +1,64 @@
+import time
+
+from textual_shell.rate_limit import RateLimit, TokenBucket
+
+from .helpers import Step, StepJob, settle
+
+
+class TimedJob(StepJob):
+    """Step job that records when it started."""
+
+    async def execute(self):
+        self.running()
+        self.runs.append((self.name, time.monotonic()))
+        self.completed()
+
+
+class Plain(Step):
+    """Command whose jobs record when they started."""
+
+    def create_job(self, *args) -> TimedJob:
+        return TimedJob(args[0], 0, self.runs, shell=self.shell, cmd=self.name)
+
+
+class Metered(Plain):
+    RATE_LIMIT = RateLimit(10, per=1.0, burst=2)
+
+
+def test_a_rate_limit_meters_the_starts(run_shell):
+    metered, plain = Metered(), Plain()
+
+    async def script(app, pilot, shell):
+        for name in 'abcdef':
+            shell.command_entered(f'metered {name}')
+
+        shell.command_entered('plain x')
+        await settle(pilot, lambda: len(metered.runs) == 6 and plain.runs)
+
+    run_shell(script, [metered, plain])
+    starts = [started for _, started in metered.runs]
+    gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+    # A burst of 2, then one start every 0.1 seconds.
+    assert gaps[0] < 0.05
+    assert min(gaps[1:]) >= 0.07
+    assert 0.08 <= sum(gaps[1:]) / len(gaps[1:]) <= 0.15
+    assert plain.runs[0][1] < starts[2]
+
+
+def test_the_bucket_refills_continuously(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    bucket = TokenBucket(rate=2.0, capacity=4)
+    assert bucket.take(3)
+    assert bucket.available() == 1
+    assert not bucket.take(2)
+    assert bucket.wait_time(2) == 0.5
+
+    now[0] += 0.5
+    assert bucket.take(2)
+    now[0] += 10
+    assert bucket.available() == 4
+
+    assert bucket.take(6)
+    assert bucket.available() == 0
+    assert bucket.wait_time() == 1.5
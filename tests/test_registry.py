@@ -0,0 +1,96 @@
+from types import SimpleNamespace
+
+import pytest
+
+from textual_shell.commands.jobs import Wait
+from textual_shell.job import Job
+from textual_shell.registry import DuplicateJob, JobRegistry
+
+from .helpers import Step, settle
+
+
+def make_job(registry, cmd, tags=(), status=Job.Status.RUNNING):
+    job = SimpleNamespace(
+        id=registry.next_id(cmd), cmd=cmd, tags=set(tags), status=status
+    )
+    registry.register(job)
+    return job
+
+
+def ids(jobs):
+    return [job.id for job in jobs]
+
+
+def test_ids_count_up_and_skip_reserved_ones():
+    registry = JobRegistry()
+    assert registry.next_id('bash') == 'bash_1'
+    registry.reserve(['python_7', 'bash_3', 'odd'])
+    assert registry.next_id('bash') == 'bash_8'
+    registry.reserve(['bash_2'])
+    assert registry.next_id('bash') == 'bash_9'
+
+
+def test_a_job_id_is_only_registered_once():
+    registry = JobRegistry()
+    job = make_job(registry, 'bash')
+    with pytest.raises(DuplicateJob):
+        registry.register(job)
+
+
+def test_select_combines_the_indexes():
+    registry = JobRegistry()
+    first = make_job(registry, 'bash', tags={'nightly'})
+    second = make_job(registry, 'python', tags={'nightly'})
+    third = make_job(registry, 'bash')
+    for _ in range(7):
+        make_job(registry, 'other')
+
+    tenth = make_job(registry, 'bash', tags={'nightly'})
+    assert ids(registry.select('bash_*')) == [first.id, third.id, tenth.id]
+    assert ids(registry.select(tag='nightly')) == [first.id, second.id, tenth.id]
+    assert ids(registry.select('bash_*', tag='nightly')) == [first.id, tenth.id]
+    assert ids(registry.select('*_1?', tag='nightly')) == [tenth.id]
+    assert ids(registry.select(second.id)) == [second.id]
+    assert registry.select('missing_1') == []
+    assert registry.select() == []
+
+    previous, third.status = third.status, Job.Status.PAUSED
+    registry.update_status(third, previous)
+    assert ids(registry.select(status=Job.Status.PAUSED)) == [third.id]
+    assert ids(registry.select('bash_*', status=Job.Status.RUNNING)) == [first.id, tenth.id]
+
+
+def test_unregister_drops_the_job_from_every_index():
+    registry = JobRegistry()
+    job = make_job(registry, 'bash', tags={'nightly'})
+    assert registry.unregister(job.id) is job
+    assert registry.unregister(job.id) is None
+    assert job.id not in registry and len(registry) == 0
+    assert registry.select('bash_*') == []
+    assert registry.select(tag='nightly') == []
+    assert registry.select(status=Job.Status.RUNNING) == []
+
+
+def test_a_wait_never_selects_another_wait(run_shell, monkeypatch):
+    step = Step(delay=0.3)
+    selections = []
+    selected = Wait.selected
+
+    def record(wait):
+        jobs = selected(wait)
+        selections.append([job.cmd for job in jobs])
+        return jobs
+
+    monkeypatch.setattr(Wait, 'selected', record)
+
+    async def script(app, pilot, shell):
+        shell.command_entered('step a')
+        await settle(pilot, lambda: step.runs == ['a'])
+        shell.command_entered('jobs wait --status RUNNING')
+        await settle(pilot, lambda: len(selections) == 1)
+        shell.command_entered('jobs wait --status RUNNING')
+        await settle(pilot, lambda: len(app.job_history) == 3)
+
+    app = run_shell(script, [step])
+    assert selections == [['step'], ['step']]
+    assert all(record.status == Job.Status.COMPLETED for record in app.job_history)
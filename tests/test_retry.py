@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+import pytest
+
+from textual_shell.command import Command, CommandNode
+from textual_shell.job import Job
+from textual_shell.retry import RetryPolicy
+from textual_shell.thread_job import ThreadJob
+
+from .helpers import settle
+
+
+def test_delay_grows_and_is_capped():
+    policy = RetryPolicy(backoff=1.0, multiplier=2.0, max_backoff=10.0)
+    for attempt, full in ((1, 1.0), (2, 2.0), (3, 4.0), (5, 10.0), (50, 10.0)):
+        delay = policy.delay(attempt)
+        assert full / 2 <= delay <= full
+
+
+def test_delay_does_not_overflow():
+    policy = RetryPolicy(backoff=0.5, multiplier=10.0, max_backoff=60.0)
+    assert 30.0 <= policy.delay(100000) <= 60.0
+    assert RetryPolicy(backoff=0.0).delay(100000) == 0.0
+
+
+def test_pop_options():
+    args = ['a', '--retries', '2', 'b', '--backoff', '250ms']
+    policy = RetryPolicy.pop_options(args)
+    assert args == ['a', 'b']
+    assert policy.max_attempts == 3
+    assert policy.backoff == 0.25
+    assert RetryPolicy.pop_options(['a']) is None
+
+
+def test_merge_prefers_the_other_policy():
+    merged = RetryPolicy(attempts=5, backoff=2.0).merge(RetryPolicy(backoff=0.1))
+    assert (merged.attempts, merged.backoff) == (5, 0.1)
+
+
+def test_should_retry_filters_exceptions_and_statuses():
+    policy = RetryPolicy(attempts=3, exceptions=(ConnectionError,))
+    job = SimpleNamespace(attempt=1, exception=ValueError(), status=Job.Status.ERROR)
+    assert not policy.should_retry(job)
+    job.exception = ConnectionResetError()
+    assert policy.should_retry(job)
+    job.attempt = 3
+    assert not policy.should_retry(job)
+    job = SimpleNamespace(attempt=1, exception=None, status=Job.Status.TIMEOUT)
+    assert policy.should_retry(job)
+
+
+def test_empty_exceptions_and_statuses_retry_nothing():
+    policy = RetryPolicy(attempts=3, exceptions=(), statuses=frozenset())
+    job = SimpleNamespace(attempt=1, exception=ConnectionError(), status=Job.Status.ERROR)
+    assert not policy.should_retry(job)
+    job.exception = None
+    assert not policy.should_retry(job)
+    assert RetryPolicy(attempts=3).should_retry(job)
+
+
+class Flaky(ThreadJob):
+    """Thread job that raises the exception of its command."""
+
+    def __init__(self, command, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.command = command
+
+    def run(self):
+        self.command.runs += 1
+        raise self.command.error
+
+
+class FlakyCommand(Command):
+    DEFINITION = {'flakycommand': CommandNode(name='flakycommand', description='Fail.')}
+
+    def __init__(self, error: Exception) -> None:
+        super().__init__()
+        self.error = error
+        self.runs = 0
+        self.RETRY = RetryPolicy(attempts=3, backoff=0.01, exceptions=(ConnectionError,))
+
+    def create_job(self, *args) -> Flaky:
+        return Flaky(self, shell=self.shell, cmd=self.name)
+
+
+@pytest.mark.parametrize('error, runs', [(ValueError('bad'), 1), (ConnectionError('down'), 3)])
+def test_thread_job_retries_only_retryable_exceptions(run_shell, error, runs):
+    command = FlakyCommand(error)
+
+    async def script(app, pilot, shell):
+        shell.command_entered('flakycommand')
+        await settle(pilot, lambda: len(app.job_history) == 1)
+        record = list(app.job_history)[0]
+        assert record.status == Job.Status.ERROR
+        assert command.runs == runs
+
+    run_shell(script, [command])
@@ -0,0 +1,27 @@
+from datetime import datetime, timedelta
+
+from textual_shell.commands import At
+from textual_shell.job import Job
+
+from .helpers import Step, settle
+
+
+def test_a_paused_at_runs_once_it_is_resumed(run_shell):
+    step = Step()
+
+    async def script(app, pilot, shell):
+        due = datetime.now() + timedelta(seconds=2)
+        shell.command_entered(f'at {due:%H:%M:%S} step a')
+        await settle(pilot, lambda: any(job.cmd == 'at' for job in app.job_registry.jobs()))
+        schedule = next(job for job in app.job_registry.jobs() if job.cmd == 'at')
+        shell.command_entered(f'jobs pause {schedule.id}')
+        await settle(pilot, lambda: schedule.status == Job.Status.PAUSED)
+        await pilot.pause(2.5)
+        assert step.runs == []
+        assert schedule.id in app.job_registry
+
+        shell.command_entered(f'jobs resume {schedule.id}')
+        await settle(pilot, lambda: step.runs == ['a'])
+        await settle(pilot, lambda: schedule.id not in app.job_registry)
+
+    run_shell(script, [step, At()])
@@ -0,0 +1,52 @@
+from textual_shell.job import Job
+from textual_shell.scheduler import Priority
+
+from .helpers import Step, settle
+
+
+class Low(Step):
+    PRIORITY = Priority.LOW
+
+
+class High(Step):
+    PRIORITY = Priority.HIGH
+
+
+class Capped(Step):
+    MAX_CONCURRENT = 1
+
+
+def jobs_of(app, cmd):
+    return [job for job in app.job_registry.jobs() if job.cmd == cmd]
+
+
+def test_higher_priorities_start_first_under_the_global_cap(run_shell):
+    low, high = Low(delay=0.3), High(delay=0.3)
+    high.runs = low.runs
+
+    async def script(app, pilot, shell):
+        shell.command_entered('low a')
+        await settle(pilot, lambda: low.runs == ['a'])
+        shell.command_entered('low b')
+        shell.command_entered('high c')
+        await settle(pilot, lambda: len(low.runs) == 3)
+
+    run_shell(script, [low, high], MAX_CONCURRENT_JOBS=1)
+    assert low.runs == ['a', 'c', 'b']
+
+
+def test_a_command_cap_does_not_hold_up_other_commands(run_shell):
+    capped, step = Capped(delay=0.5), Step()
+
+    async def script(app, pilot, shell):
+        shell.command_entered('capped a')
+        shell.command_entered('capped b')
+        shell.command_entered('step x')
+        await settle(pilot, lambda: step.runs == ['x'])
+        assert capped.runs == ['a']
+        assert [job.status for job in jobs_of(app, 'capped')] == [
+            Job.Status.RUNNING, Job.Status.PENDING
+        ]
+        await settle(pilot, lambda: capped.runs == ['a', 'b'])
+
+    run_shell(script, [capped, step])
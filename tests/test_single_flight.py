@@ -0,0 +1,23 @@
+from textual_shell.job import Job
+
+from .helpers import Step, settle
+
+
+class Shared(Step):
+    SINGLE_FLIGHT = True
+
+
+def test_identical_jobs_join_the_running_one(run_shell):
+    shared = Shared(delay=0.3)
+
+    async def script(app, pilot, shell):
+        shell.command_entered('shared a')
+        await settle(pilot, lambda: shared.runs == ['a'])
+        shell.command_entered('shared a')
+        shell.command_entered('shared b')
+        await settle(pilot, lambda: len(app.job_registry) == 0)
+
+    app = run_shell(script, [shared])
+    assert sorted(shared.runs) == ['a', 'b']
+    records = [record for record in app.job_history if record.cmd == 'shared']
+    assert [record.status for record in records] == [Job.Status.COMPLETED] * 3
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from textual_shell.command import Command, CommandNode
+from textual_shell.job import Job
+from textual_shell.stream import EndOfStream, JobStream, StreamClosed
+
+from .helpers import settle
+
+
+def test_a_full_stream_holds_the_writer_back():
+    async def main():
+        stream = JobStream(maxsize=2)
+        written = []
+
+        async def write():
+            for number in range(5):
+                await stream.put(number)
+                written.append(number)
+
+            stream.close()
+
+        writer = asyncio.create_task(write())
+        await asyncio.sleep(0.05)
+        assert written == [0, 1] and not writer.done()
+        assert await stream.get() == 0
+        await asyncio.sleep(0.05)
+        assert written == [0, 1, 2]
+        assert [item async for item in stream] == [1, 2, 3, 4]
+        await writer
+        with pytest.raises(EndOfStream):
+            await stream.get()
+
+    asyncio.run(main())
+
+
+def test_detaching_wakes_a_blocked_writer_with_stream_closed():
+    async def main():
+        stream = JobStream(maxsize=1)
+        await stream.put('buffered')
+        writer = asyncio.create_task(stream.put('blocked'))
+        await asyncio.sleep(0.05)
+        assert not writer.done()
+        stream.detach()
+        with pytest.raises(StreamClosed):
+            await writer
+
+        with pytest.raises(StreamClosed):
+            await stream.put('late')
+
+    asyncio.run(main())
+
+
+class ProduceJob(Job):
+    """Writes numbers until the reader goes away."""
+
+    async def execute(self):
+        self.running()
+        self.written = 0
+        try:
+            while True:
+                await self.stdout.put(self.written)
+                self.written += 1
+
+        except StreamClosed:
+            self.closed_by_reader = True
+
+        self.completed()
+
+
+class FirstJob(Job):
+    """Reads a single item and finishes."""
+
+    async def execute(self):
+        self.running()
+        self.result = await self.stdin.get()
+        self.completed()
+
+
+class Produce(Command):
+    DEFINITION = {'produce': CommandNode(name='produce', description='Write numbers.')}
+
+    def create_job(self, *args) -> ProduceJob:
+        self.job = ProduceJob(shell=self.shell, cmd=self.name)
+        return self.job
+
+
+class First(Command):
+    DEFINITION = {'first': CommandNode(name='first', description='Read one item.')}
+
+    def create_job(self, *args) -> FirstJob:
+        self.job = FirstJob(shell=self.shell, cmd=self.name)
+        return self.job
+
+
+def test_a_finished_reader_stops_the_stage_upstream(run_shell):
+    produce, first = Produce(), First()
+
+    async def script(app, pilot, shell):
+        shell.command_entered('produce | first')
+        await settle(pilot, lambda: len(app.job_history) == 2 and len(app.job_registry) == 0)
+
+    run_shell(script, [produce, first])
+    assert first.job.result == 0
+    assert first.job.status == Job.Status.COMPLETED
+    assert produce.job.closed_by_reader
+    assert produce.job.status == Job.Status.COMPLETED
+    assert produce.job.written <= JobStream.DEFAULT_MAXSIZE + 1
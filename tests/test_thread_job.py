@@ -0,0 +1,105 @@
+import time
+
+from textual_shell import thread_job
+from textual_shell.command import Command, CommandNode
+from textual_shell.job import Job
+from textual_shell.thread_job import ThreadJob
+
+from .helpers import settle
+
+
+class BlockingJob(ThreadJob):
+    """Thread job that either honours its token, ignores it or logs a burst."""
+
+    def __init__(self, mode: str, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.mode = mode
+        self.started = False
+        self.returned = False
+        self.logs: list[str] = []
+        self.flushes = 0
+
+    def run(self):
+        self.started = True
+        if self.mode == 'cooperative':
+            while not self.token.wait(0.01):
+                pass
+
+            self.returned = True
+            self.token.raise_if_cancelled()
+
+        elif self.mode == 'stubborn':
+            time.sleep(2.0)
+            self.returned = True
+
+        elif self.mode == 'chatty':
+            for number in range(50):
+                self.log(f'line {number}')
+
+        return self.mode
+
+    def send_log(self, msg, severity=20):
+        self.logs.append(msg)
+        super().send_log(msg, severity)
+
+    def _flush_logs(self):
+        self.flushes += 1
+        super()._flush_logs()
+
+
+class Block(Command):
+    """Command whose jobs run a BlockingJob in the given mode."""
+
+    DEFINITION = {'block': CommandNode(name='block', description='Block a thread.')}
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.jobs: list[BlockingJob] = []
+
+    def create_job(self, *args) -> BlockingJob:
+        job = BlockingJob(args[0], shell=self.shell, cmd=self.name)
+        self.jobs.append(job)
+        return job
+
+
+def run_block(run_shell, mode, kill=False):
+    block = Block()
+
+    async def script(app, pilot, shell):
+        shell.command_entered(f'block {mode}')
+        await settle(pilot, lambda: block.jobs and block.jobs[0].started)
+        job = block.jobs[0]
+        if kill:
+            job.kill()
+
+        await settle(pilot, lambda: job.id not in app.job_registry)
+
+    run_shell(script, [block])
+    return block.jobs[0]
+
+
+def test_a_killed_job_stops_at_its_token(run_shell):
+    job = run_block(run_shell, 'cooperative', kill=True)
+    assert job.token.cancelled and job.returned
+    assert job.status == Job.Status.CANCELLED
+    assert not any('Did not stop' in msg for msg in job.logs)
+
+
+def test_a_job_that_ignores_its_token_is_abandoned_after_the_grace(run_shell, monkeypatch):
+    monkeypatch.setattr(thread_job, 'CANCEL_GRACE', 0.2)
+    began = time.monotonic()
+    job = run_block(run_shell, 'stubborn', kill=True)
+    assert job.status == Job.Status.CANCELLED
+    assert not job.returned
+    assert any('Did not stop within 0.2 seconds' in msg for msg in job.logs)
+    assert time.monotonic() - began < 1.5
+
+
+def test_logs_from_the_thread_are_flushed_in_batches(run_shell):
+    job = run_block(run_shell, 'chatty')
+    assert job.status == Job.Status.COMPLETED
+    assert job.result == 'chatty'
+    assert [msg for msg in job.logs if msg.startswith('line')] == [
+        f'line {number}' for number in range(50)
+    ]
+    assert job.flushes <= 3
@@ -0,0 +1,40 @@
+from textual_shell.job import Job
+
+from .helpers import Step, settle
+
+
+class Slow(Step):
+    TIMEOUT = 0.2
+
+
+def statuses(app):
+    return {record.cmd: record.status for record in app.job_history}
+
+
+def test_a_timed_out_job_gives_its_slot_back(run_shell):
+    slow, step = Slow(delay=5), Step()
+
+    async def script(app, pilot, shell):
+        shell.command_entered('slow a')
+        shell.command_entered('step b')
+        await settle(pilot, lambda: slow.runs == ['a'])
+        assert app.job_scheduler.running == 1
+        assert app.job_scheduler.pending == 1
+        await settle(pilot, lambda: step.runs == ['b'])
+        await settle(pilot, lambda: len(app.job_registry) == 0)
+        assert app.job_scheduler.running == 0
+
+    app = run_shell(script, [slow, step], MAX_CONCURRENT_JOBS=1)
+    assert statuses(app) == {'slow': Job.Status.TIMEOUT, 'step': Job.Status.COMPLETED}
+
+
+def test_the_app_default_applies_to_commands_without_a_timeout(run_shell):
+    step = Step(delay=5)
+
+    async def script(app, pilot, shell):
+        shell.command_entered('step a')
+        await settle(pilot, lambda: len(app.job_history) == 1)
+        assert app.job_scheduler.running == 0
+
+    app = run_shell(script, [step], JOB_TIMEOUT=0.2)
+    assert statuses(app) == {'step': Job.Status.TIMEOUT}
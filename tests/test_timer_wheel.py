@@ -0,0 +1,86 @@
+import asyncio
+
+from textual_shell.commands import Every
+from textual_shell.job import Job
+from textual_shell.timer_wheel import TimerWheel
+
+from .helpers import Step, settle
+
+
+def run_wheel(schedule, duration: float) -> tuple[list, float]:
+    """Run a small wheel, returning the fired labels with their times."""
+    fired = []
+
+    async def main():
+        wheel = TimerWheel(tick=0.01, slots=4, levels=2)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        def record(label):
+            return lambda: fired.append((label, loop.time() - start))
+
+        schedule(wheel, record)
+        await asyncio.sleep(duration)
+        remaining = len(wheel)
+        wheel.stop()
+        return remaining
+
+    return fired, asyncio.run(main())
+
+
+def test_timers_cascade_across_levels_and_overflow():
+    delays = {'level0': 0.02, 'level1': 0.1, 'overflow': 0.3}
+
+    def schedule(wheel, record):
+        for label, delay in delays.items():
+            wheel.schedule(delay, record(label))
+
+    fired, remaining = run_wheel(schedule, 0.5)
+    assert [label for label, _ in fired] == ['level0', 'level1', 'overflow']
+    for label, at in fired:
+        assert delays[label] <= at < delays[label] + 0.08
+    assert remaining == 0
+
+
+def test_cancelled_timers_do_not_fire():
+    def schedule(wheel, record):
+        wheel.schedule(0.05, record('cancelled')).cancel()
+        wheel.schedule(0.05, record('kept'))
+
+    fired, _ = run_wheel(schedule, 0.15)
+    assert [label for label, _ in fired] == ['kept']
+
+
+def test_a_raising_callback_does_not_stop_the_wheel():
+    def schedule(wheel, record):
+        def boom():
+            raise RuntimeError('boom')
+
+        wheel.schedule(0.02, boom)
+        wheel.schedule(0.02, record('same tick'))
+        wheel.schedule(0.3, record('later'))
+
+    fired, _ = run_wheel(schedule, 0.45)
+    assert [label for label, _ in fired] == ['same tick', 'later']
+
+
+def test_every_leaves_the_options_to_the_scheduled_command(run_shell):
+    step = Step(delay=0.3)
+
+    async def script(app, pilot, shell):
+        shell.command_entered('every 100ms step a --timeout 50ms')
+        await settle(pilot, lambda: any(job.cmd == 'every' for job in app.job_registry.jobs()))
+        schedule = next(job for job in app.job_registry.jobs() if job.cmd == 'every')
+        assert schedule.timeout is None
+        await settle(pilot, lambda: any(
+            record.cmd == 'step' for record in app.job_history
+        ))
+        record = next(record for record in app.job_history if record.cmd == 'step')
+        assert record.status == Job.Status.TIMEOUT
+        assert schedule.id in app.job_registry
+        schedule.kill()
+        await settle(pilot, lambda: schedule.id not in app.job_registry)
+
+    run_shell(script, [step, Every()])
+
+
@@ -0,0 +1,37 @@
+import json
+
+from .helpers import Step, settle
+
+
+def test_jobs_trace_writes_a_chrome_trace_of_each_job(run_shell, tmp_path):
+    path = tmp_path / 'trace.json'
+
+    async def script(app, pilot, shell):
+        shell.command_entered('step a')
+        await settle(pilot, lambda: len(app.job_history) == 1)
+        shell.command_entered(f'jobs trace {path}')
+        await settle(pilot, lambda: len(app.job_history) == 2)
+
+    run_shell(script, [Step(delay=0.1)])
+    trace = json.loads(path.read_text())
+    events = trace['traceEvents']
+    assert trace['displayTimeUnit'] == 'ms'
+    assert {event['ph'] for event in events} <= {'X', 's', 'f', 'M'}
+
+    lanes = {event['args']['name']: event['tid'] for event in events if event['ph'] == 'M'}
+    spans = [event for event in events if event['ph'] == 'X']
+    assert all(span['dur'] >= 0 and span['tid'] in lanes.values() for span in spans)
+
+    job = {span['name']: span for span in spans if span['tid'] == lanes['step_1']}
+    assert sorted(job) == ['Job.execute', 'Job.finish', 'Job.queued']
+    queued, execute, finish = job['Job.queued'], job['Job.execute'], job['Job.finish']
+    assert queued['ts'] <= execute['ts'] <= finish['ts']
+    assert execute['dur'] >= 100000
+    assert queued['args']['cmd'] == 'step'
+
+    span_ids = {span['args']['span_id'] for span in spans}
+    assert execute['args']['parent_id'] in span_ids
+    starts = {event['id']: event for event in events if event['ph'] == 's'}
+    ends = {event['id']: event for event in events if event['ph'] == 'f'}
+    assert starts and starts.keys() == ends.keys()
+    assert all(starts[flow]['ts'] <= ends[flow]['ts'] for flow in starts)
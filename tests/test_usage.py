@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from textual_shell import usage
+
+
+def write_process(proc, pid, ppid, ticks, pages, comm='sleep', children=None):
+    """Write the stat file of a fake process, and its children file if given."""
+    fields = ['S', str(ppid)] + ['0'] * 9 + [str(ticks), str(ticks), '0', '0']
+    fields += ['0'] * 6 + [str(pages)] + ['0'] * 20
+    directory = proc / str(pid)
+    (directory / 'task' / str(pid)).mkdir(parents=True)
+    (directory / 'stat').write_text(f'{pid} ({comm}) {" ".join(fields)}\n')
+    if children is not None:
+        (directory / 'task' / str(pid) / 'children').write_text(
+            ' '.join(str(child) for child in children)
+        )
+
+
+@pytest.fixture
+def proc(tmp_path, monkeypatch):
+    monkeypatch.setattr(usage, 'PROC', str(tmp_path))
+    return tmp_path
+
+
+def test_a_stat_file_is_parsed_even_with_spaces_in_the_name(proc):
+    write_process(proc, 10, 1, ticks=usage.CLOCK_TICKS, pages=3, comm='a ) b')
+    assert usage.read_process(10) == usage.ProcessSample(
+        pid=10, ppid=1, cpu=2.0, rss=3 * usage.PAGE_SIZE
+    )
+    assert usage.read_process(11) is None
+
+
+def test_the_tree_is_added_up_from_the_children_files(proc):
+    write_process(proc, 10, 1, ticks=usage.CLOCK_TICKS, pages=1, children=[11])
+    write_process(proc, 11, 10, ticks=usage.CLOCK_TICKS, pages=2, children=[12, 13])
+    write_process(proc, 12, 11, ticks=usage.CLOCK_TICKS, pages=4, children=[])
+    assert usage.sample_tree([10]) == usage.Usage(6.0, 7 * usage.PAGE_SIZE)
+
+
+def test_the_tree_is_scanned_when_children_files_are_missing(proc):
+    write_process(proc, 10, 1, ticks=usage.CLOCK_TICKS, pages=1)
+    write_process(proc, 11, 10, ticks=usage.CLOCK_TICKS, pages=2)
+    write_process(proc, 20, 1, ticks=usage.CLOCK_TICKS, pages=8)
+    assert usage.sample_tree([10]) == usage.Usage(4.0, 3 * usage.PAGE_SIZE)
+    assert usage.sample_tree([30]) is None
+
+
+@pytest.mark.skipif(not usage.usage_supported(), reason='needs /proc')
+def test_the_current_process_can_be_read():
+    sample = usage.read_process(os.getpid())
+    assert sample.ppid == os.getppid()
+    assert sample.cpu > 0 and sample.rss > 0